@@ -67,7 +67,7 @@ def cleanup_stale_jobs(db):
     db.commit()
 
 
-def create_app(config_name: str = ""):
+def create_app(config_name: str = "", test_config: dict | None = None):
     import time
     from flask import g
 
@@ -87,6 +87,10 @@ def create_app(config_name: str = ""):
     # Merge JSON config
     app.config.update(ConfigManager().config)
 
+    # Explicit overrides (e.g. the test suite's in-memory database) win over the JSON config
+    if test_config:
+        app.config.update(test_config)
+
     # base dirs
     project_root = Path(__file__).resolve().parent.parent
     instance_root = Path(app.instance_path)
@@ -119,8 +123,9 @@ def create_app(config_name: str = ""):
     # 1) Generic export root (folder)
     _set_path("EXPORT_ROOT", "exports", base="instance", is_file=False)
 
-    # 2) Database (file)
-    _set_path("database", "buz_data.db", base="instance", is_file=True)
+    # 2) Database (file); SQLite URIs such as an in-memory test database are used as given
+    if not str(app.config.get("database", "")).startswith("file:"):
+        _set_path("database", "buz_data.db", base="instance", is_file=True)
 
     # 3) Upload folder (folder)
     _set_path("upload_folder", "uploads", base="instance", is_file=False)
@@ -7,7 +7,7 @@ import time
 import uuid
 import tempfile
 from services.excel_safety import build_excel_stream
-from typing import Iterable, List, Tuple, Dict, Any
+from typing import Iterable, List, Dict, Any
 
 from flask import (
     Blueprint,
@@ -147,21 +147,34 @@ def _strip_trailing_asterisk_in_b2_c2(ws) -> None:
                 cell.value = new_val
 
 
-def _compress_indices_to_descending_ranges(indices: List[int]) -> List[Tuple[int, int]]:
-    """Convert row indices to bottom-up (start, count) ranges for delete_rows."""
-    if not indices:
-        return []
-    dedup_sorted = sorted(set(indices))
-    ranges: List[Tuple[int, int]] = []
-    start = prev = dedup_sorted[0]
-    for i in dedup_sorted[1:]:
-        if i == prev + 1:
-            prev = i
-        else:
-            ranges.append((start, prev))
-            start = prev = i
-    ranges.append((start, prev))
-    return [(s, e - s + 1) for (s, e) in reversed(ranges)]
+def _delete_rows_bulk(ws, indices: Iterable[int]) -> int:
+    """
+    Delete the given 1-based rows in one pass and return how many were removed.
+
+    Each ws.delete_rows() call re-sorts every cell and shifts everything below
+    the gap, so deleting many scattered ranges is quadratic. Here each run of
+    kept rows is moved up past the deleted rows above it with one move_range()
+    call, then the leftover rows at the bottom go in a single delete_rows().
+    """
+    max_row = ws.max_row
+    drop = {r for r in indices if 1 <= r <= max_row}
+    if not drop:
+        return 0
+    last_col = get_column_letter(ws.max_column)
+
+    shift = 0
+    run_start = None
+    for r in range(min(drop), max_row + 2):
+        if r in drop or r > max_row:
+            if run_start is not None:
+                ws.move_range(f"A{run_start}:{last_col}{r - 1}", rows=-shift)
+                run_start = None
+            shift += 1
+        elif run_start is None:
+            run_start = r
+
+    ws.delete_rows(max_row - len(drop) + 1, len(drop))
+    return len(drop)
 
 
 def _scan_sheet(
@@ -340,9 +353,7 @@ def filter_tabs():
         rows_removed = 0
 
         if prune_rows and scan["nonmatching_data_rows"]:
-            for start, count in _compress_indices_to_descending_ranges(scan["nonmatching_data_rows"]):
-                ws.delete_rows(start, amount=count)
-                rows_removed += count
+            rows_removed = _delete_rows_bulk(ws, scan["nonmatching_data_rows"])
 
         # InventoryItems custom formatting
         if is_inventory_items:
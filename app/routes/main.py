@@ -1385,10 +1385,12 @@ def blinds_awnings_sync_progress(job_id):
         error = job.get("error")
 
         # Check if there are changes to download
+        from services.blinds_awnings_sync import columnar_row_count
+
         items_changes = result.get("items_changes", {})
         pricing_changes = result.get("pricing_changes", {})
-        has_items = any(len(rows) > 0 for rows in items_changes.values())
-        has_pricing = any(len(rows) > 0 for rows in pricing_changes.values())
+        has_items = any(columnar_row_count(cols) > 0 for cols in items_changes.values())
+        has_pricing = any(columnar_row_count(cols) > 0 for cols in pricing_changes.values())
 
         files = []
         if has_items:
@@ -1463,11 +1465,11 @@ def blinds_awnings_sync_apply_to_db(job_id):
 
     # Apply changes
     try:
-        from services.blinds_awnings_sync import apply_changes_to_database
+        from services.blinds_awnings_sync import apply_changes_to_database, changes_from_columnar
 
         stats = apply_changes_to_database(
-            items_changes=items_changes,
-            pricing_changes=pricing_changes,
+            items_changes=changes_from_columnar(items_changes or {}),
+            pricing_changes=changes_from_columnar(pricing_changes or {}),
             db=g.db
         )
 
@@ -1485,7 +1487,7 @@ def blinds_awnings_sync_apply_to_db(job_id):
 @auth.login_required
 def blinds_awnings_download_items(job_id):
     """Generate and download items workbook on-demand."""
-    from services.blinds_awnings_sync import generate_workbooks_in_memory
+    from services.blinds_awnings_sync import generate_workbooks_in_memory, columnar_row_count
     from io import BytesIO
 
     job = get_job(job_id)
@@ -1497,7 +1499,7 @@ def blinds_awnings_download_items(job_id):
     headers_cfg = result.get("headers_cfg", {})
 
     # Check if there are actually any items to download
-    has_items = any(len(rows) > 0 for rows in items_changes.values())
+    has_items = any(columnar_row_count(cols) > 0 for cols in items_changes.values())
     if not has_items or not headers_cfg:
         return "No items to download", 404
 
@@ -1524,7 +1526,7 @@ def blinds_awnings_download_items(job_id):
 @auth.login_required
 def blinds_awnings_download_pricing(job_id):
     """Generate and download pricing workbook on-demand."""
-    from services.blinds_awnings_sync import generate_workbooks_in_memory
+    from services.blinds_awnings_sync import generate_workbooks_in_memory, columnar_row_count
     from io import BytesIO
 
     job = get_job(job_id)
@@ -1536,7 +1538,7 @@ def blinds_awnings_download_pricing(job_id):
     headers_cfg = result.get("headers_cfg", {})
 
     # Check if there are actually any pricing changes to download
-    has_pricing = any(len(rows) > 0 for rows in pricing_changes.values())
+    has_pricing = any(columnar_row_count(cols) > 0 for cols in pricing_changes.values())
     if not has_pricing or not headers_cfg:
         return "No pricing changes to download", 404
 
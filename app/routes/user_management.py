@@ -399,7 +399,9 @@ def batch_toggle_users():
         try:
             db = create_db_manager(db_path)
 
+            from playwright.async_api import async_playwright
             from services.buz_user_management import batch_toggle_users_for_org
+            from services.playwright_launch import LAUNCH_ARGS, HEADLESS_LAUNCH_ARGS
             import json
             from services.buz_user_management import BuzUserManagement
             from collections import defaultdict
@@ -432,51 +434,80 @@ def batch_toggle_users():
             total_orgs = len(changes_by_org)
             base_pct = 10
 
-            # Process each org's changes in a single browser session
-            for org_idx, (org_key, org_changes) in enumerate(changes_by_org.items(), 1):
+            def record_org_failure(org_idx, org_key, org_changes, e):
+                """Log one org's failure and record an error for each of its changes."""
                 org_display_name = BuzUserManagement.ORGS.get(org_key, {}).get('display_name', org_key)
                 pct = base_pct + int((org_idx / total_orgs) * 70)
-                update_job(job_id, pct, f"Processing {len(org_changes)} user(s) in {org_display_name}...", db=db)
+                update_job(job_id, pct, f"✗ Error in {org_display_name}: {str(e)}", db=db)
+                for change in org_changes:
+                    errors.append({
+                        'org_key': org_key,
+                        'user_email': change['user_email'],
+                        'error': str(e)
+                    })
 
+            async def toggle_all_orgs():
+                """Process each org's changes in turn, sharing one browser; every org gets its own context."""
+                # Orgs not yet handed to their own handler; failed together if the browser itself fails
+                pending = dict(enumerate(changes_by_org.items(), 1))
                 try:
-                    # Run async function for this org
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        org_results = loop.run_until_complete(
-                            batch_toggle_users_for_org(
-                                org_key=org_key,
-                                user_changes=org_changes,
-                                headless=headless
-                            )
+                    async with async_playwright() as p:
+                        browser = await p.chromium.launch(
+                            headless=headless,
+                            args=HEADLESS_LAUNCH_ARGS if headless else LAUNCH_ARGS,
                         )
-                    finally:
-                        loop.close()
-
-                    # Collect results
-                    successful = 0
-                    for result in org_results:
-                        if result['success']:
-                            results.append(result)
-                            successful += 1
-                        else:
-                            errors.append({
-                                'org_key': result['org_key'],
-                                'user_email': result['user_email'],
-                                'error': result['message']
-                            })
-
-                    update_job(job_id, pct, f"✓ Completed {org_display_name}: {successful} successful, {len(org_results) - successful} failed", db=db)
-
+                        try:
+                            for org_idx, (org_key, org_changes) in list(pending.items()):
+                                if not browser.is_connected():
+                                    raise RuntimeError("Browser closed unexpectedly")
+                                org_display_name = BuzUserManagement.ORGS.get(org_key, {}).get('display_name', org_key)
+                                pct = base_pct + int((org_idx / total_orgs) * 70)
+                                update_job(job_id, pct, f"Processing {len(org_changes)} user(s) in {org_display_name}...", db=db)
+                                del pending[org_idx]
+
+                                try:
+                                    org_results = await batch_toggle_users_for_org(
+                                        org_key=org_key,
+                                        user_changes=org_changes,
+                                        browser=browser
+                                    )
+
+                                    # Collect results
+                                    successful = 0
+                                    for result in org_results:
+                                        if result['success']:
+                                            results.append(result)
+                                            successful += 1
+                                        else:
+                                            errors.append({
+                                                'org_key': result['org_key'],
+                                                'user_email': result['user_email'],
+                                                'error': result['message']
+                                            })
+
+                                    update_job(job_id, pct, f"✓ Completed {org_display_name}: {successful} successful, {len(org_results) - successful} failed", db=db)
+
+                                except Exception as e:
+                                    logger.exception(f"Error in batch toggle for org {org_key}")
+                                    record_org_failure(org_idx, org_key, org_changes, e)
+                        finally:
+                            try:
+                                await browser.close()
+                            except Exception as e:
+                                logger.warning(f"Error closing browser: {e}")
                 except Exception as e:
-                    logger.exception(f"Error in batch toggle for org {org_key}")
-                    update_job(job_id, pct, f"✗ Error in {org_display_name}: {str(e)}", db=db)
-                    for change in org_changes:
-                        errors.append({
-                            'org_key': org_key,
-                            'user_email': change['user_email'],
-                            'error': str(e)
-                        })
+                    # Browser launch (or Playwright itself) failed: every org still waiting fails with it
+                    logger.exception("Browser error in batch toggle")
+                    for org_idx, (org_key, org_changes) in pending.items():
+                        record_org_failure(org_idx, org_key, org_changes, e)
+
+            if changes_by_org:
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                try:
+                    loop.run_until_complete(toggle_all_orgs())
+                finally:
+                    loop.close()
 
             # Update cache once at the end with all changes
             if results:
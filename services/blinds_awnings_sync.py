@@ -11,8 +11,9 @@ import re
 import logging
 from datetime import datetime, timedelta
 from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from collections import defaultdict
+from functools import lru_cache
 from openpyxl import Workbook
 import pandas as pd
 
@@ -24,6 +25,26 @@ logger = logging.getLogger(__name__)
 SUPPLIER_NAME = "Unleashed"
 TAX_RATE = "GST"
 DEPRECATED_WARNING = "Deprecated - DO NOT USE"
+WHOLESALE_PREFIX = "WS"
+# Field order for change-log entries (built as tuples, exposed as dicts)
+CHANGE_LOG_COLS = ("Group", "Operation", "Code", "Description", "Reason")
+# Columns selected from inventory_items, plus the derived matching key
+INV_COLS = (
+    "Code", "SupplierProductCode", "DescnPart1", "DescnPart2", "DescnPart3",
+    "Description", "Active", "Warning", "PriceGridCode", "CostGridCode",
+    "DiscountGroupCode", "inventory_group_code", "PkId", "_key",
+)
+# Column order of an items-upload row (ADD/EDIT/DEPRECATE rows all share it)
+_ITEM_ROW_COLS = (
+    "PkId", "Code", "Description", "DescnPart1 (Material)", "DescnPart2 (Material Types)",
+    "DescnPart3 (Colour)", "Price Grid Code", "Cost Grid Code", "Discount Group Code",
+    "Tax Rate", "Supplier", "Supplier Product Code", "Active", "Warning", "Operation",
+)
+# Decimal constants reused by the price helpers (Decimal is immutable, so sharing is safe)
+_ZERO = Decimal("0.00")
+_CENT = Decimal("0.01")
+# Shared read-only frame for groups with no existing inventory
+_EMPTY_INV_DF = pd.DataFrame({c: pd.array([], dtype="string") for c in INV_COLS})
 
 
 # ========== Utility Functions ==========
@@ -38,12 +59,32 @@ def _build_desc_key(fd1: str, fd2: str, fd3: str) -> str:
     return f"{_norm(fd1).lower()}||{_norm(fd2).lower()}||{_norm(fd3).lower()}"
 
 
+def _norm_series(s: pd.Series) -> pd.Series:
+    """Vectorized _norm over a Series."""
+    return s.fillna("").astype(str).str.strip()
+
+
+def _desc_key_series(df: pd.DataFrame, fd1_col: str, fd2_col: str, fd3_col: str) -> pd.Series:
+    """Vectorized _build_desc_key over three description columns of a DataFrame."""
+    parts = [_norm_series(df[c]) for c in (fd1_col, fd2_col, fd3_col)]
+    # Lowercase the joined key in one pass rather than each part
+    return parts[0].str.cat(parts[1:], sep="||").str.lower()
+
+
+@lru_cache(maxsize=2048)
+def _q2_cached(s: str) -> Decimal:
+    """Parse a raw string to Decimal with 2dp, default to 0.00 (cached; price strings repeat heavily)."""
+    try:
+        return Decimal(s.strip() or "0").quantize(_CENT)
+    except InvalidOperation:
+        return _ZERO
+
+
 def _q2(x: Any) -> Decimal:
     """Convert to Decimal with 2dp, default to 0.00."""
-    try:
-        return Decimal(str(x).strip() or "0").quantize(Decimal("0.01"))
-    except (InvalidOperation, AttributeError):
-        return Decimal("0.00")
+    if x is None:
+        return _ZERO
+    return _q2_cached(x if isinstance(x, str) else str(x))
 
 
 def _tomorrow_ddmmyyyy() -> str:
@@ -51,9 +92,10 @@ def _tomorrow_ddmmyyyy() -> str:
     return (datetime.today() + timedelta(days=1)).strftime("%d/%m/%Y")
 
 
+@lru_cache(maxsize=256)
 def _is_wholesale_group(group_code: str) -> bool:
     """Check if a group is wholesale (starts with WS)."""
-    return _norm(group_code).upper().startswith("WS")
+    return _norm(group_code).upper().startswith(WHOLESALE_PREFIX)
 
 
 def _normalize_colour_for_desc(colour: str) -> str:
@@ -67,6 +109,7 @@ def _normalize_colour_for_desc(colour: str) -> str:
     return colour_norm
 
 
+@lru_cache(maxsize=8192)
 def _build_description(prefix: str, fd1: str, fd2: str, fd3: str) -> str:
     """
     Build full description: [prefix] FD1 FD2 FD3
@@ -81,25 +124,35 @@ def _build_description(prefix: str, fd1: str, fd2: str, fd3: str) -> str:
     return " ".join(p for p in parts if p)
 
 
-def _next_code_for_group(existing_codes: List[str], group_prefix: str, start: int = 10000) -> str:
+def _alloc_codes_for_group(existing_codes: Iterable[str], group_prefix: str, n_new: int, start: int = 10000) -> List[str]:
     """
-    Generate next sequential code for a group.
-    Finds all codes starting with group_prefix, extracts numeric suffix, returns next number.
+    Allocate n_new sequential codes for a group in one go.
+    Existing suffixes are parsed once (vectorised) and the new block is a plain range after the max.
     """
-    pattern = re.compile(rf"^{re.escape(group_prefix)}(\d+)$", re.IGNORECASE)
-    max_num = start - 1
+    if n_new <= 0:
+        return []
+    codes = pd.Series(list(existing_codes), dtype="string").str.strip()
+    suffixes = codes.str.extract(rf"^{re.escape(group_prefix)}(\d+)$", flags=re.IGNORECASE, expand=False)
+    nums = pd.to_numeric(suffixes.dropna(), errors="coerce")
+    max_num = int(nums.max()) if nums.notna().any() else start - 1
+    first = max(max_num, start - 1) + 1
+    return [f"{group_prefix}{n}"[:20] for n in range(first, first + n_new)]
 
-    for code in existing_codes:
-        match = pattern.match(_norm(code))
-        if match:
-            try:
-                num = int(match.group(1))
-                if num > max_num:
-                    max_num = num
-            except ValueError:
-                pass
 
-    return f"{group_prefix}{max_num + 1}"[:20]
+def _next_code_for_group(existing_codes: Iterable[str], group_prefix: str, start: int = 10000) -> str:
+    """Generate next sequential code for a group (a one-code allocation)."""
+    return _alloc_codes_for_group(existing_codes, group_prefix, 1, start)[0]
+
+
+@lru_cache(maxsize=256)
+def _material_pattern(materials: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """
+    Compile allowed material keywords into one case-insensitive alternation.
+    Returns None when there are no keywords (nothing is allowed).
+    """
+    if not materials:
+        return None
+    return re.compile("|".join(re.escape(m) for m in materials), re.IGNORECASE)
 
 
 def _check_material_restriction(group_code: str, fd2: str, material_restrictions: Dict[str, List[str]]) -> bool:
@@ -110,15 +163,9 @@ def _check_material_restriction(group_code: str, fd2: str, material_restrictions
     if group_code not in material_restrictions:
         return True  # No restriction = allowed
 
-    allowed_materials = material_restrictions[group_code]
-    fd2_norm = _norm(fd2)
-
     # Check if FD2 contains any of the allowed material keywords
-    for material in allowed_materials:
-        if material.lower() in fd2_norm.lower():
-            return True
-
-    return False
+    pattern = _material_pattern(tuple(material_restrictions[group_code]))
+    return pattern is not None and pattern.search(_norm(fd2)) is not None
 
 
 # ========== Google Sheets Data Loading ==========
@@ -330,11 +377,12 @@ def load_fabric_data_from_sheets(
             except Exception:
                 pass
 
-    _p("Loading Retail tab from Google Sheets...", 5)
-    retail_rows = sheets_service.fetch_sheet_data(spreadsheet_id, f"{retail_tab}!A:Z")
-
-    _p("Loading Wholesale tab from Google Sheets...", 10)
-    wholesale_rows = sheets_service.fetch_sheet_data(spreadsheet_id, f"{wholesale_tab}!A:Z")
+    _p("Loading Retail and Wholesale tabs from Google Sheets...", 5)
+    retail_range = f"{retail_tab}!A:Z"
+    wholesale_range = f"{wholesale_tab}!A:Z"
+    tabs = sheets_service.fetch_sheets_batch(spreadsheet_id, [retail_range, wholesale_range])
+    retail_rows = tabs.get(retail_range, [])
+    wholesale_rows = tabs.get(wholesale_range, [])
 
     def _parse_sheet(rows, is_wholesale=False):
         """Parse sheet rows into DataFrame."""
@@ -363,14 +411,11 @@ def load_fabric_data_from_sheets(
         # Check for optional Width column (for vertical blind conversion)
         has_width = "Width" in headers
 
-        # Build DataFrame
-        data = []
-        for row in rows[1:]:
-            if len(row) < len(headers):
-                row = row + [""] * (len(headers) - len(row))
-            data.append(row[:len(headers)])
-
-        df = pd.DataFrame(data, columns=headers, dtype=str).fillna("")
+        # Build DataFrame with string dtype up front (rows padded/truncated to header width).
+        # columns= rather than a dict so repeated headers keep every column, as the sheet has them
+        n = len(headers)
+        data = [row[:n] + [""] * (n - len(row)) for row in rows[1:]]
+        df = pd.DataFrame(data, columns=headers, dtype="string").fillna("")
 
         # Normalize price column to "Price"
         if price_col == "Price Category":
@@ -384,7 +429,7 @@ def load_fabric_data_from_sheets(
         ].copy()
 
         # Add key for matching
-        df["_key"] = df.apply(lambda r: _build_desc_key(r["FD1"], r["FD2"], r["FD3"]), axis=1)
+        df["_key"] = _desc_key_series(df, "FD1", "FD2", "FD3")
 
         # Log if Width column is available (for vertical blind conversion)
         if has_width and not is_wholesale:
@@ -417,18 +462,20 @@ def load_fabric_data_from_sheets(
         # Apply material restrictions and track filtered items
         if group_code in material_restrictions:
             before_keys = set(group_df["_key"].tolist())
-            group_df = group_df[
-                group_df.apply(
-                    lambda r: _check_material_restriction(group_code, r["FD2"], material_restrictions),
-                    axis=1
-                )
-            ].copy()
+            pattern = _material_pattern(tuple(material_restrictions[group_code]))
+            if pattern is None:
+                allowed = pd.Series(False, index=group_df.index)
+            else:
+                allowed = group_df["FD2"].str.strip().str.contains(pattern, regex=True)
+            group_df = group_df[allowed].copy()
             after_keys = set(group_df["_key"].tolist())
             filtered_by_material[group_code] = before_keys - after_keys
         else:
             filtered_by_material[group_code] = set()
 
-        fabrics_by_group[group_code] = group_df
+        # Sheets often repeat a brand/fabric/colour; compute_changes only ever uses the first
+        # row per key, so drop the repeats here once
+        fabrics_by_group[group_code] = group_df.drop_duplicates("_key").reset_index(drop=True)
 
     _p(f"Loaded fabrics for {len(fabrics_by_group)} groups", 30)
     return fabrics_by_group, filtered_by_material
@@ -436,7 +483,7 @@ def load_fabric_data_from_sheets(
 
 # ========== Database Loading ==========
 
-def load_existing_buz_inventory(db, groups_config: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Dict[str, str]]]:
+def load_existing_buz_inventory(db, groups_config: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Set[str]]]:
     """
     Load existing Buz inventory for all blinds/awnings groups.
 
@@ -471,29 +518,26 @@ def load_existing_buz_inventory(db, groups_config: Dict[str, Dict[str, Any]]) ->
 
     rows = db.execute_query(query, group_codes).fetchall()
 
-    # Convert to DataFrame
+    # Convert to DataFrame (sqlite3.Row is a sequence, so rows go in as records)
     if rows:
-        df_all = pd.DataFrame([dict(r) for r in rows], dtype=str).fillna("")
+        df_all = pd.DataFrame.from_records(rows, columns=INV_COLS[:-1]).fillna("").astype(str)
+        df_all["_key"] = _desc_key_series(df_all, "DescnPart1", "DescnPart2", "DescnPart3")
+        # Split by group in one pass rather than one boolean mask per group; the group
+        # column has only a handful of distinct values, so group on categorical codes
+        df_all["inventory_group_code"] = df_all["inventory_group_code"].astype("category")
+        grouped = dict(tuple(df_all.groupby("inventory_group_code", sort=False, observed=True)))
     else:
-        df_all = pd.DataFrame()
-
-    # Add matching key
-    if not df_all.empty:
-        df_all["_key"] = df_all.apply(
-            lambda r: _build_desc_key(r["DescnPart1"], r["DescnPart2"], r["DescnPart3"]),
-            axis=1
-        )
+        grouped = {}
 
-    # Split by group
     inv_by_group = {}
     existing_codes = {}
 
     for group_code in group_codes:
-        if df_all.empty:
-            inv_by_group[group_code] = pd.DataFrame()
+        group_df = grouped.get(group_code)
+        if group_df is None:
+            inv_by_group[group_code] = _EMPTY_INV_DF
             existing_codes[group_code] = set()
         else:
-            group_df = df_all[df_all["inventory_group_code"] == group_code].copy()
             inv_by_group[group_code] = group_df
             existing_codes[group_code] = set(group_df["Code"].tolist())
 
@@ -506,36 +550,62 @@ def load_existing_buz_pricing(db, groups_config: Dict[str, Dict[str, Any]]) -> D
 
     Returns dict: inventory_code → {sell_price, cost_price, markup, date_from}
     """
-    query = """
-        SELECT
-            InventoryCode,
-            SellSQM,
-            CostSQM,
-            DateFrom,
-            CustomerPriceGroupCode
-        FROM pricing_data
-    """
-
-    rows = db.execute_query(query).fetchall()
-
-    if not rows:
+    # Latest base-price row per code, picked in SQL. Rows with a
+    # CustomerPriceGroupCode are price group overrides, not base pricing.
+    # DateFrom is stored as either D/M/YYYY (zero-padded or not) or YYYY-MM-DD, so
+    # normalise to ISO for ordering; unparseable dates sort oldest, ties go to the
+    # last inserted row. after_day is DateFrom past its first '/', i.e. M/YYYY...
+    # Only codes from the retail groups' inventory are ranked (wholesale groups price via grids).
+    retail_groups = [g for g in groups_config if not _is_wholesale_group(g)]
+    if not retail_groups:
         return {}
 
-    df = pd.DataFrame([dict(r) for r in rows], dtype=str).fillna("")
-
-    # Filter out rows where CustomerPriceGroupCode is not empty
-    # (these are price group overrides, not base pricing)
-    df = df[df["CustomerPriceGroupCode"].str.strip() == ""].copy()
-
-    # Parse dates and sort to get latest per code
-    df["_date_dt"] = pd.to_datetime(df["DateFrom"], errors="coerce", dayfirst=True)
-    df = df.sort_values(["InventoryCode", "_date_dt"], kind="mergesort")
+    placeholders = ','.join('?' * len(retail_groups))
+    query = f"""
+        SELECT InventoryCode, SellSQM, CostSQM, DateFrom
+        FROM (
+            SELECT
+                InventoryCode,
+                SellSQM,
+                CostSQM,
+                DateFrom,
+                ROW_NUMBER() OVER (
+                    PARTITION BY InventoryCode
+                    ORDER BY
+                        CASE
+                            WHEN DateFrom LIKE '____-__-__%' THEN substr(DateFrom, 1, 10)
+                            WHEN DateFrom GLOB '[0-9]*/[0-9]*/[0-9][0-9][0-9][0-9]*'
+                                THEN printf(
+                                    '%s-%02d-%02d',
+                                    substr(after_day, instr(after_day, '/') + 1, 4),
+                                    CAST(substr(after_day, 1, instr(after_day, '/') - 1) AS INTEGER),
+                                    CAST(substr(DateFrom, 1, instr(DateFrom, '/') - 1) AS INTEGER)
+                                )
+                        END DESC,
+                        id DESC
+                ) AS rn
+            FROM (
+                SELECT
+                    id,
+                    InventoryCode,
+                    SellSQM,
+                    CostSQM,
+                    DateFrom,
+                    substr(DateFrom, instr(DateFrom, '/') + 1) AS after_day
+                FROM pricing_data
+                WHERE TRIM(COALESCE(CustomerPriceGroupCode, '')) = ''
+                  AND InventoryCode IN (
+                      SELECT Code FROM inventory_items WHERE inventory_group_code IN ({placeholders})
+                  )
+            )
+        )
+        WHERE rn = 1
+    """
 
-    # Get last row per code
-    latest = df.groupby("InventoryCode", as_index=False).tail(1)
+    rows = db.execute_query(query, retail_groups).fetchall()
 
     pricing_map = {}
-    for _, row in latest.iterrows():
+    for row in rows:
         code = _norm(row["InventoryCode"])
         sell = _q2(row["SellSQM"])
         cost = _q2(row["CostSQM"])
@@ -560,7 +630,7 @@ def load_existing_buz_pricing(db, groups_config: Dict[str, Dict[str, Any]]) -> D
 def compute_changes(
     fabrics_by_group: Dict[str, pd.DataFrame],
     inv_by_group: Dict[str, pd.DataFrame],
-    existing_codes: Dict[str, set],
+    existing_codes: Dict[str, Set[str]],
     groups_config: Dict[str, Dict[str, Any]],
     pricing_map: Dict[str, Dict[str, Any]],
     filtered_by_material: Dict[str, set],
@@ -585,7 +655,9 @@ def compute_changes(
 
     items_changes = defaultdict(list)
     pricing_changes = defaultdict(list)
-    change_log = []
+    change_log_rows: List[Tuple[str, str, str, str, str]] = []
+    # Price changes take effect tomorrow; format the date once for the whole run
+    price_date_from = _tomorrow_ddmmyyyy()
     markup_info = {}
 
     _p("Computing changes for each group...", 35)
@@ -593,7 +665,7 @@ def compute_changes(
     for group_code, group_cfg in groups_config.items():
         # Don't log per-group to avoid resetting progress bar
         fabrics_df = fabrics_by_group.get(group_code, pd.DataFrame())
-        inv_df = inv_by_group.get(group_code, pd.DataFrame())
+        inv_df = inv_by_group.get(group_code, _EMPTY_INV_DF)
         codes_set = existing_codes.get(group_code, set())
 
         # Get config for this group
@@ -650,14 +722,20 @@ def compute_changes(
                 "markup_override": markup_override
             }
 
-        # Build sets of keys
-        fabric_keys = set(fabrics_df["_key"].tolist()) if not fabrics_df.empty else set()
-        inv_keys = set(inv_df["_key"].tolist()) if not inv_df.empty else set()
+        # Outer-join fabrics to inventory on _key (first row per key on each side).
+        # Inventory columns carry an "_old" suffix so they can't collide with sheet columns.
+        fab_first = fabrics_df.drop_duplicates("_key") if not fabrics_df.empty else pd.DataFrame(columns=["_key"])
+        inv_first = inv_df.drop_duplicates("_key") if not inv_df.empty else _EMPTY_INV_DF
+        inv_first = inv_first.add_suffix("_old").rename(columns={"_key_old": "_key"})
+        merged = fab_first.merge(inv_first, on="_key", how="outer", indicator=True)
+        side = merged.pop("_merge")
 
         # ADD: In fabrics, not in inventory
-        add_keys = fabric_keys - inv_keys
-        for key in add_keys:
-            fabric_row = fabrics_df[fabrics_df["_key"] == key].iloc[0]
+        # Allocate the whole block of new codes up front from a single scan of existing codes
+        adds = merged[side == "left_only"]
+        new_codes = _alloc_codes_for_group(codes_set, group_code, len(adds))
+        codes_set.update(new_codes)
+        for fabric_row, new_code in zip(adds.to_dict("records"), new_codes):
 
             fd1 = _norm(fabric_row["FD1"])
             fd2 = _norm(fabric_row["FD2"])
@@ -665,10 +743,6 @@ def compute_changes(
             unleashed_code = _norm(fabric_row["Unleashed Code"])
             price_value = _norm(fabric_row["Price"])
 
-            # Generate new code
-            new_code = _next_code_for_group(list(codes_set), group_code)
-            codes_set.add(new_code)
-
             description = _build_description(prefix, fd1, fd2, fd3)
 
             # For wholesale groups, look up grid codes from Price Grids tab
@@ -708,13 +782,7 @@ def compute_changes(
 
             items_changes[group_code].append(item_row)
 
-            change_log.append({
-                "Group": group_code,
-                "Operation": "A",
-                "Code": new_code,
-                "Description": description,
-                "Reason": "New fabric"
-            })
+            change_log_rows.append((group_code, "A", new_code, description, "New fabric"))
 
             # Pricing for retail groups only
             if not is_wholesale and markup_used:
@@ -754,11 +822,26 @@ def compute_changes(
                     "Operation": "A"
                 })
 
-        # EDIT: In both, check for changes
-        shared_keys = fabric_keys & inv_keys
-        for key in shared_keys:
-            fabric_row = fabrics_df[fabrics_df["_key"] == key].iloc[0]
-            inv_row = inv_df[inv_df["_key"] == key].iloc[0]
+        # EDIT: In both, check for changes (row holds sheet columns plus inventory "_old" columns)
+        both = merged[side == "both"]
+        if both.empty:
+            supp_changed, reactivate = [], []
+        else:
+            # Supplier product code changed (case-insensitive), or inactive and not already deprecated
+            supp_changed = (
+                _norm_series(both["Unleashed Code"]).str.lower()
+                .ne(_norm_series(both["SupplierProductCode_old"]).str.lower())
+            ).tolist()
+            reactivate = (
+                ~_norm_series(both["Active_old"]).str.upper().isin(("TRUE", "YES", "1"))
+                & _norm_series(both["Warning_old"]).ne(DEPRECATED_WARNING)
+            ).tolist()
+
+        # Unchanged rows only matter to the retail price check; skip them before any normalising
+        check_pricing = bool(not is_wholesale and markup_used)
+        for fabric_row, code_changed, reactivated in zip(both.to_dict("records"), supp_changed, reactivate):
+            if not (code_changed or reactivated or check_pricing):
+                continue
 
             fd1 = _norm(fabric_row["FD1"])
             fd2 = _norm(fabric_row["FD2"])
@@ -766,30 +849,21 @@ def compute_changes(
             unleashed_code = _norm(fabric_row["Unleashed Code"])
             price_value = _norm(fabric_row["Price"])
 
-            existing_code = _norm(inv_row["Code"])
-            existing_supp_code = _norm(inv_row["SupplierProductCode"])
-            existing_active = _norm(inv_row["Active"]).upper() in ("TRUE", "YES", "1")
-            existing_warning = _norm(inv_row["Warning"])
+            existing_code = _norm(fabric_row["Code_old"])
+            existing_supp_code = _norm(fabric_row["SupplierProductCode_old"])
 
             reasons = []
-            needs_edit = False
-
-            # Check if supplier product code changed (case-insensitive comparison)
-            if unleashed_code.lower() != existing_supp_code.lower():
-                needs_edit = True
+            if code_changed:
                 reasons.append(f"Supplier code changed: {existing_supp_code} → {unleashed_code}")
-
-            # Check if inactive (and not already deprecated)
-            if not existing_active and existing_warning != DEPRECATED_WARNING:
-                needs_edit = True
+            if reactivated:
                 reasons.append("Reactivated")
 
-            if needs_edit:
+            if reasons:
                 description = _build_description(prefix, fd1, fd2, fd3)
 
                 # For wholesale groups, look up grid codes from Price Grids tab
-                item_price_grid = price_grid_code or _norm(inv_row["PriceGridCode"])
-                item_cost_grid = cost_grid_code or _norm(inv_row["CostGridCode"])
+                item_price_grid = price_grid_code or _norm(fabric_row["PriceGridCode_old"])
+                item_cost_grid = cost_grid_code or _norm(fabric_row["CostGridCode_old"])
                 if is_wholesale:
                     price_category = _norm(fabric_row.get("Price", ""))  # For wholesale, "Price" column contains Price Category
                     lookup_key = (group_code, price_category)
@@ -805,7 +879,7 @@ def compute_changes(
                         logger.debug(f"Group {group_code} EDIT {existing_code}: No grid code mapping for category '{price_category}' - blanking out")
 
                 item_row = {
-                    "PkId": _norm(inv_row["PkId"]),
+                    "PkId": _norm(fabric_row["PkId_old"]),
                     "Code": existing_code,
                     "Description": description,
                     "DescnPart1 (Material)": fd1,
@@ -813,7 +887,7 @@ def compute_changes(
                     "DescnPart3 (Colour)": fd3,
                     "Price Grid Code": item_price_grid or "",
                     "Cost Grid Code": item_cost_grid or "",
-                    "Discount Group Code": discount_code or _norm(inv_row["DiscountGroupCode"]),
+                    "Discount Group Code": discount_code or _norm(fabric_row["DiscountGroupCode_old"]),
                     "Tax Rate": TAX_RATE,
                     "Supplier": SUPPLIER_NAME,
                     "Supplier Product Code": unleashed_code,
@@ -824,16 +898,10 @@ def compute_changes(
 
                 items_changes[group_code].append(item_row)
 
-                change_log.append({
-                    "Group": group_code,
-                    "Operation": "E",
-                    "Code": existing_code,
-                    "Description": description,
-                    "Reason": "; ".join(reasons)
-                })
+                change_log_rows.append((group_code, "E", existing_code, description, "; ".join(reasons)))
 
             # Check pricing (retail only)
-            if not is_wholesale and markup_used:
+            if check_pricing:
                 new_cost = _q2(price_value)
 
                 # Convert LM to SQM for vertical blinds
@@ -861,89 +929,80 @@ def compute_changes(
                 new_sell = _q2(new_sell)
 
                 existing_pricing = pricing_map.get(existing_code, {})
-                existing_cost = _q2(existing_pricing.get("cost_price", Decimal("0.00")))
-                existing_sell = _q2(existing_pricing.get("sell_price", Decimal("0.00")))
+                existing_cost = _q2(existing_pricing.get("cost_price", _ZERO))
+                existing_sell = _q2(existing_pricing.get("sell_price", _ZERO))
 
                 # Check if cost or sell price changed by more than 1 cent (tolerance for rounding)
                 cost_diff = abs(new_cost - existing_cost)
                 sell_diff = abs(new_sell - existing_sell)
-                if cost_diff > Decimal("0.01") or sell_diff > Decimal("0.01"):
+                if cost_diff > _CENT or sell_diff > _CENT:
                     description = _build_description(prefix, fd1, fd2, fd3)
                     pricing_changes[group_code].append({
                         "PkId": "",
                         "Inventory Code": existing_code,
                         "Description": description,
-                        "Date From": _tomorrow_ddmmyyyy(),
+                        "Date From": price_date_from,
                         "CostSQM": f"{new_cost:.2f}",
                         "SellSQM": f"{new_sell:.2f}",
                         "Operation": "A"
                     })
 
-                    change_log.append({
-                        "Group": group_code,
-                        "Operation": "P",
-                        "Code": existing_code,
-                        "Description": description,
-                        "Reason": f"Price changed: Cost {existing_cost:.2f} → {new_cost:.2f}, Sell {existing_sell:.2f} → {new_sell:.2f}"
-                    })
+                    change_log_rows.append((
+                        group_code, "P", existing_code, description,
+                        f"Price changed: Cost {existing_cost:.2f} → {new_cost:.2f}, Sell {existing_sell:.2f} → {new_sell:.2f}"
+                    ))
 
         # DEPRECATE: In inventory (active, not already deprecated), not in fabrics
-        deprecate_keys = inv_keys - fabric_keys
-        for key in deprecate_keys:
-            inv_row = inv_df[inv_df["_key"] == key].iloc[0]
-
-            existing_code = _norm(inv_row["Code"])
-            existing_active = _norm(inv_row["Active"]).upper() in ("TRUE", "YES", "1")
-            existing_warning = _norm(inv_row["Warning"])
-
-            # Only deprecate if active and not already deprecated
-            if existing_active and existing_warning != DEPRECATED_WARNING:
-                fd1 = _norm(inv_row["DescnPart1"])
-                fd2 = _norm(inv_row["DescnPart2"])
-                fd3 = _norm(inv_row["DescnPart3"])
-
-                # Special case: ROMNBQ - don't deprecate items where DescnPart1 starts with "1 "
-                if group_code == "ROMNBQ" and fd1.startswith("1 "):
-                    continue
-
-                description = _build_description(prefix, fd1, fd2, fd3)
-
-                item_row = {
-                    "PkId": _norm(inv_row["PkId"]),
-                    "Code": existing_code,
-                    "Description": description,
-                    "DescnPart1 (Material)": fd1,
-                    "DescnPart2 (Material Types)": fd2,
-                    "DescnPart3 (Colour)": fd3,
-                    "Price Grid Code": _norm(inv_row["PriceGridCode"]),
-                    "Cost Grid Code": _norm(inv_row["CostGridCode"]),
-                    "Discount Group Code": _norm(inv_row["DiscountGroupCode"]),
-                    "Tax Rate": TAX_RATE,
-                    "Supplier": SUPPLIER_NAME,
-                    "Supplier Product Code": _norm(inv_row["SupplierProductCode"]),
-                    "Active": "TRUE",  # Keep active
-                    "Warning": DEPRECATED_WARNING,
-                    "Operation": "E"
-                }
-
-                items_changes[group_code].append(item_row)
+        gone = merged[side == "right_only"]
+        if not gone.empty:
+            gone = gone[
+                _norm_series(gone["Active_old"]).str.upper().isin(("TRUE", "YES", "1"))
+                & _norm_series(gone["Warning_old"]).ne(DEPRECATED_WARNING)
+            ]
+            # Special case: ROMNBQ - don't deprecate items where DescnPart1 starts with "1 "
+            if group_code == "ROMNBQ":
+                gone = gone[~_norm_series(gone["DescnPart1_old"]).str.startswith("1 ")]
+
+        if not gone.empty:
+            codes = _norm_series(gone["Code_old"]).tolist()
+            fd1s = _norm_series(gone["DescnPart1_old"]).tolist()
+            fd2s = _norm_series(gone["DescnPart2_old"]).tolist()
+            fd3s = _norm_series(gone["DescnPart3_old"]).tolist()
+            descriptions = [_build_description(prefix, fd1, fd2, fd3) for fd1, fd2, fd3 in zip(fd1s, fd2s, fd3s)]
+
+            # Build all deprecation rows column-wise, then emit the row dicts in one go
+            dep_df = pd.DataFrame({
+                "PkId": _norm_series(gone["PkId_old"]).tolist(),
+                "Code": codes,
+                "Description": descriptions,
+                "DescnPart1 (Material)": fd1s,
+                "DescnPart2 (Material Types)": fd2s,
+                "DescnPart3 (Colour)": fd3s,
+                "Price Grid Code": _norm_series(gone["PriceGridCode_old"]).tolist(),
+                "Cost Grid Code": _norm_series(gone["CostGridCode_old"]).tolist(),
+                "Discount Group Code": _norm_series(gone["DiscountGroupCode_old"]).tolist(),
+                "Supplier Product Code": _norm_series(gone["SupplierProductCode_old"]).tolist(),
+            }, dtype=object).assign(**{
+                "Tax Rate": TAX_RATE,
+                "Supplier": SUPPLIER_NAME,
+                "Active": "TRUE",  # Keep active
+                "Warning": DEPRECATED_WARNING,
+                "Operation": "E",
+            })
+            dep_df = dep_df[list(_ITEM_ROW_COLS)]
+            items_changes[group_code].extend(dep_df.to_dict("records"))
 
-                # Determine deprecation reason
-                filtered_keys = filtered_by_material.get(group_code, set())
+            # Determine deprecation reason
+            filtered_keys = filtered_by_material.get(group_code, set())
+            for key, code, description, fd2 in zip(gone["_key"].tolist(), codes, descriptions, fd2s):
                 if key in filtered_keys:
                     reason = f"Material type '{fd2}' not allowed for this product group"
                 else:
                     reason = "Not in Google Sheet"
-
-                change_log.append({
-                    "Group": group_code,
-                    "Operation": "D",
-                    "Code": existing_code,
-                    "Description": description,
-                    "Reason": reason
-                })
+                change_log_rows.append((group_code, "D", code, description, reason))
 
     _p("Change computation complete", 60)
+    change_log = [dict(zip(CHANGE_LOG_COLS, row)) for row in change_log_rows]
     return dict(items_changes), dict(pricing_changes), change_log, markup_info
 
 
@@ -992,19 +1051,66 @@ def _format_worksheet(ws, headers: List[str]):
             ws.column_dimensions[col_letter].hidden = True
 
 
+def changes_to_columnar(changes: Dict[str, List[Dict]]) -> Dict[str, Dict[str, List]]:
+    """
+    Pivot dict[group_code] → list of row dicts into dict[group_code] → {column: values}.
+
+    Rows within a group share the same keys, so the column names are stored once
+    per group instead of once per row when the job result is JSON-encoded.
+    """
+    return {group_code: _rows_to_columns(rows) for group_code, rows in changes.items()}
+
+
+def _rows_to_columns(rows: List[Dict]) -> Dict[str, List]:
+    """One group's list of row dicts as {column: values}."""
+    cols = list(rows[0].keys()) if rows else []
+    return {c: [r.get(c, "") for r in rows] for c in cols}
+
+
+def changes_from_columnar(columnar: Dict[str, Any]) -> Dict[str, List[Dict]]:
+    """
+    Inverse of changes_to_columnar: rebuild dict[group_code] → list of row dicts.
+
+    Job results stored before the columnar format already hold lists of row dicts;
+    those groups are passed through unchanged.
+    """
+    changes = {}
+    for group_code, cols in columnar.items():
+        if isinstance(cols, list):
+            changes[group_code] = cols
+            continue
+        names = list(cols.keys())
+        changes[group_code] = [dict(zip(names, values)) for values in zip(*cols.values())]
+    return changes
+
+
+def columnar_row_count(cols: Any) -> int:
+    """Number of rows in one group's change set, columnar or (from older job results) a row list."""
+    if isinstance(cols, list):
+        return len(cols)
+    return len(next(iter(cols.values()), []))
+
+
 def generate_workbooks_in_memory(
-    items_changes: Dict[str, List[Dict]],
-    pricing_changes: Dict[str, List[Dict]],
+    items_changes: Dict[str, Dict[str, List]],
+    pricing_changes: Dict[str, Dict[str, List]],
     headers_cfg: Dict[str, List[Dict]]
 ):
     """
     Generate items and pricing upload workbooks in memory.
 
+    Takes the columnar change sets stored in the job result (see changes_to_columnar)
+    and writes rows straight from the column lists, without rebuilding row dicts.
+
     Returns (items_stream, pricing_stream) as BytesIO objects
     """
     from io import BytesIO
     from openpyxl.utils import get_column_letter
 
+    # Job results stored before the columnar format hold row lists; pivot those groups
+    items_changes = {g: _rows_to_columns(c) if isinstance(c, list) else c for g, c in items_changes.items()}
+    pricing_changes = {g: _rows_to_columns(c) if isinstance(c, list) else c for g, c in pricing_changes.items()}
+
     # Get headers from config
     items_headers = [h["spreadsheet_column"] for h in headers_cfg["buz_inventory_item_file"]]
     pricing_headers = [h["spreadsheet_column"] for h in headers_cfg["buz_pricing_file"]]
@@ -1013,19 +1119,18 @@ def generate_workbooks_in_memory(
     items_wb = Workbook()
     items_wb.remove(items_wb.active)
 
-    for group_code, rows in items_changes.items():
-        if not rows:
+    for group_code, cols in items_changes.items():
+        n_rows = columnar_row_count(cols)
+        if not n_rows:
             continue
 
         ws = items_wb.create_sheet(title=group_code)
         ws.append([])  # Row 1 blank
         ws.append(items_headers + [""])  # Row 2 headers + trailing blank
 
-        for row_dict in rows:
-            row_values = []
-            for header in items_headers:
-                row_values.append(row_dict.get(header, ""))
-            ws.append(row_values + [""])  # Trailing blank cell
+        blank = [""] * n_rows
+        for row_values in zip(*(cols.get(header, blank) for header in items_headers)):
+            ws.append(list(row_values) + [""])  # Trailing blank cell
 
         # Format sheet: autofit columns and hide empty ones
         _format_worksheet(ws, items_headers)
@@ -1045,23 +1150,19 @@ def generate_workbooks_in_memory(
     pricing_wb = Workbook()
     pricing_wb.remove(pricing_wb.active)
 
-    for group_code, rows in pricing_changes.items():
-        if not rows:
+    for group_code, cols in pricing_changes.items():
+        n_rows = columnar_row_count(cols)
+        if not n_rows:
             continue
 
         ws = pricing_wb.create_sheet(title=group_code)
         ws.append(pricing_headers)  # Row 1 headers (pricing file format)
 
-        for row_dict in rows:
-            row_values = []
-            for header in pricing_headers:
-                if header == "Operation":
-                    row_values.append("A")
-                elif header == "PkId":
-                    row_values.append("")
-                else:
-                    row_values.append(row_dict.get(header, ""))
-            ws.append(row_values)
+        blank = [""] * n_rows
+        # Pricing rows are always adds with no PkId
+        fixed = {"Operation": ["A"] * n_rows, "PkId": blank}
+        for row_values in zip(*(fixed.get(header) or cols.get(header, blank) for header in pricing_headers)):
+            ws.append(list(row_values))
 
         # Format sheet: autofit columns and hide empty ones
         _format_worksheet(ws, pricing_headers)
@@ -1217,6 +1318,14 @@ def sync_blinds_awnings_fabrics(
     retail_tab = sheets_cfg["retail_tab"]
     wholesale_tab = sheets_cfg["wholesale_tab"]
     buz_template_tab = sheets_cfg["buz_template_tab"]
+    price_grids_tab = sheets_cfg.get("price_grids_tab", "Price Grids")
+
+    # Warm the service's range cache with every tab this sync reads, in one values.batchGet;
+    # the loaders below then hit the cache instead of making a round-trip each
+    sheets_service.fetch_sheets_batch(
+        spreadsheet_id,
+        [f"{tab}!A:Z" for tab in (buz_template_tab, price_grids_tab, retail_tab, wholesale_tab)],
+    )
 
     # Load groups configuration from Google Sheets
     groups_config = load_groups_config_from_sheet(
@@ -1227,7 +1336,6 @@ def sync_blinds_awnings_fabrics(
     )
 
     # Load price grids lookup for wholesale items
-    price_grids_tab = sheets_cfg.get("price_grids_tab", "Price Grids")
     price_grids = load_price_grids_lookup(
         sheets_service,
         spreadsheet_id,
@@ -1319,8 +1427,9 @@ def sync_blinds_awnings_fabrics(
     return {
         "summary": summary,
         "change_log": change_log,
-        "items_changes": items_changes,
-        "pricing_changes": pricing_changes,
+        # Stored columnar to keep the job result JSON compact; see changes_from_columnar
+        "items_changes": changes_to_columnar(items_changes),
+        "pricing_changes": changes_to_columnar(pricing_changes),
         "headers_cfg": headers_cfg  # Include headers for on-demand generation
     }
 
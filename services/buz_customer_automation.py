@@ -10,9 +10,23 @@ from typing import Optional, Dict, Any, List
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 
 from services.zendesk_service import CustomerData
+from services.playwright_launch import LAUNCH_ARGS, HEADLESS_LAUNCH_ARGS
 
 logger = logging.getLogger(__name__)
 
+# Resolved once at import rather than on every instance switch
+SECRETS_DIR = Path(__file__).resolve().parent.parent / ".secrets"
+
+
+def get_storage_state_path(instance_name: str) -> Path:
+    """
+    Convert instance name to storage state file path.
+    Example: "Watson Blinds" -> "/absolute/path/.secrets/buz_storage_state_watsonblinds.json"
+    """
+    # Normalize: lowercase, remove spaces
+    normalized = instance_name.lower().replace(' ', '')
+    return SECRETS_DIR / f"buz_storage_state_{normalized}.json"
+
 
 @dataclass
 class AddUserData:
@@ -107,7 +121,10 @@ class BuzCustomerAutomation:
             )
 
         self.playwright = await async_playwright().__aenter__()
-        self.browser = await self.playwright.chromium.launch(headless=self.headless)
+        self.browser = await self.playwright.chromium.launch(
+            headless=self.headless,
+            args=HEADLESS_LAUNCH_ARGS if self.headless else LAUNCH_ARGS,
+        )
         self.context = await self.browser.new_context(
             storage_state=str(self.storage_state_path)
         )
@@ -168,12 +185,18 @@ class BuzCustomerAutomation:
         org_link = page.locator('td a').first
         if await org_link.count() > 0:
             await org_link.click()
-            await page.wait_for_load_state('networkidle')
+            # The org choice is in once we've navigated off the selector; no need to wait for network idle
+            await page.wait_for_url(lambda url: "mybuz/organizations" not in url, wait_until='domcontentloaded')
             self.result.add_step("✓ Clicked through org selector")
 
             # Re-navigate to intended destination (clicking org takes us to home page)
-            self.result.add_step(f"Re-navigating to intended page...")
-            await page.goto(intended_url, wait_until='networkidle')
+            if page.url.startswith(intended_url):
+                # Callers read form values straight away, so keep the settle wait the goto would give
+                await page.wait_for_load_state('networkidle')
+                self.result.add_step("Already on intended page")
+            else:
+                self.result.add_step(f"Re-navigating to intended page...")
+                await page.goto(intended_url, wait_until='networkidle')
         else:
             raise Exception("On org selector page but couldn't find org link to click")
 
@@ -814,18 +837,6 @@ async def add_customer_from_zendesk_ticket(
 
     update(20, f"Ticket parsed. Customer: {customer_data.company_name}, Instances: {', '.join(customer_data.buz_instances)}")
 
-    # Helper function to get storage state path from instance name
-    def get_storage_state_path(instance_name: str) -> Path:
-        """
-        Convert instance name to storage state file path.
-        Example: "Watson Blinds" -> "/absolute/path/.secrets/buz_storage_state_watsonblinds.json"
-        """
-        # Normalize: lowercase, remove spaces
-        normalized = instance_name.lower().replace(' ', '')
-        # Use absolute path relative to this file's directory (project root)
-        project_root = Path(__file__).resolve().parent.parent
-        return project_root / ".secrets" / f"buz_storage_state_{normalized}.json"
-
     # Get the storage state path for the first instance
     first_instance = customer_data.buz_instances[0]
     first_storage_path = get_storage_state_path(first_instance)
@@ -894,18 +905,6 @@ async def add_user_for_existing_customer(
     update(10, f"New user: {user_data.first_name} {user_data.last_name} ({user_data.email})")
     update(15, f"Finding customer from existing user: {user_data.existing_user_email}")
 
-    # Helper function to get storage state path from instance name
-    def get_storage_state_path(instance_name: str) -> Path:
-        """
-        Convert instance name to storage state file path.
-        Example: "Watson Blinds" -> "/absolute/path/.secrets/buz_storage_state_watsonblinds.json"
-        """
-        # Normalize: lowercase, remove spaces
-        normalized = instance_name.lower().replace(' ', '')
-        # Use absolute path relative to this file's directory (project root)
-        project_root = Path(__file__).resolve().parent.parent
-        return project_root / ".secrets" / f"buz_storage_state_{normalized}.json"
-
     # Get the storage state path for the first instance
     first_instance = user_data.buz_instances[0]
     first_storage_path = get_storage_state_path(first_instance)
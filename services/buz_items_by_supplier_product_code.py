@@ -1,8 +1,7 @@
 import logging
-import pandas as pd
 from io import BytesIO
+from openpyxl import Workbook
 from services.excel import OpenPyXLFileHandler
-import re
 
 
 # Configure logging
@@ -25,9 +24,10 @@ def extract_headers(sheet, header_row):
             return ""
         return cell_value.strip().rstrip("*")
 
-    # Extract and clean headers
-    raw_headers = [cell.value for cell in sheet[header_row]]
-    headers = {clean_header(cell): idx for idx, cell in enumerate(raw_headers) if clean_header(cell)}
+    # Extract and clean headers (cleaned once per cell), mapping name -> column index
+    header_values = next(sheet.iter_rows(min_row=header_row, max_row=header_row, values_only=True), ())
+    cleaned = (clean_header(value) for value in header_values)
+    headers = {name: idx for idx, name in enumerate(cleaned) if name}
 
     return headers
 
@@ -35,9 +35,11 @@ def extract_headers(sheet, header_row):
 def filter_rows(sheet, supplier_product_codes, supplier_product_code_col_idx, operation_col_idx, header_row):
     """Filter rows based on supplier codes and update the 'Operation' column."""
     filtered_rows = []
+    # Matching is exact on the whole cell, so a set lookup per row is all that's needed
+    min_len = max(supplier_product_code_col_idx, operation_col_idx) + 1
 
     for row_index, row in enumerate(sheet.iter_rows(min_row=header_row + 1, values_only=True), start=header_row + 1):
-        if len(row) <= max(supplier_product_code_col_idx, operation_col_idx):
+        if len(row) < min_len:
             logger.warning(f"Row {row_index} skipped: insufficient columns.")
             continue
 
@@ -70,10 +72,8 @@ def process_single_sheet(sheet, supplier_product_codes, header_row):
         return None
 
     # Add header rows back to the filtered rows
-    for row_num in range(1, header_row + 1):
-        filtered_rows.insert(row_num - 1, [cell.value for cell in sheet[row_num]])
-
-    return filtered_rows
+    header_rows = sheet.iter_rows(min_row=1, max_row=header_row, values_only=True)
+    return [list(row) for row in header_rows] + filtered_rows
 
 
 def save_filtered_sheets_to_excel(filtered_sheets):
@@ -82,11 +82,15 @@ def save_filtered_sheets_to_excel(filtered_sheets):
         logger.warning("No sheets met the criteria for processing.")
         return None
 
+    # Stream rows into a write-only workbook; no intermediate DataFrame per sheet
+    workbook = Workbook(write_only=True)
+    for sheet_name, rows in filtered_sheets.items():
+        sheet = workbook.create_sheet(title=sheet_name)
+        for row in rows:
+            sheet.append(row)
+
     output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        for sheet_name, rows in filtered_sheets.items():
-            df = pd.DataFrame(rows)
-            df.to_excel(writer, index=False, header=False, sheet_name=sheet_name)
+    workbook.save(output)
     output.seek(0)
     return output
 
@@ -105,6 +109,12 @@ def process_buz_items_by_supplier_product_codes(
     """
     validate_uploaded_file(uploaded_file)
 
+    # Membership is tested once per data row, so use a set rather than the input list
+    supplier_product_codes = frozenset(supplier_product_codes or ())
+    if not supplier_product_codes:
+        logger.warning("No supplier product codes supplied; nothing to filter.")
+        return None
+
     filtered_sheets = {}
     for sheet_name in uploaded_file.workbook.sheetnames:
         logger.debug(f"Processing sheet: {sheet_name}")
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import re
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
@@ -11,8 +12,9 @@ import openpyxl
 import tempfile
 import os
 
-logger = logging.getLogger(__name__)
+from services.playwright_launch import LAUNCH_ARGS, HEADLESS_LAUNCH_ARGS, BLOCKED_ASSETS, abort_route
 
+logger = logging.getLogger(__name__)
 
 @dataclass
 class InventoryGroupDiscount:
@@ -69,6 +71,77 @@ class MaxDiscountReviewResult:
         }
 
 
+def read_inventory_groups(excel_path: Path) -> List[InventoryGroupDiscount]:
+    """
+    Read the orderable rows of a downloaded Inventory Groups workbook.
+
+    Args:
+        excel_path: Path to Excel file
+
+    Returns:
+        List of InventoryGroupDiscount objects
+    """
+    wb = openpyxl.load_workbook(excel_path, read_only=True)
+
+    # Find the "Inventory Groups" sheet
+    if "Inventory Groups" not in wb.sheetnames:
+        raise ValueError(f"Sheet 'Inventory Groups' not found in {excel_path.name}")
+
+    ws = wb["Inventory Groups"]
+
+    inventory_groups = []
+
+    # Skip header row (row 1), start from row 2
+    for row in ws.iter_rows(min_row=2, values_only=True):
+        # Column B = Description (index 1)
+        # Column C = Code (index 2)
+        # Column E = Seq No (index 4)
+        # Column G = Max Discount Percentage (index 6)
+        # Column N = Can be ordered (index 13)
+
+        description = row[1] if len(row) > 1 else None
+        code = row[2] if len(row) > 2 else None
+        seq_no_raw = row[4] if len(row) > 4 else None
+        max_discount = row[6] if len(row) > 6 else None
+        can_be_ordered = row[13] if len(row) > 13 else None
+
+        # Skip empty rows
+        if not code and not description:
+            continue
+
+        # Skip rows where "Can be ordered" is not YES
+        if can_be_ordered != "YES":
+            continue
+
+        # Parse seq no
+        seq_no = None
+        if seq_no_raw is not None:
+            try:
+                seq_no = int(seq_no_raw)
+            except (ValueError, TypeError):
+                pass
+
+        # Parse max discount percentage
+        # Buz stores percentages as the actual number (0.5 = 0.5%, 50 = 50%)
+        max_discount_pct = None
+        if max_discount is not None:
+            try:
+                max_discount_pct = float(max_discount)
+            except (ValueError, TypeError):
+                pass
+
+        inventory_groups.append(InventoryGroupDiscount(
+            code=code or "",
+            description=description or "",
+            max_discount_pct=max_discount_pct,
+            seq_no=seq_no,
+            can_be_ordered=can_be_ordered
+        ))
+
+    wb.close()
+    return inventory_groups
+
+
 class BuzMaxDiscountReview:
     """Download and compare max discount percentages across Buz orgs"""
 
@@ -116,7 +189,10 @@ class BuzMaxDiscountReview:
     async def __aenter__(self):
         """Context manager entry - launch browser"""
         self.playwright = await async_playwright().__aenter__()
-        self.browser = await self.playwright.chromium.launch(headless=self.headless)
+        self.browser = await self.playwright.chromium.launch(
+            headless=self.headless,
+            args=HEADLESS_LAUNCH_ARGS if self.headless else LAUNCH_ARGS,
+        )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -152,6 +228,7 @@ class BuzMaxDiscountReview:
         self.context = await self.browser.new_context(
             storage_state=str(storage_state_path)
         )
+        await self.context.route(BLOCKED_ASSETS, abort_route)
 
         self.result.add_step(f"✓ Switched to {org_config['display_name']}")
 
@@ -171,12 +248,16 @@ class BuzMaxDiscountReview:
         org_link = page.locator('td a').first
         if await org_link.count() > 0:
             await org_link.click()
-            await page.wait_for_load_state('networkidle')
+            # The org choice is in once we've navigated off the selector; no need to wait for network idle
+            await page.wait_for_url(lambda url: "mybuz/organizations" not in url, wait_until='domcontentloaded')
             self.result.add_step("✓ Clicked through org selector")
 
             # Re-navigate to intended destination
-            self.result.add_step(f"Re-navigating to intended page...")
-            await page.goto(intended_url, wait_until='networkidle')
+            if page.url.startswith(intended_url):
+                self.result.add_step("Already on intended page")
+            else:
+                self.result.add_step(f"Re-navigating to intended page...")
+                await page.goto(intended_url, wait_until='domcontentloaded')
         else:
             raise Exception("On org selector page but couldn't find org link to click")
 
@@ -250,10 +331,12 @@ class BuzMaxDiscountReview:
         finally:
             await page.close()
 
-    def parse_inventory_groups_excel(self, excel_path: Path) -> List[InventoryGroupDiscount]:
+    async def parse_inventory_groups_excel(self, excel_path: Path) -> List[InventoryGroupDiscount]:
         """
         Parse the Inventory Groups Excel file.
 
+        The workbook is read on a worker thread so the browser keeps being serviced meanwhile.
+
         Args:
             excel_path: Path to Excel file
 
@@ -262,64 +345,7 @@ class BuzMaxDiscountReview:
         """
         self.result.add_step(f"Parsing: {excel_path.name}")
 
-        wb = openpyxl.load_workbook(excel_path, read_only=True)
-
-        # Find the "Inventory Groups" sheet
-        if "Inventory Groups" not in wb.sheetnames:
-            raise ValueError(f"Sheet 'Inventory Groups' not found in {excel_path.name}")
-
-        ws = wb["Inventory Groups"]
-
-        inventory_groups = []
-
-        # Skip header row (row 1), start from row 2
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            # Column B = Description (index 1)
-            # Column C = Code (index 2)
-            # Column E = Seq No (index 4)
-            # Column G = Max Discount Percentage (index 6)
-            # Column N = Can be ordered (index 13)
-
-            description = row[1] if len(row) > 1 else None
-            code = row[2] if len(row) > 2 else None
-            seq_no_raw = row[4] if len(row) > 4 else None
-            max_discount = row[6] if len(row) > 6 else None
-            can_be_ordered = row[13] if len(row) > 13 else None
-
-            # Skip empty rows
-            if not code and not description:
-                continue
-
-            # Skip rows where "Can be ordered" is not YES
-            if can_be_ordered != "YES":
-                continue
-
-            # Parse seq no
-            seq_no = None
-            if seq_no_raw is not None:
-                try:
-                    seq_no = int(seq_no_raw)
-                except (ValueError, TypeError):
-                    pass
-
-            # Parse max discount percentage
-            # Buz stores percentages as the actual number (0.5 = 0.5%, 50 = 50%)
-            max_discount_pct = None
-            if max_discount is not None:
-                try:
-                    max_discount_pct = float(max_discount)
-                except (ValueError, TypeError):
-                    pass
-
-            inventory_groups.append(InventoryGroupDiscount(
-                code=code or "",
-                description=description or "",
-                max_discount_pct=max_discount_pct,
-                seq_no=seq_no,
-                can_be_ordered=can_be_ordered
-            ))
-
-        wb.close()
+        inventory_groups = await asyncio.to_thread(read_inventory_groups, excel_path)
 
         self.result.add_step(f"✓ Parsed {len(inventory_groups)} orderable inventory groups")
         return inventory_groups
@@ -453,7 +479,7 @@ class BuzMaxDiscountReview:
                 excel_path = await self.download_inventory_groups_excel(org_key)
 
                 # Parse Excel file
-                inventory_groups = self.parse_inventory_groups_excel(excel_path)
+                inventory_groups = await self.parse_inventory_groups_excel(excel_path)
 
                 # Store in result
                 org_discounts = OrgDiscounts(
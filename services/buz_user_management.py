@@ -3,13 +3,15 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 
-logger = logging.getLogger(__name__)
+from services.playwright_launch import LAUNCH_ARGS, HEADLESS_LAUNCH_ARGS, BLOCKED_ASSETS, abort_route
 
+logger = logging.getLogger(__name__)
 
 @dataclass
 class User:
@@ -100,47 +102,59 @@ class BuzUserManagement:
         }
     }
 
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, browser: Optional[Browser] = None):
         """
         Initialize user management scraper.
 
         Args:
             headless: Run browser in headless mode
+            browser: Already-launched browser to reuse; the caller keeps ownership and closes it
         """
         self.headless = headless
-        self.browser: Optional[Browser] = None
+        self.browser: Optional[Browser] = browser
+        self.owns_browser = browser is None
         self.context: Optional[BrowserContext] = None
         self.playwright = None
         self.result = UserManagementResult()
 
     async def __aenter__(self):
-        """Context manager entry - launch browser"""
-        self.playwright = await async_playwright().__aenter__()
-        self.browser = await self.playwright.chromium.launch(headless=self.headless)
+        """Context manager entry - launch browser (unless one was passed in)"""
+        if self.owns_browser:
+            self.playwright = await async_playwright().__aenter__()
+            self.browser = await self.playwright.chromium.launch(
+                headless=self.headless,
+                args=HEADLESS_LAUNCH_ARGS if self.headless else LAUNCH_ARGS,
+            )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit - close browser"""
+        """Context manager exit - close our context, and the browser if we launched it"""
         if self.context:
             await self.context.close()
-        if self.browser:
-            await self.browser.close()
+        if self.owns_browser:
+            if self.browser:
+                await self.browser.close()
+            if self.playwright:
+                await self.playwright.__aexit__(exc_type, exc_val, exc_tb)
 
-    async def switch_to_org(self, org_key: str):
+    async def switch_to_org(self, org_key: str, storage_state: Optional[Dict[str, Any]] = None):
         """
         Switch to a different Buz org by creating a new browser context.
 
         Args:
             org_key: Key from ORGS dict (e.g., 'canberra', 'tweed')
+            storage_state: Already-loaded storage state for the org; read from its file when omitted
         """
         org_config = self.ORGS[org_key]
-        storage_state_path = Path(org_config['storage_state'])
 
-        if not storage_state_path.exists():
-            raise FileNotFoundError(
-                f"Auth storage state not found at {storage_state_path}. "
-                f"Run tools/buz_auth_bootstrap.py {org_key} first."
-            )
+        if storage_state is None:
+            storage_state_path = Path(org_config['storage_state'])
+            if not storage_state_path.exists():
+                raise FileNotFoundError(
+                    f"Auth storage state not found at {storage_state_path}. "
+                    f"Run tools/buz_auth_bootstrap.py {org_key} first."
+                )
+            storage_state = str(storage_state_path)
 
         self.result.add_step(f"Switching to: {org_config['display_name']}")
 
@@ -150,8 +164,9 @@ class BuzUserManagement:
 
         # Create new context with org's authentication
         self.context = await self.browser.new_context(
-            storage_state=str(storage_state_path)
+            storage_state=storage_state
         )
+        await self.context.route(BLOCKED_ASSETS, abort_route)
 
         self.result.add_step(f"✓ Switched to {org_config['display_name']}")
 
@@ -171,12 +186,16 @@ class BuzUserManagement:
         org_link = page.locator('td a').first
         if await org_link.count() > 0:
             await org_link.click()
-            await page.wait_for_load_state('networkidle')
+            # The org choice is in once we've navigated off the selector; no need to wait for network idle
+            await page.wait_for_url(lambda url: "mybuz/organizations" not in url, wait_until='domcontentloaded')
             self.result.add_step("✓ Clicked through org selector")
 
             # Re-navigate to intended destination
-            self.result.add_step(f"Re-navigating to intended page...")
-            await page.goto(intended_url, wait_until='networkidle')
+            if page.url.startswith(intended_url):
+                self.result.add_step("Already on intended page")
+            else:
+                self.result.add_step(f"Re-navigating to intended page...")
+                await page.goto(intended_url, wait_until='networkidle')
         else:
             raise Exception("On org selector page but couldn't find org link to click")
 
@@ -268,7 +287,9 @@ class BuzUserManagement:
             # Navigate directly to user management page
             # Since we now have console domain auth in storage state, this should work
             self.result.add_step(f"Navigating to user management page...")
-            await page.goto(self.USER_MANAGEMENT_URL, wait_until='networkidle', timeout=30000)
+            # The Buz pages keep XHRs/websockets open, so 'networkidle' just burns the idle
+            # window; the user table selector below is what actually gates the next step
+            await page.goto(self.USER_MANAGEMENT_URL, wait_until='domcontentloaded', timeout=30000)
             self.result.add_step(f"User page loaded at: {page.url}")
 
             # Check if we ended up on the org selector page
@@ -277,8 +298,7 @@ class BuzUserManagement:
                 org_link = page.locator('td a').first
                 if await org_link.count() > 0:
                     await org_link.click()
-                    await page.wait_for_load_state('networkidle', timeout=30000)
-                    self.result.add_step(f"After org selector: {page.url}")
+                    self.result.add_step("✓ Clicked through org selector")
                 else:
                     raise Exception("On org selector but couldn't find org link")
 
@@ -457,7 +477,7 @@ async def toggle_user_active_status(
             # Navigate to user management page
             page = await manager.context.new_page()
 
-            await page.goto(manager.USER_MANAGEMENT_URL, wait_until='networkidle', timeout=30000)
+            await page.goto(manager.USER_MANAGEMENT_URL, wait_until='domcontentloaded', timeout=30000)
 
             # Wait for the table to load
             await page.wait_for_selector('table#userListTable', timeout=15000)
@@ -567,10 +587,201 @@ async def toggle_user_active_status(
     return result
 
 
+async def _open_user_list(manager: BuzUserManagement) -> Page:
+    """Open the current org's user management page in a new tab of the manager's context."""
+    page = await manager.context.new_page()
+    await page.goto(manager.USER_MANAGEMENT_URL, wait_until='domcontentloaded', timeout=30000)
+    await page.wait_for_selector('table#userListTable', timeout=15000)
+    return page
+
+
+async def _toggle_user_on_page(page: Page, org_key: str, change: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Toggle one user on an already-open user management page.
+
+    Args:
+        page: Page showing the org's user list (see _open_user_list)
+        org_key: Key from ORGS dict, echoed into the result
+        change: Dict with {user_email, is_active, user_type}
+
+    Returns:
+        Result dict with org_key, user_email, success, new_state, message and toggled
+        (True only when the switch was clicked and the user verified in the new state)
+    """
+    active_select = page.locator('ul.list-inline li:nth-child(2) select')
+    user_type_select = page.locator('ul.list-inline li:nth-child(3) select')
+    search_input = page.locator('input#search-text')
+
+    user_email = change['user_email']
+    is_active = change['is_active']
+    user_type = change['user_type']
+
+    result = {
+        'org_key': org_key,
+        'user_email': user_email,
+        'success': False,
+        'new_state': None,
+        'message': '',
+        'toggled': False
+    }
+
+    try:
+        logger.info(f"Toggling {user_email}: cache says is_active={is_active}, user_type={user_type}")
+
+        # Set filters for this user
+        active_value = "0: true" if is_active else "1: false"
+        await active_select.select_option(value=active_value)
+        await page.wait_for_timeout(500)
+
+        user_type_value = "1: 5" if user_type == "customer" else "0: 0"
+        await user_type_select.select_option(value=user_type_value)
+        await page.wait_for_timeout(500)
+
+        # Clear search and type email
+        await search_input.clear()
+        await page.wait_for_timeout(300)
+        await search_input.click()
+        await page.wait_for_timeout(100)
+        await search_input.press_sequentially(user_email, delay=100)
+        # Explicitly trigger input event for Angular
+        await search_input.dispatch_event('input')
+        # Wait for Angular to filter - wait for table to stabilize
+        await page.wait_for_timeout(1000)
+
+        # Find toggle
+        toggle_checkbox = page.locator(f'input.onoffswitch-checkbox[id="{user_email}"]')
+        checkbox_count = await toggle_checkbox.count()
+        logger.info(f"User {user_email}: found {checkbox_count} checkbox(es) in expected state (active={is_active})")
+
+        # Debug: log all emails currently visible in table
+        if checkbox_count == 0:
+            try:
+                all_emails = await page.locator('table#userListTable td:nth-child(2)').all_text_contents()
+                logger.info(f"Emails visible in table: {all_emails[:10]}")  # First 10
+            except Exception as e:
+                logger.warning(f"Could not get table emails: {e}")
+
+        if checkbox_count == 0:
+            # Try opposite state (stale cache)
+            logger.info(f"User {user_email} not found in expected state, checking opposite...")
+            opposite_active_value = "1: false" if is_active else "0: true"
+            await active_select.select_option(value=opposite_active_value)
+            await page.wait_for_timeout(500)
+
+            await search_input.clear()
+            await page.wait_for_timeout(300)
+            await search_input.click()
+            await page.wait_for_timeout(100)
+            await search_input.press_sequentially(user_email, delay=100)
+            # Explicitly trigger input event for Angular
+            await search_input.dispatch_event('input')
+            await page.wait_for_timeout(1000)
+
+            checkbox_count = await toggle_checkbox.count()
+            logger.info(f"User {user_email}: found {checkbox_count} checkbox(es) in opposite state (active={not is_active})")
+
+            if checkbox_count == 0:
+                result['message'] = f"User not found in either state (tried both active/inactive with user_type={user_type})"
+                logger.error(f"User {user_email} not found in either filter!")
+                return result
+
+            # Found in opposite state - already done
+            result['success'] = True
+            result['new_state'] = not is_active
+            result['message'] = f"Already {'active' if result['new_state'] else 'inactive'} (cache was stale)"
+            logger.info(f"User {user_email} already in desired state, no toggle needed")
+            return result
+
+        # Verify state and toggle
+        actual_is_active = await toggle_checkbox.is_checked()
+        if actual_is_active != is_active:
+            result['message'] = f"State mismatch"
+            return result
+
+        # Click toggle
+        toggle_label = page.locator(f'label.onoffswitch-label[for="{user_email}"]')
+        await toggle_label.click()
+
+        # Wait for the toggle to process
+        await page.wait_for_timeout(1000)
+
+        # Verify by checking if user now appears in the OPPOSITE filter
+        # This confirms the backend save worked, not just UI change
+        opposite_active_value = "1: false" if is_active else "0: true"
+        await active_select.select_option(value=opposite_active_value)
+        await page.wait_for_timeout(200)
+
+        # Clear and re-search
+        await search_input.clear()
+        await search_input.click()
+        await search_input.press_sequentially(user_email, delay=20)
+        await page.wait_for_timeout(400)
+
+        # Check if user appears in the opposite state
+        if await toggle_checkbox.count() > 0:
+            # User found in opposite state - toggle succeeded!
+            result['success'] = True
+            result['toggled'] = True
+            result['new_state'] = not is_active
+            result['message'] = f"User is now {'active' if result['new_state'] else 'inactive'}"
+        else:
+            # User not found in opposite state - toggle failed
+            result['message'] = f"Toggle failed - user did not move to opposite state"
+
+    except Exception as e:
+        result['message'] = f"Error: {str(e)}"
+        logger.exception(f"Error toggling {user_email} in batch")
+
+    return result
+
+
+@asynccontextmanager
+async def user_toggle_session(
+    org_key: str,
+    headless: bool = True,
+    browser: Optional[Browser] = None,
+    storage_state: Optional[Dict[str, Any]] = None
+):
+    """
+    Keep one org's context and user management page open across separate toggles.
+
+    For callers that toggle users one at a time with pauses in between (e.g. the manual
+    test harness); batch_toggle_users_for_org suits changes known up front.
+
+    Args:
+        org_key: Key from ORGS dict (e.g., 'canberra', 'tweed')
+        headless: Run browser in headless mode (ignored when a browser is passed in)
+        browser: Already-launched browser to open this org's context in, instead of launching one
+        storage_state: Already-loaded storage state for the org, instead of reading its file
+
+    Yields:
+        async ``toggle(change)`` taking {user_email, is_active, user_type} and returning the
+        same result dict as batch_toggle_users_for_org. The user list is opened on the
+        first call and reloaded on every later one, so each toggle sees changes made in
+        Buz since the session started.
+    """
+    async with BuzUserManagement(headless=headless, browser=browser) as manager:
+        await manager.switch_to_org(org_key, storage_state=storage_state)
+        page = None
+
+        async def toggle(change: Dict[str, Any]) -> Dict[str, Any]:
+            nonlocal page
+            if page is None:
+                page = await _open_user_list(manager)
+            else:
+                await page.reload(wait_until='domcontentloaded', timeout=30000)
+                await page.wait_for_selector('table#userListTable', timeout=15000)
+            return await _toggle_user_on_page(page, org_key, change)
+
+        yield toggle
+
+
 async def batch_toggle_users_for_org(
     org_key: str,
     user_changes: List[Dict[str, Any]],
-    headless: bool = True
+    headless: bool = True,
+    browser: Optional[Browser] = None,
+    storage_state: Optional[Dict[str, Any]] = None
 ) -> List[Dict[str, Any]]:
     """
     Toggle multiple users' active/inactive status for a single org efficiently.
@@ -579,153 +790,26 @@ async def batch_toggle_users_for_org(
     Args:
         org_key: Key from ORGS dict (e.g., 'canberra', 'tweed')
         user_changes: List of dicts with {user_email, is_active, user_type}
-        headless: Run browser in headless mode
+        headless: Run browser in headless mode (ignored when a browser is passed in)
+        browser: Already-launched browser to open this org's context in, instead of launching one
+        storage_state: Already-loaded storage state for the org, instead of reading its file
 
     Returns:
         List of result dicts for each toggle
     """
     results = []
 
-    async with BuzUserManagement(headless=headless) as manager:
+    async with BuzUserManagement(headless=headless, browser=browser) as manager:
         try:
             # Switch to the org once
-            await manager.switch_to_org(org_key)
+            await manager.switch_to_org(org_key, storage_state=storage_state)
 
             # Navigate to user management page once
-            page = await manager.context.new_page()
-            await page.goto(manager.USER_MANAGEMENT_URL, wait_until='networkidle', timeout=30000)
-            await page.wait_for_selector('table#userListTable', timeout=15000)
-
-            # Get locators once
-            active_select = page.locator('ul.list-inline li:nth-child(2) select')
-            user_type_select = page.locator('ul.list-inline li:nth-child(3) select')
-            search_input = page.locator('input#search-text')
+            page = await _open_user_list(manager)
 
             # Process each user toggle
             for change in user_changes:
-                user_email = change['user_email']
-                is_active = change['is_active']
-                user_type = change['user_type']
-
-                result = {
-                    'org_key': org_key,
-                    'user_email': user_email,
-                    'success': False,
-                    'new_state': None,
-                    'message': ''
-                }
-
-                try:
-                    logger.info(f"Toggling {user_email}: cache says is_active={is_active}, user_type={user_type}")
-
-                    # Set filters for this user
-                    active_value = "0: true" if is_active else "1: false"
-                    await active_select.select_option(value=active_value)
-                    await page.wait_for_timeout(500)
-
-                    user_type_value = "1: 5" if user_type == "customer" else "0: 0"
-                    await user_type_select.select_option(value=user_type_value)
-                    await page.wait_for_timeout(500)
-
-                    # Clear search and type email
-                    await search_input.clear()
-                    await page.wait_for_timeout(300)
-                    await search_input.click()
-                    await page.wait_for_timeout(100)
-                    await search_input.press_sequentially(user_email, delay=100)
-                    # Explicitly trigger input event for Angular
-                    await search_input.dispatch_event('input')
-                    # Wait for Angular to filter - wait for table to stabilize
-                    await page.wait_for_timeout(1000)
-
-                    # Find toggle
-                    toggle_checkbox = page.locator(f'input.onoffswitch-checkbox[id="{user_email}"]')
-                    checkbox_count = await toggle_checkbox.count()
-                    logger.info(f"User {user_email}: found {checkbox_count} checkbox(es) in expected state (active={is_active})")
-
-                    # Debug: log all emails currently visible in table
-                    if checkbox_count == 0:
-                        try:
-                            all_emails = await page.locator('table#userListTable td:nth-child(2)').all_text_contents()
-                            logger.info(f"Emails visible in table: {all_emails[:10]}")  # First 10
-                        except Exception as e:
-                            logger.warning(f"Could not get table emails: {e}")
-
-                    if checkbox_count == 0:
-                        # Try opposite state (stale cache)
-                        logger.info(f"User {user_email} not found in expected state, checking opposite...")
-                        opposite_active_value = "1: false" if is_active else "0: true"
-                        await active_select.select_option(value=opposite_active_value)
-                        await page.wait_for_timeout(500)
-
-                        await search_input.clear()
-                        await page.wait_for_timeout(300)
-                        await search_input.click()
-                        await page.wait_for_timeout(100)
-                        await search_input.press_sequentially(user_email, delay=100)
-                        # Explicitly trigger input event for Angular
-                        await search_input.dispatch_event('input')
-                        await page.wait_for_timeout(1000)
-
-                        checkbox_count = await toggle_checkbox.count()
-                        logger.info(f"User {user_email}: found {checkbox_count} checkbox(es) in opposite state (active={not is_active})")
-
-                        if checkbox_count == 0:
-                            result['message'] = f"User not found in either state (tried both active/inactive with user_type={user_type})"
-                            logger.error(f"User {user_email} not found in either filter!")
-                            results.append(result)
-                            continue
-
-                        # Found in opposite state - already done
-                        result['success'] = True
-                        result['new_state'] = not is_active
-                        result['message'] = f"Already {'active' if result['new_state'] else 'inactive'} (cache was stale)"
-                        logger.info(f"User {user_email} already in desired state, no toggle needed")
-                        results.append(result)
-                        continue
-
-                    # Verify state and toggle
-                    actual_is_active = await toggle_checkbox.is_checked()
-                    if actual_is_active != is_active:
-                        result['message'] = f"State mismatch"
-                        results.append(result)
-                        continue
-
-                    # Click toggle
-                    toggle_label = page.locator(f'label.onoffswitch-label[for="{user_email}"]')
-                    await toggle_label.click()
-
-                    # Wait for the toggle to process
-                    await page.wait_for_timeout(1000)
-
-                    # Verify by checking if user now appears in the OPPOSITE filter
-                    # This confirms the backend save worked, not just UI change
-                    opposite_active_value = "1: false" if is_active else "0: true"
-                    await active_select.select_option(value=opposite_active_value)
-                    await page.wait_for_timeout(200)
-
-                    # Clear and re-search
-                    await search_input.clear()
-                    await search_input.click()
-                    await search_input.press_sequentially(user_email, delay=20)
-                    await page.wait_for_timeout(400)
-
-                    # Check if user appears in the opposite state
-                    if await toggle_checkbox.count() > 0:
-                        # User found in opposite state - toggle succeeded!
-                        result['success'] = True
-                        result['new_state'] = not is_active
-                        result['message'] = f"User is now {'active' if result['new_state'] else 'inactive'}"
-                    else:
-                        # User not found in opposite state - toggle failed
-                        result['message'] = f"Toggle failed - user did not move to opposite state"
-
-                    results.append(result)
-
-                except Exception as e:
-                    result['message'] = f"Error: {str(e)}"
-                    logger.exception(f"Error toggling {user_email} in batch")
-                    results.append(result)
+                results.append(await _toggle_user_on_page(page, org_key, change))
 
             await page.close()
 
@@ -1,4 +1,3 @@
-import re
 from services.database import DatabaseManager
 import logging
 from datetime import datetime
@@ -16,6 +15,10 @@ def safe_float(value):
         return 0.0  # Return 0.0 if conversion fails
 
 
+# str.translate table deleting C0/C1 control characters and the BOM
+_CONTROL_CHARS = dict.fromkeys([*range(0x00, 0x20), *range(0x7F, 0xA0), 0xFEFF])
+
+
 def clean_value(value):
     """
     Clean up the value by handling double quotes, leading equal signs, control characters, and formatting appropriately.
@@ -25,12 +28,9 @@ def clean_value(value):
     :return:
     """
     if isinstance(value, str):
-        # Remove control characters (including BOM)
-        value = re.sub(r'[\x00-\x1F\x7F-\x9F\uFEFF]', '', value)
-        # Remove leading equal sign and any double quotes
-        value = value.lstrip('=')  # Remove leading equal sign
-        value = value.replace('"', '').strip()  # Remove double quotes
-        return value
+        # Drop control characters (including BOM), then the leading equal sign, then
+        # double quotes; quotes go last so '"=x' keeps its '=' as it always has
+        return value.translate(_CONTROL_CHARS).lstrip('=').replace('"', '').strip()
     return value
 
 
@@ -91,25 +91,47 @@ def insert_unleashed_data(
     db_cols_ordered = [db for _, db, _ in mapping]
     required_sheet_cols = [sc for sc, _, req in mapping if req]
 
-    with open(file_path, "r", encoding="utf-8-sig", newline="") as csvfile:
-        reader = csv.DictReader(csvfile)
+    all_db_fields = [
+        "ProductCode",
+        "ProductDescription",
+        "FriendlyDescription1",
+        "FriendlyDescription2",
+        "FriendlyDescription3",
+    ] + db_cols_ordered
+
+    # One statement for every row
+    sql = f"""
+        INSERT INTO unleashed_products (
+            {", ".join(all_db_fields)}
+        ) VALUES (
+            {", ".join(["?"] * len(all_db_fields))}
+        )
+    """
 
-        # Validate required headers only
-        missing_headers = [col for col in required_sheet_cols if col not in reader.fieldnames]
-        if missing_headers:
-            msg = f"Missing required columns in CSV: {missing_headers}"
-            logger.error(msg)
-            raise UploadValidationError(msg)
+    def _row_values(reader, header):
+        # Resolve each needed column to its index once, keyed by the cleaned header name
+        # (asterisks stripped). Repeated headers resolve the way a DictReader row would:
+        # the last occurrence of each raw name, in order of first appearance.
+        raw_index = {}
+        for i, name in enumerate(header):
+            raw_index[name] = i
+        col_index = {name.replace("*", "").strip(): i for name, i in raw_index.items()}
+        code_idx = col_index.get("Product Code")
+        description_idx = col_index.get("Product Description")
+        value_columns = [
+            (col_index.get(sheet_col), is_float_field(db_col)) for sheet_col, db_col, _required in mapping
+        ]
+
+        def cell(row, idx):
+            # Only the columns that are inserted get cleaned; short rows read as missing
+            return clean_value(row[idx]) if idx is not None and idx < len(row) else None
 
         for row in reader:
-            # Clean header names (strip asterisks) + clean values
-            cleaned_row = {
-                key.replace("*", "").strip(): clean_value(value)
-                for key, value in row.items()
-            }
+            if not row:
+                continue  # blank line
 
-            product_description = cleaned_row.get("Product Description", "") or ""
-            product_code = (cleaned_row.get("Product Code", "") or "").strip()
+            product_description = cell(row, description_idx) or ""
+            product_code = (cell(row, code_idx) or "").strip()
 
             fd1, fd2, fd3 = parse_fd_metadata(product_description)
             if overrides and product_code in overrides:
@@ -122,31 +144,30 @@ def insert_unleashed_data(
                 fd1, fd2, fd3,
             ]
 
-            for sheet_col, db_col, _required in mapping:
-                val = cleaned_row.get(sheet_col, None)
+            for idx, is_float in value_columns:
+                val = cell(row, idx)
                 # If optional and missing, keep None to preserve alignment
-                if is_float_field(db_col):
-                    values.append(safe_float(val) if val not in (None, "") else None)
+                if val in (None, ""):
+                    values.append(None)
                 else:
-                    values.append(val if val not in (None, "") else None)
-
-            all_db_fields = [
-                "ProductCode",
-                "ProductDescription",
-                "FriendlyDescription1",
-                "FriendlyDescription2",
-                "FriendlyDescription3",
-            ] + db_cols_ordered
-
-            placeholders = ", ".join(["?"] * len(values))
-            sql = f"""
-                INSERT INTO unleashed_products (
-                    {", ".join(all_db_fields)}
-                ) VALUES (
-                    {placeholders}
-                )
-            """
-            db_manager.execute_query(sql, values)
+                    values.append(safe_float(val) if is_float else val)
+
+            yield tuple(values)
+
+    with open(file_path, "r", encoding="utf-8-sig", newline="", buffering=1 << 20) as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+
+        # Validate required headers only (set lookups, reported in config order)
+        present_headers = frozenset(header)
+        missing_headers = [col for col in required_sheet_cols if col not in present_headers]
+        if missing_headers:
+            msg = f"Missing required columns in CSV: {missing_headers}"
+            logger.error(msg)
+            raise UploadValidationError(msg)
+
+        # Stream parsed rows straight into a single executemany
+        db_manager.executemany(sql, _row_values(reader, header))
 
     # Remove obsoleted rows
     db_manager.execute_query("DELETE FROM unleashed_products WHERE IsObsoleted = 'Yes'")
@@ -318,7 +339,8 @@ def db_delete_items_not_in_unleashed(db_manager: DatabaseManager):
     
 def validate_data(data, required_fields):
     """Ensure all required fields are present and non-empty in the data."""
-    missing_fields = [field for field in required_fields if field not in data or not data[field]]
+    # One lookup per field; a missing key and an empty value are both reported, in declared order
+    missing_fields = [field for field in required_fields if not data.get(field)]
     if missing_fields:
         raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
     return True
@@ -329,6 +351,23 @@ def transform_data(data):
     return {key: value.upper() if isinstance(value, str) else value for key, value in data.items()}
 
 
+def transform_data_batch(df):
+    """
+    DataFrame counterpart of transform_data for many records at once: upper-case every text
+    column with vectorised str.upper, leaving other columns untouched.
+    """
+    import pandas as pd
+
+    # Object columns holding no strings at all (e.g. ints and None) have no .str accessor;
+    # keep only the inferred types pandas allows it on
+    text_cols = [
+        col for col in df.select_dtypes(include=["object", "string"]).columns
+        if pd.api.types.infer_dtype(df[col], skipna=True) in ("string", "mixed", "mixed-integer")
+    ]
+    # .str.upper() turns non-string cells of mixed object columns into NaN; restore those as-is
+    return df.assign(**{col: df[col].str.upper().fillna(df[col]) for col in text_cols})
+
+
 def max_last_edit_date(db_manager: DatabaseManager) -> datetime or None:
     cursor = db_manager.execute_query('SELECT MAX(LastEditDate) FROM inventory_items')
     result = cursor.fetchone()
@@ -434,10 +473,9 @@ def get_groups_for_fabric(db_manager: DatabaseManager, fabric_id: int):
 
 
 def get_all_fabric_group_mappings(db_manager: DatabaseManager):
-    cursor = db_manager.execute_query(
-        query="SELECT * FROM fabric_group_mappings"
+    return db_manager.fetch_tuples(
+        query="SELECT fabric_id, inventory_group_code FROM fabric_group_mappings"
     )
-    return cursor.fetchall()
 
 
 def add_inventory_item(
@@ -1,4 +1,5 @@
 import sqlite3
+from itertools import chain
 from flask import g, current_app
 from flask.cli import with_appcontext
 import click
@@ -70,6 +71,27 @@ class DatabaseManager:
         except Exception as e:
             raise DatabaseError(f"Database query failed: {e}")
 
+    def fetch_tuples(self, query, params=None):
+        """
+        Execute a query and return its rows as plain tuples, bypassing the connection's row factory.
+
+        Useful when the rows go straight into a set or dict, where sqlite3.Row adds nothing.
+
+        :param query: The SQL query to execute.
+        :type query: str
+        :param params: A list or tuple of query parameters, defaults to None.
+        :type params: list | tuple, optional
+        :return: The result rows.
+        :rtype: list[tuple]
+        :raises DatabaseError: If an error occurs during query execution.
+        """
+        try:
+            cursor = self.connection.cursor()
+            cursor.row_factory = None
+            return cursor.execute(query, params or []).fetchall()
+        except Exception as e:
+            raise DatabaseError(f"Database query failed: {e}")
+
     def commit(self):
         """
         Commit the current database transaction.
@@ -93,7 +115,7 @@ class DatabaseManager:
         except Exception as e:
             raise DatabaseError(f"Rollback failed: {e}")
 
-    def insert_item(self, table, data):
+    def insert_item(self, table, data, auto_commit=True):
         """
         Insert a new record into a specified table.
 
@@ -101,12 +123,39 @@ class DatabaseManager:
         :type table: str
         :param data: A dictionary of column-value pairs to insert.
         :type data: dict
+        :param auto_commit: Commit after the insert, defaults to True.
+        :type auto_commit: bool, optional
         :raises DatabaseError: If the insertion fails.
         """
         query = f"INSERT OR IGNORE INTO {table} ({', '.join(data.keys())}) VALUES ({', '.join(['?'] * len(data))})"
         try:
-            self.execute_query(query, tuple(data.values()))
-            self.commit()
+            self.execute_query(query, tuple(data.values()), auto_commit=auto_commit)
+        except DatabaseError as e:
+            raise DatabaseError(f"Insertion failed: {e}")
+
+    def insert_items(self, table, rows):
+        """
+        Insert several records into a specified table with one executemany and a single commit.
+
+        Rows are streamed into executemany, so a generator works without being materialised.
+
+        :param table: The name of the table to insert into.
+        :type table: str
+        :param rows: Dictionaries of column-value pairs; all must have the same keys as the first.
+        :type rows: Iterable[dict]
+        :return: The number of rows affected.
+        :rtype: int
+        :raises DatabaseError: If the insertion fails.
+        """
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return 0
+        columns = tuple(first)
+        query = f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})"
+        params = (tuple(row[c] for c in columns) for row in chain((first,), rows))
+        try:
+            return self.executemany(query, params)
         except DatabaseError as e:
             raise DatabaseError(f"Insertion failed: {e}")
 
@@ -198,12 +247,14 @@ def clear_database(db_manager: DatabaseManager):
 def create_db_manager(db_file: str):
     """
     Creates a DatabaseManager instance with a static SQLite connection.
+    ``db_file`` may also be a SQLite ``file:`` URI (e.g. a shared-cache in-memory database).
     """
     connection = sqlite3.connect(
         db_file,
         timeout=30.0,
         detect_types=sqlite3.PARSE_DECLTYPES,
-        check_same_thread=False
+        check_same_thread=False,
+        uri=db_file.startswith("file:")
     )
     connection.execute("PRAGMA journal_mode=WAL;")
     connection.execute("PRAGMA synchronous=NORMAL;")
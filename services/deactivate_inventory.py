@@ -5,7 +5,6 @@ from io import BytesIO
 from typing import Dict, Optional, Tuple, Union
 
 from openpyxl import load_workbook, Workbook
-from openpyxl.cell.cell import Cell
 from openpyxl.utils import column_index_from_string
 from openpyxl.utils.datetime import from_excel as excel_serial_to_dt
 
@@ -18,9 +17,8 @@ HEADER_ROW = 2
 DATA_START_ROW = HEADER_ROW + 1
 
 
-def _cell_text_lower(cell: Cell) -> str:
-    v = cell.value
-    return "" if v is None else str(v).strip().lower()
+def _text_lower(value) -> str:
+    return "" if value is None else str(value).strip().lower()
 
 
 def _coerce_excel_datetime(value: Union[None, int, float, str, datetime], epoch) -> Optional[datetime]:
@@ -47,18 +45,17 @@ def _coerce_excel_datetime(value: Union[None, int, float, str, datetime], epoch)
     return None
 
 
-def _matches(warn_cell: Cell, last_edit_cell: Cell, *, cutoff_days: int, epoch, now_utc: datetime) -> bool:
-    if "deprecated" not in _cell_text_lower(warn_cell):
+def _matches(warning, last_edit, *, cutoff_days: int, epoch, now_utc: datetime) -> bool:
+    if "deprecated" not in _text_lower(warning):
         return False
-    last_dt = _coerce_excel_datetime(last_edit_cell.value, epoch=epoch)
+    last_dt = _coerce_excel_datetime(last_edit, epoch=epoch)
     if last_dt is None:
         return False
     return (now_utc - last_dt).days > cutoff_days
 
 
-def _copy_row_values(src_ws, dst_ws, src_r: int, dst_r: int) -> None:
-    for c in range(1, src_ws.max_column + 1):
-        dst_ws.cell(row=dst_r, column=c, value=src_ws.cell(src_r, c).value)
+def _value_at(row: tuple, col: int):
+    return row[col - 1] if col <= len(row) else None
 
 
 def generate_deactivation_workbook(
@@ -80,48 +77,51 @@ def generate_deactivation_workbook(
     """
     now_utc = now_utc or datetime.now(timezone.utc)
 
-    # keep_vba=False ensures macros aren’t preserved even for .xlsm inputs
-    wb_in = load_workbook(filename=BytesIO(input_bytes), data_only=True, keep_vba=False)
+    # Input is only scanned, so read it read-only as plain values; keep_vba=False
+    # ensures macros aren't preserved even for .xlsm inputs
+    wb_in = load_workbook(filename=BytesIO(input_bytes), read_only=True, data_only=True, keep_vba=False)
 
-    out = Workbook()
-    tmp = out.active
-    tmp.title = "_tmp"
+    # Output only ever gets whole rows appended, so stream it
+    out = Workbook(write_only=True)
 
     stats: Dict[str, int] = {}
 
-    for src in wb_in.worksheets:
-        if src.max_row < HEADER_ROW:
-            continue
-
-        matched = []
-        for r in range(DATA_START_ROW, src.max_row + 1):
-            if _matches(
-                src.cell(r, WARNING_COL),
-                src.cell(r, LAST_EDIT_COL),
-                cutoff_days=cutoff_days,
-                epoch=wb_in.epoch,
-                now_utc=now_utc,
-            ):
-                matched.append(r)
-
-        if not matched:
-            continue
-
-        dst = out.create_sheet(title=src.title)
-        _copy_row_values(src, dst, 1, 1)
-        _copy_row_values(src, dst, 2, 2)
-
-        out_r = 3
-        for src_r in matched:
-            _copy_row_values(src, dst, src_r, out_r)
-            dst.cell(row=out_r, column=OPERATION_COL, value="D")
-            dst.cell(row=out_r, column=WARNING_COL, value=None)
-            out_r += 1
-
-        stats[src.title] = len(matched)
-
-    if len(out.worksheets) > 1 and out.worksheets[0].title == "_tmp":
-        out.remove(out.worksheets[0])
+    try:
+        for src in wb_in.worksheets:
+            header_rows = []
+            matched = []
+            for r, row in enumerate(src.iter_rows(values_only=True), start=1):
+                if r < DATA_START_ROW:
+                    header_rows.append(row)
+                elif _matches(
+                    _value_at(row, WARNING_COL),
+                    _value_at(row, LAST_EDIT_COL),
+                    cutoff_days=cutoff_days,
+                    epoch=wb_in.epoch,
+                    now_utc=now_utc,
+                ):
+                    matched.append(row)
+
+            if len(header_rows) < HEADER_ROW or not matched:
+                continue
+
+            dst = out.create_sheet(title=src.title)
+            for row in header_rows:
+                dst.append(row)
+
+            for row in matched:
+                row = list(row)
+                row.extend([None] * (OPERATION_COL - len(row)))
+                row[OPERATION_COL - 1] = "D"
+                dst.append(row)
+
+            stats[src.title] = len(matched)
+    finally:
+        wb_in.close()
+
+    if not stats:
+        # A workbook needs at least one sheet to save
+        out.create_sheet(title="_tmp")
 
     buf = BytesIO()
     out.save(buf)
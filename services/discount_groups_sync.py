@@ -268,10 +268,12 @@ class DiscountGroupsSync:
         total_changes = 0
         changes_sample: List[Dict[str, Any]] = []
 
-        # NEW: batch fetch columns A and C for all tabs in 2 requests total
+        # Batch fetch columns A and C for all tabs in a single values:batchGet
         max_rows = 2000
-        colA_by_tab = gs.fetch_many(self.sheet_id, customer_tabs, f"A1:A{max_rows}")  # one values:batchGet
-        colC_by_tab = gs.fetch_many(self.sheet_id, customer_tabs, f"C1:C{max_rows}")  # one values:batchGet
+        col_a_tail, col_c_tail = f"A1:A{max_rows}", f"C1:C{max_rows}"
+        cols_by_tail = gs.fetch_many_tails(self.sheet_id, customer_tabs, [col_a_tail, col_c_tail])
+        colA_by_tab = cols_by_tail[col_a_tail]
+        colC_by_tab = cols_by_tail[col_c_tail]
 
         def _flatten_col(block: list[list[str]]) -> list[str]:
             # values API returns rows like [["hdr"], ["val"], ...] for a single column
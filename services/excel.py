@@ -53,7 +53,7 @@ class OpenPyXLFileHandler:
         return cls(workbook=workbook)
 
     @classmethod
-    def from_sheets_data(cls, sheets_data, sheets_header_data):
+    def from_sheets_data(cls, sheets_data, sheets_header_data, write_only=False):
         """
         Initialize the file handler with sheets data.
 
@@ -62,16 +62,18 @@ class OpenPyXLFileHandler:
             sheets_header_data (dict): Dictionary with:
                 - `headers`: List of column headers (shared by all sheets).
                 - `header_row`: Row index where headers should appear.
+            write_only (bool): Build a write-only workbook that streams rows instead of holding a
+                Cell per value. The result can only be saved, not read back through the handler.
 
         Returns:
             OpenPyXLFileHandler: An initialized file handler.
         """
         handler = cls()
-        handler._create_excel_file(sheets_data, sheets_header_data)
+        handler._create_excel_file(sheets_data, sheets_header_data, write_only=write_only)
         return handler
 
     @classmethod
-    def from_items(cls, items, headers_config, header_row=1):
+    def from_items(cls, items, headers_config, header_row=1, write_only=False):
         """
         Initialize the file handler with items and headers configuration.
 
@@ -79,12 +81,21 @@ class OpenPyXLFileHandler:
             items (list[dict]): Inventory items to process.
             headers_config (list[dict]): Configuration mapping database fields to headers.
             header_row (int): Row where headers are located in the Excel sheet.
+            write_only (bool): Stream rows into a write-only workbook (save-only).
 
         Returns:
             OpenPyXLFileHandler: An initialized file handler.
         """
         sheets_data = cls.transform_items_to_sheets_data(items, headers_config, header_row)
-        return cls.from_sheets_data(sheets_data)
+        sheets_header_data = {
+            "headers": [header["spreadsheet_column"] for header in headers_config],
+            "header_row": header_row,
+        }
+        return cls.from_sheets_data(
+            {sheet_name: rows for sheet_name, (rows, _, _) in sheets_data.items()},
+            sheets_header_data,
+            write_only=write_only,
+        )
 
     @staticmethod
     def transform_items_to_sheets_data(items, headers_config, header_row=1):
@@ -94,8 +105,11 @@ class OpenPyXLFileHandler:
         headers = [header["spreadsheet_column"] for header in headers_config]
         database_fields = [header["database_field"] for header in headers_config]
 
+        if isinstance(items, dict):
+            items = items.values()
+
         grouped_data = {}
-        for item in items.values():
+        for item in items:
             group_code = item["inventory_group_code"]
             if group_code not in grouped_data:
                 grouped_data[group_code] = []
@@ -185,7 +199,7 @@ class OpenPyXLFileHandler:
 
         return all_data
 
-    def _create_excel_file(self, sheets_data, sheets_header_data):
+    def _create_excel_file(self, sheets_data, sheets_header_data, write_only=False):
         """
         Internal method to create a new Excel workbook with multiple sheets.
 
@@ -194,15 +208,28 @@ class OpenPyXLFileHandler:
             sheets_header_data (dict): Contains:
                 - `headers`: List of column headers.
                 - `header_row`: Row index for headers (default is 1).
+            write_only (bool): Stream rows into a write-only workbook.
 
         Modifies:
             self.workbook: Sets this attribute to the newly created workbook.
         """
-        self.workbook = openpyxl.Workbook()
-
         headers = sheets_header_data["headers"]
         header_row = sheets_header_data.get("header_row", 1)
 
+        if write_only:
+            self.workbook = openpyxl.Workbook(write_only=True)
+            for sheet_name, rows in sheets_data.items():
+                sheet = self.workbook.create_sheet(title=sheet_name)
+                # Write-only sheets only append, so pad down to the header row
+                for _ in range(header_row - 1):
+                    sheet.append([])
+                sheet.append(list(headers))
+                for row in rows:
+                    sheet.append(list(row))
+            return
+
+        self.workbook = openpyxl.Workbook()
+
         for idx, (sheet_name, rows) in enumerate(sheets_data.items(), start=1):
             # Add a new sheet or use the default active sheet
             if idx == 1:
@@ -356,12 +383,11 @@ class OpenPyXLFileHandler:
         ul_sheet.cell(row=1, column=1, value="ProductCode")
         ul_sheet.cell(row=1, column=2, value="ProductDescription")
 
-        for i, row in enumerate(ul_data, start=2):
-            ul_sheet.cell(row=i, column=1, value=row["ProductCode"])
-            ul_sheet.cell(row=i, column=2, value=row["ProductDescription"])
+        for code, description in ul_data:
+            ul_sheet.append((code, description))
 
-        # Create set of valid ProductCodes
-        valid_codes = {str(row["ProductCode"]).strip().upper() for row in ul_data}
+        # Normalise the valid ProductCodes once; every AB cell below is checked against them
+        valid_codes = frozenset(str(code).strip().upper() for code, _ in ul_data)
 
         # Step 2 & 3: Process remaining sheets
         for sheet in self.workbook.worksheets:
@@ -17,17 +17,15 @@ def get_fabric_grid_data(db_manager: DatabaseManager):
 
     # Get all inventory groups
     inventory_groups = get_inventory_groups(db_manager=db_manager)
-    print("Inventory Groups:", inventory_groups)
-    for group in inventory_groups:
-        print("Available keys in group:", group.keys())  # This shows the actual column names
 
     # Get all mappings
     mappings = get_all_fabric_group_mappings(db_manager=db_manager)
 
-    # Convert data to dictionaries for easy processing
-    fabric_list = {fabric["id"]: fabric for fabric in fabrics}
-    group_list = {group["group_code"]: group["group_description"] for group in inventory_groups}
-    mapping_set = {(mapping["fabric_id"], mapping["inventory_group_code"]) for mapping in mappings}
+    # Convert data to dictionaries for easy processing; groups are two-column rows
+    # and mappings come back as plain tuples, so both load straight into dict/set
+    fabric_list = {fabric["id"]: dict(fabric) for fabric in fabrics}
+    group_list = dict(inventory_groups)
+    mapping_set = set(mappings)
 
     return fabric_list, group_list, mapping_set
 
@@ -70,23 +68,29 @@ def prepare_fabric_grid_data(fabric_list, group_list, mapping_set):
         for group_code, group_name in group_list.items()
     }
 
+    # Index mappings by fabric once rather than probing every (fabric, group) pair
+    mapped_groups = {}
+    for fabric_id, group_code in mapping_set:
+        if group_code in group_list:
+            mapped_groups.setdefault(fabric_id, []).append(group_code)
+
     grid = []
     for fabric_id, fabric in fabric_list.items():
-        # Concatenate descriptions
-        concatenated_description = " ".join(
-            filter(None, [fabric["description_1"], fabric["description_2"], fabric["description_3"]])
-        )
+        description_1 = fabric["description_1"]
+        description_2 = fabric["description_2"]
+        description_3 = fabric["description_3"]
+        groups = dict.fromkeys(group_list, False)
+        for group_code in mapped_groups.get(fabric_id, ()):
+            groups[group_code] = True
         grid.append({
             "fabric_id": fabric_id,
-            "fabric_description": concatenated_description,
-            "description_1": fabric["description_1"],
-            "description_2": fabric["description_2"],
-            "description_3": fabric["description_3"],
+            # Concatenate descriptions
+            "fabric_description": " ".join(filter(None, (description_1, description_2, description_3))),
+            "description_1": description_1,
+            "description_2": description_2,
+            "description_3": description_3,
             "fabric_code": fabric["supplier_product_code"],
-            "groups": {
-                group_code: (fabric_id, group_code) in mapping_set
-                for group_code in group_list.keys()
-            }
+            "groups": groups,
         })
 
     return {"grid": grid, "groups": groups_with_abbrev}
@@ -298,15 +302,20 @@ def process_data(fabrics, inventory_items, inventory_groups):
 
     fabric_groups = set(normalize(fabric["inventory_group_code"]) for fabric in fabrics)
 
-    # Convert inventory_items to a dictionary for quick lookup by group and description
-    inventory_dict = {
-        (normalize(item["inventory_group_code"]),
-         normalize(item["DescnPart1"]),
-         normalize(item["DescnPart2"]),
-         normalize(item["DescnPart3"])): item
-        for item in inventory_items
-        if normalize(item["inventory_group_code"]) in fabric_groups
-    }
+    # Convert inventory_items to a dictionary for quick lookup by group and description,
+    # and remember the first item of each group as the template for additions to it
+    inventory_dict = {}
+    template_by_group = {}
+    for item in inventory_items:
+        group_key = normalize(item["inventory_group_code"])
+        template_by_group.setdefault(group_key, item)
+        if group_key in fabric_groups:
+            inventory_dict[(
+                group_key,
+                normalize(item["DescnPart1"]),
+                normalize(item["DescnPart2"]),
+                normalize(item["DescnPart3"]),
+            )] = item
 
     # Identify additions and deletions
     for fabric in fabrics:
@@ -321,9 +330,8 @@ def process_data(fabrics, inventory_items, inventory_groups):
             group = fabric["inventory_group_code"]
             group_description = inventory_groups.get(group, "Unknown")  # Fallback to "Unknown" if group is missing
             # Use an existing item in the same group as a template
-            template_item = next(
-                (dict(item) for item in inventory_items if normalize(item["inventory_group_code"]) == group), {}
-            )
+            template = template_by_group.get(group)
+            template_item = dict(template) if template is not None else {}
             # Create a new record based on the template
             addition = template_item.copy() if template_item else {}
             addition.update({
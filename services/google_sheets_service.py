@@ -3,6 +3,7 @@ import logging
 import time
 import os
 import re
+import threading
 import gspread
 from gspread.exceptions import APIError
 from google.oauth2.service_account import Credentials
@@ -17,6 +18,13 @@ class GoogleSheetsService:
     Automatically uses the service account JSON from the app's main folder (NOT inside /app).
     """
 
+    # Range values are shared by every instance in the process: routes build a fresh
+    # service per request, so a per-instance cache never survived to the next call.
+    # Request and background job threads share it, so every access holds _cache_lock.
+    _cache: dict[tuple[str, str], tuple[float, list[list[str]]]] = {}
+    _cache_lock = threading.Lock()
+    _cache_ttl = 15  # seconds
+
     @staticmethod
     def _get_service_account_path():
         env = os.environ.get("GSHEETS_CREDENTIALS") or os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
@@ -66,9 +74,6 @@ class GoogleSheetsService:
         creds = self._authenticate_google_sheets(json_file)
         self._client = gspread.authorize(creds)
 
-        # in __init__
-        self._cache: dict[tuple[str, str, str | None], tuple[float, list[list[str]]]] = {}
-        self._cache_ttl = 15  # seconds
         self._ss_cache: dict[str, tuple[float, gspread.Spreadsheet]] = {}
         self._ws_cache: dict[tuple[str, str], tuple[float, gspread.Worksheet]] = {}
         self._ss_ttl = 60  # seconds
@@ -92,22 +97,54 @@ class GoogleSheetsService:
         self._ws_cache[key] = (now, ws)
         return ws
 
+    @classmethod
+    def cache_clear(cls) -> None:
+        """Drop every cached range so the next read goes back to Sheets."""
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    @staticmethod
+    def _range_tab(a1: str) -> str | None:
+        """Tab name of an A1 range ("'My Tab'!A1:B2" -> "My Tab"), or None if it has none."""
+        if "!" not in a1:
+            return None
+        tab = a1.rsplit("!", 1)[0]
+        if len(tab) >= 2 and tab[0] == tab[-1] == "'":
+            tab = tab[1:-1].replace("''", "'")
+        return tab
+
+    @classmethod
+    def _invalidate(cls, spreadsheet_id: str, sheet_name: str) -> None:
+        """Drop cached ranges that a write to this tab may have changed (tab-less ranges included)."""
+        with cls._cache_lock:
+            for key in list(cls._cache):
+                sid, a1 = key
+                if sid == spreadsheet_id and cls._range_tab(a1) in (sheet_name, None):
+                    del cls._cache[key]
+
     def batch_get_cached(self, spreadsheet_id: str, ranges: list[str]):
         now = time.time()
         hits, misses = {}, []
-        for r in ranges:
-            k = (spreadsheet_id, r)
-            if k in self._cache and now - self._cache[k][0] < self._cache_ttl:
-                hits[r] = self._cache[k][1]
-            else:
-                misses.append(r)
+        with self._cache_lock:
+            for r in ranges:
+                hit = self._cache.get((spreadsheet_id, r))
+                if hit and now - hit[0] < self._cache_ttl:
+                    hits[r] = hit[1]
+                else:
+                    misses.append(r)
         if misses:
+            # Fetch outside the lock so a slow API call doesn't block other threads' reads
             fetched = self.batch_get(spreadsheet_id, misses)
-            for r, vals in zip(misses, fetched, strict=False):
-                k = (spreadsheet_id, r)
-                self._cache[k] = (now, vals)
-                hits[r] = vals
-        return [hits[r] for r in ranges]
+            with self._cache_lock:
+                # Expired entries are never read again (row_values alone keys one per row),
+                # so purge them here rather than letting the dict grow for the process's life
+                for k in [k for k, (ts, _) in self._cache.items() if now - ts >= self._cache_ttl]:
+                    del self._cache[k]
+                for r, vals in zip(misses, fetched, strict=False):
+                    self._cache[spreadsheet_id, r] = (now, vals)
+                    hits[r] = vals
+        # Copy the rows so callers can't mutate the shared cache entries
+        return [[list(row) for row in hits[r] or []] for r in ranges]
 
     def fetch_sheet_data(self, spreadsheet_id: str, range_name: str) -> list[list[str]]:
         """Return only the requested A1 range (e.g. 'Sheet1!A:B' or 'Sheet1!A1:D10')."""
@@ -118,12 +155,20 @@ class GoogleSheetsService:
                 return self._with_backoff(lambda: ws.get_all_values())
 
             # Proper A1 range → use batch values API (faster, cheaper).
-            vals = self.batch_get_cached(spreadsheet_id, [range_name])[0]
-            return vals or []
+            return self.batch_get_cached(spreadsheet_id, [range_name])[0]
         except Exception as e:
             logger.error(f"Error fetching data from {spreadsheet_id} range '{range_name}': {e}")
             return []
 
+    def fetch_sheets_batch(self, spreadsheet_id: str, ranges: list[str]) -> dict[str, list[list[str]]]:
+        """Fetch several A1 ranges in a single values.batchGet call, keyed by the requested range."""
+        try:
+            blocks = self.batch_get_cached(spreadsheet_id, ranges)
+            return {r: (block or []) for r, block in zip(ranges, blocks, strict=False)}
+        except Exception as e:
+            logger.error(f"Error fetching data from {spreadsheet_id} ranges {ranges}: {e}")
+            return {r: [] for r in ranges}
+
     def insert_row(self, spreadsheet_id: str, row_data: list[str], worksheet_name: str = 'Sheet1'):
         """
         Insert a row into a specific worksheet.
@@ -131,6 +176,7 @@ class GoogleSheetsService:
         try:
             worksheet = self._worksheet(spreadsheet_id, worksheet_name)
             worksheet.append_row(row_data)
+            self._invalidate(spreadsheet_id, worksheet_name)
         except Exception as e:
             logger.error(f"Error inserting row into spreadsheet {spreadsheet_id}: {e}")
 
@@ -213,6 +259,7 @@ class GoogleSheetsService:
         ]
         # USER_ENTERED so TRUE/FALSE tick existing checkboxes
         sh.values_batch_update(body={"valueInputOption": "USER_ENTERED", "data": data})
+        self._invalidate(spreadsheet_id, sheet_name)
         return len(rows)
 
     @staticmethod
@@ -320,9 +367,22 @@ class GoogleSheetsService:
         a1_tail: str = "A1:B20",
     ) -> dict[str, list[list[str]]]:
         """Fetch the same A1 tail from many tabs in one API call."""
-        ranges = [f"'{name}'!{a1_tail}" for name in sheet_names]
+        return self.fetch_many_tails(spreadsheet_id, sheet_names, [a1_tail])[a1_tail]
+
+    def fetch_many_tails(
+        self,
+        spreadsheet_id: str,
+        sheet_names: list[str],
+        a1_tails: list[str],
+    ) -> dict[str, dict[str, list[list[str]]]]:
+        """Fetch several A1 tails from many tabs in one API call, keyed by tail then tab name."""
+        pairs = [(tail, name) for tail in a1_tails for name in sheet_names]
+        ranges = [f"'{name}'!{tail}" for tail, name in pairs]
         blocks = self.batch_get_cached(spreadsheet_id, ranges)
-        return {name: (block or []) for name, block in zip(sheet_names, blocks, strict=False)}
+        out: dict[str, dict[str, list[list[str]]]] = {tail: {} for tail in a1_tails}
+        for (tail, name), block in zip(pairs, blocks, strict=False):
+            out[tail][name] = block or []
+        return out
 
 
 def filter_google_sheet_second_column_numeric(
@@ -57,32 +57,37 @@ def extract_codes_from_excel_flat_dedup(file_handler: OpenPyXLFileHandler) -> Li
     for sheet_name in file_handler.workbook.sheetnames:
         sheet = file_handler.workbook[sheet_name]
 
-        # Ignore sheet if text "Inventory Code for Pricing" is not found in A2
-        if sheet["A2"].value != "Inventory Code for Pricing":
-            continue
-
-        # Extract codes from row 2
-        for col in sheet.iter_cols(min_row=2, max_row=2, min_col=2):
-            cell_value = col[0].value
-            if cell_value:
-                results.add((sheet_name, cell_value.strip()))
-
-        # Extract codes from row 17 onwards
-        for row in sheet.iter_rows(min_row=17, min_col=2):
-            for cell in row:
-                cell_value = cell.value
-                if isinstance(cell_value, str) and cell_value.strip():
-                    # Check the rule for row 6
-                    col_letter = cell.column_letter
-                    row_6_value = sheet[f"{col_letter}6"].value if sheet.max_row >= 6 else None
-                    parts = cell_value.split("|")
-
-                    if row_6_value:  # If there's a value in row 6
-                        if len(parts) > 2:
-                            results.add((sheet_name, parts[2].strip()))
-                    else:  # If there's no value in row 6
-                        if len(parts) > 1:
-                            results.add((sheet_name, parts[1].strip()))
+        # One forward pass over plain values: works on read-only sheets and
+        # avoids a random-access lookup of row 6 for every cell from row 17 on
+        row_6 = ()
+        for row_idx, row in enumerate(sheet.iter_rows(min_row=1, values_only=True), start=1):
+            if row_idx == 2:
+                # Ignore sheet if text "Inventory Code for Pricing" is not found in A2
+                if not row or row[0] != "Inventory Code for Pricing":
+                    break
+
+                # Extract codes from row 2
+                for cell_value in row[1:]:
+                    if cell_value:
+                        results.add((sheet_name, cell_value.strip()))
+
+            elif row_idx == 6:
+                row_6 = row
+
+            elif row_idx >= 17:
+                # Extract codes from row 17 onwards
+                for col_idx, cell_value in enumerate(row[1:], start=1):
+                    if isinstance(cell_value, str) and cell_value.strip():
+                        # Check the rule for row 6
+                        row_6_value = row_6[col_idx] if col_idx < len(row_6) else None
+                        parts = cell_value.split("|")
+
+                        if row_6_value:  # If there's a value in row 6
+                            if len(parts) > 2:
+                                results.add((sheet_name, parts[2].strip()))
+                        else:  # If there's no value in row 6
+                            if len(parts) > 1:
+                                results.add((sheet_name, parts[1].strip()))
 
     # Convert set back to list for a consistent output format
     return sorted(results)
@@ -1,6 +1,9 @@
 import json
 from flask import g
 
+# Job results (e.g. every org's user list) can be large; drop the spaces json.dumps adds after separators
+_COMPACT = (",", ":")
+
 
 def create_job(job_id, db=None):
     if db is None:
@@ -44,12 +47,12 @@ def update_job(job_id, pct=None, message=None, error=None, result=None, done=Fal
         status = "running"
 
     # Serialize result if provided
-    result_json = json.dumps(result) if result is not None else None
+    result_json = json.dumps(result, separators=_COMPACT) if result is not None else None
 
     # Update database
     db.execute_query(
         "UPDATE jobs SET pct=?, log=?, error=?, result=?, status=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
-        (pct or 0, json.dumps(logs), error, result_json, status, job_id),
+        (pct or 0, json.dumps(logs, separators=_COMPACT), error, result_json, status, job_id),
     )
     db.commit()
 
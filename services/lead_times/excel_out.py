@@ -15,6 +15,11 @@ import re
 
 _LEAD_HEADER_RE = re.compile(r'(?i)\blead\s*time\s*:\s*')
 _READY_IN_RE = re.compile(r'(?i)\bready\s*in\b')
+# End-of-line markers (literal '\n' or real newlines) as one alternation, so a
+# single scan finds whichever comes first.
+_EOL_RE = re.compile(r'\\n|[\r\n]')
+# Summary lead value stops at an EOL marker or the first top-level '(' / ','.
+_SUMMARY_DELIM_RE = re.compile(r'(?P<eol_lit>\\n)|(?P<eol>[\r\n])|(?P<paren>\()|(?P<comma>,)')
 
 
 def _review(review_set: set[str], warnings: list[str], store: str, code: str, reason: str) -> None:
@@ -182,11 +187,8 @@ class InjectResult:
 
 def _find_eol_index(s: str, start: int) -> int:
     """First EOL marker at/after start; supports literal '\\n' or real newlines; -1 if none."""
-    i_lit = s.find("\\n", start)
-    i_n = s.find("\n", start)
-    i_r = s.find("\r", start)
-    candidates = [i for i in (i_lit, i_n, i_r) if i != -1]
-    return min(candidates) if candidates else -1
+    m = _EOL_RE.search(s, start)
+    return m.start() if m else -1
 
 
 def rewrite_detailed_preserving_context(cell_text: str, new_lead: str) -> str:
@@ -258,28 +260,13 @@ def rewrite_summary_preserving_context(cell_text: str, new_lead: str) -> str:
     lead_start = j
 
     # Scan to the first top-level delimiter
-    k = lead_start
-    delim_idx = n
-    delim_kind = "end"
-    while k < n:
-        if k + 1 < n and s[k] == "\\" and s[k + 1] == "n":
-            delim_idx = k
-            delim_kind = "eol_lit"
-            break
-        ch = s[k]
-        if ch in ("\n", "\r"):
-            delim_idx = k
-            delim_kind = "eol"
-            break
-        if ch == "(":
-            delim_idx = k
-            delim_kind = "paren"
-            break
-        if ch == ",":
-            delim_idx = k
-            delim_kind = "comma"
-            break
-        k += 1
+    d = _SUMMARY_DELIM_RE.search(s, lead_start)
+    if d:
+        delim_idx = d.start()
+        delim_kind = d.lastgroup
+    else:
+        delim_idx = n
+        delim_kind = "end"
 
     # Preserve any whitespace immediately before the delimiter
     p = delim_idx - 1
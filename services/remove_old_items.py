@@ -44,7 +44,9 @@ def remove_old_items(db_manager: DatabaseManager, app_config, output_file: str):
 
     headers_config = get_headers_config(app_config, "buz_inventory_item_file")
     logger.debug(f"Headers config is {headers_config}")
-    file_manager = OpenPyXLFileHandler.from_items(items=items, headers_config=headers_config, header_row=2)
+    file_manager = OpenPyXLFileHandler.from_items(
+        items=items, headers_config=headers_config, header_row=2, write_only=True
+    )
     logger.debug(f"File Manager is {file_manager}")
 
     file_manager.save_workbook(os.path.join(app_config['upload_folder'], output_file))
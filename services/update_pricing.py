@@ -218,7 +218,10 @@ def generate_pricing_upload_from_unleashed(db_manager, sheets_service, pricing_c
             {
                 "headers": updated_headers,
                 "header_row": 1
-            }
+            },
+            # Write-only workbooks have no default sheet, so an empty result
+            # would save nothing; keep a regular workbook in that case.
+            write_only=bool(updates_by_group)
         ),
         "log": log_messages
     }
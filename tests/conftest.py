@@ -6,11 +6,27 @@ from app import create_app
 from services.helper import generate_unique_id
 
 
+# Named shared-cache in-memory database: every connection the app opens sees the same tables.
+# In-memory databases are private to their process, so each xdist worker gets its own.
+TEST_DATABASE_URI = "file:buz_app_tests?mode=memory&cache=shared"
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Session-wide Flask app on an in-memory database; built once since tests only read its config."""
+    # Keep one connection open for the session so the in-memory database (and its schema) lives on
+    keeper = create_db_manager(TEST_DATABASE_URI)
+    init_db(db_manager=keeper)
+    app = create_app('Testing', {"database": TEST_DATABASE_URI})
+    app.config["USERS"] = {"testuser": "testpassword"}  # matches auth_headers
+    yield app
+    app.extensions["db_manager"].close()
+    keeper.close()
+
+
 @pytest.fixture
-def app_context(app_config):
-    """Fixture for Flask app context."""
-    app = create_app('Testing')
-    app.config.update(app_config)
+def app_context(app):
+    """Fixture for Flask app context (a fresh context per test on the shared app)."""
     with app.app_context():
         yield app
 
@@ -27,19 +43,69 @@ def app_config(config_manager):
     return config_manager.config
 
 
+@pytest.fixture(scope="session")
+def schema_db():
+    """Session-wide in-memory database with the schema created once; copied, never used directly."""
+    db_manager = create_db_manager(":memory:")
+    init_db(db_manager=db_manager)
+    yield db_manager
+    db_manager.close()
+
+
+def _fresh_db(schema_db):
+    """New in-memory database cloned from the session schema via the SQLite backup API (no DDL)."""
+    db_manager = create_db_manager(":memory:")
+    schema_db.connection.backup(db_manager.connection)
+    # Throwaway test data: skip syncs and keep temp b-trees in RAM
+    db_manager.connection.execute("PRAGMA synchronous=OFF;")
+    db_manager.connection.execute("PRAGMA temp_store=MEMORY;")
+    return db_manager
+
+
 @pytest.fixture
-def get_db_manager(app_config):
+def get_db_manager(app_config, schema_db):
     """Fixture for database manager with per-test isolation."""
-    db_manager = create_db_manager(":memory:")  # Use an in-memory database for isolation
-    init_db(db_manager=db_manager)
+    db_manager = _fresh_db(schema_db)  # Use an in-memory database for isolation
     yield db_manager
     db_manager.close()  # Ensure database connection is closed after the test
 
 
-@pytest.fixture
-def client(app_context):
-    """Fixture for Flask test client."""
-    return app_context.test_client()
+@pytest.fixture(scope="module")
+def shared_db(schema_db):
+    """
+    Module-scoped in-memory database with inventory_items and pricing_data seeded once.
+
+    Tests that mutate it should wrap their changes in a SAVEPOINT and roll back.
+    """
+    db_manager = _fresh_db(schema_db)
+    db_manager.executemany("""
+        INSERT INTO inventory_items (
+            Code, SupplierProductCode, DescnPart1, DescnPart2, DescnPart3,
+            Description, Active, Warning, PriceGridCode, CostGridCode,
+            DiscountGroupCode, inventory_group_code, PkId
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [
+        ("ROLL10000", "UNL001", "Brand1", "Fabric1", "Red",
+         "Roller Blind Brand1 Fabric1 Red", "TRUE", "", "", "", "RB", "ROLL", "pk1"),
+        ("WSROLL10000", "UNL002", "Brand2", "Fabric2", "Blue",
+         "WS Roller Blind Brand2 Fabric2 Blue", "TRUE", "", "WSRB", "WSRB_C", "WSRB", "WSROLL", "pk2"),
+    ])
+    db_manager.executemany("""
+        INSERT INTO pricing_data (
+            InventoryCode, SellLMWide, CostLMWide, DateFrom
+        ) VALUES (?, ?, ?, ?)
+    """, [
+        ("ROLL10000", 45.50, 30.00, "01/01/2024"),
+        ("ROLL10000", 50.00, 35.00, "01/06/2024"),
+    ])
+    yield db_manager
+    db_manager.close()
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Session-wide Flask test client; each request still gets its own DB connection via the app."""
+    return app.test_client()
 
 
 @pytest.fixture
@@ -87,9 +153,9 @@ def add_row_to_sheet(
     ])
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_buz_inventory_items_warning():
-    """Fixture for mock Buz inventory items Excel file."""
+    """Fixture for mock Buz inventory items Excel file (built once per session; treat as read-only)."""
     sheet_data = {}
     add_row_to_sheet(
         sheet_data=sheet_data,
@@ -114,9 +180,9 @@ def mock_buz_inventory_items_warning():
     return sheet_data, sheets_header_data
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_buz_inventory_items():
-    """Fixture for mock Buz inventory items Excel file."""
+    """Fixture for mock Buz inventory items Excel file (built once per session; treat as read-only)."""
     sheet_data = {}
     add_row_to_sheet(
         sheet_data=sheet_data,
@@ -155,16 +221,34 @@ def mock_buz_inventory_items():
     return sheet_data, sheets_header_data
 
 
+@pytest.fixture(scope="session")
+def inventory_items_sheets_data_invalid():
+    """Fixture for Buz inventory items whose header row lacks 'Operation' (built once per session)."""
+    sheet_data = {}
+    add_row_to_sheet(
+        sheet_data=sheet_data,
+        sheet_name="Sheet1",
+        description="Item A",
+        supplier_product_code="SC-A",
+    )
+
+    sheets_header_data = {
+        "headers": ["PkId", "Code", "Description", "Supplier Product Code"],
+        "header_row": 2
+    }
+    return sheet_data, sheets_header_data
+
+
 @pytest.fixture
 def unleashed_expected_headers(app_config):
     """Fixture for expected headers in the Unleashed CSV file."""
     return app_config["headers"]["unleashed_csv_file"]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_supplier_product_codes():
     """Fixture for supplier codes."""
-    return ["SC-A", "SC-C"]
+    return ("SC-A", "SC-C")
 
 
 @pytest.fixture
@@ -0,0 +1,50 @@
+"""Cheap call-recording fakes for tests that only need to check what was called.
+
+``MagicMock`` synthesizes attributes on access and tracks every call through
+descriptor machinery; for a fake connection whose surface is a handful of
+methods, a plain callable that appends to a list does the same job.
+"""
+
+
+class Recorder:
+    """A callable that records ``(args, kwargs)`` for each call and returns ``return_value``."""
+
+    def __init__(self, return_value=None):
+        self.calls = []
+        self.return_value = return_value
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return self.return_value
+
+    @property
+    def call_count(self):
+        return len(self.calls)
+
+
+def attr_recorder(*names, **return_values):
+    """
+    Build an object whose attributes ``names`` are Recorders.
+
+    :param names: Attribute names to expose as Recorders returning None.
+    :param return_values: Attribute names mapped to the value their Recorder returns.
+    :return: An object with one Recorder per attribute.
+    """
+    obj = type("AttrRecorder", (), {})()
+    for name in names:
+        setattr(obj, name, Recorder())
+    for name, value in return_values.items():
+        setattr(obj, name, Recorder(value))
+    return obj
+
+
+def fake_connection(rows=None, rowcount=0):
+    """
+    A DB-API-shaped fake exposing ``cursor``, ``commit``, ``rollback`` and ``close``.
+
+    ``cursor()`` always returns the same recording cursor, whose ``fetchall``
+    returns ``rows`` and whose ``rowcount`` is ``rowcount``.
+    """
+    cursor = attr_recorder("execute", "executemany", fetchall=list(rows or []))
+    cursor.rowcount = rowcount
+    return attr_recorder("commit", "rollback", "close", cursor=cursor)
@@ -10,6 +10,9 @@ from services.excel_safety import save_workbook_gracefully
 
 # --- lightweight helpers ------------------------------------------------
 
+_DETAILED_DEFAULT = "\n       -       Lead Time:  4 - 5 Weeks \n       -       Location:  Canberra"
+
+
 def _new_book_with_sheet(path: Path, name: str, *, detailed_b=None, summary_c=None, header_row=2):
     """
     Make a tiny workbook with one sheet named `name`.
@@ -85,7 +88,7 @@ def test_run_publish_applies_banner_and_updates_values(tmp_path: Path):
     summary_tmpl  = tmp_path / "tmpl_summary.xlsx"
     _new_book_with_sheet(
         detailed_tmpl, "ABC",
-        detailed_b="\n       -       Lead Time:  4 - 5 Weeks \n       -       Location:  Canberra"
+        detailed_b=_DETAILED_DEFAULT
     )
     _new_book_with_sheet(
         summary_tmpl, "ABC",
@@ -2,9 +2,11 @@
 Unit tests for Blinds & Awnings Fabric Sync service.
 """
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import Mock
 from decimal import Decimal
 import pandas as pd
+from openpyxl import load_workbook
 
 from services.blinds_awnings_sync import (
     _norm,
@@ -14,101 +16,126 @@ from services.blinds_awnings_sync import (
     _normalize_colour_for_desc,
     _build_description,
     _next_code_for_group,
+    _alloc_codes_for_group,
     _check_material_restriction,
     load_groups_config_from_sheet,
     load_fabric_data_from_sheets,
     load_existing_buz_inventory,
     load_existing_buz_pricing,
     compute_changes,
+    changes_to_columnar,
+    changes_from_columnar,
+    columnar_row_count,
+    generate_workbooks_in_memory,
 )
 
 
+# Column layouts for the single-row frames used in the compute_changes tests
+_FAB_COLS = ("_key", "FD1", "FD2", "FD3", "Unleashed Code", "Price")
+_FAB_DTYPES = {c: "string" for c in _FAB_COLS}
+_INV_COLS = (
+    "_key", "Code", "SupplierProductCode", "DescnPart1", "DescnPart2", "DescnPart3",
+    "Active", "Warning", "PkId", "PriceGridCode", "CostGridCode", "DiscountGroupCode",
+)
+_INV_DTYPES = {c: "string" for c in _INV_COLS}
+
+
 class TestUtilityFunctions:
     """Test utility helper functions."""
 
-    def test_norm(self):
+    @pytest.mark.parametrize("inp,expected", [
+        ("  hello  ", "hello"),
+        (None, ""),
+        ("", ""),
+        (123, "123"),
+    ])
+    def test_norm(self, inp, expected):
         """Test string normalization."""
-        assert _norm("  hello  ") == "hello"
-        assert _norm(None) == ""
-        assert _norm("") == ""
-        assert _norm(123) == "123"
+        assert _norm(inp) == expected
 
-    def test_build_desc_key(self):
+    @pytest.mark.parametrize("parts", [
+        ("Brand", "Fabric", "Colour"),
+        ("BRAND", "FABRIC", "COLOUR"),  # Case insensitive
+    ])
+    def test_build_desc_key(self, parts):
         """Test description key building."""
-        key = _build_desc_key("Brand", "Fabric", "Colour")
-        assert key == "brand||fabric||colour"
-
-        # Case insensitive
-        key2 = _build_desc_key("BRAND", "FABRIC", "COLOUR")
-        assert key2 == key
-
-    def test_q2_conversion(self):
+        assert _build_desc_key(*parts) == "brand||fabric||colour"
+
+    @pytest.mark.parametrize("inp,expected", [
+        ("10.5", Decimal("10.50")),
+        ("10", Decimal("10.00")),
+        ("", Decimal("0.00")),
+        (None, Decimal("0.00")),
+        ("invalid", Decimal("0.00")),
+    ])
+    def test_q2_conversion(self, inp, expected):
         """Test decimal conversion with 2dp."""
-        assert _q2("10.5") == Decimal("10.50")
-        assert _q2("10") == Decimal("10.00")
-        assert _q2("") == Decimal("0.00")
-        assert _q2(None) == Decimal("0.00")
-        assert _q2("invalid") == Decimal("0.00")
-
-    def test_is_wholesale_group(self):
+        assert _q2(inp) == expected
+
+    @pytest.mark.parametrize("group_code,expected", [
+        ("WSROLL", True),
+        ("WSZIPS", True),
+        ("ROLL", False),
+        ("AWNGV2", False),
+    ])
+    def test_is_wholesale_group(self, group_code, expected):
         """Test wholesale group detection."""
-        assert _is_wholesale_group("WSROLL") is True
-        assert _is_wholesale_group("WSZIPS") is True
-        assert _is_wholesale_group("ROLL") is False
-        assert _is_wholesale_group("AWNGV2") is False
-
-    def test_normalize_colour_for_desc(self):
+        assert _is_wholesale_group(group_code) is expected
+
+    @pytest.mark.parametrize("colour,expected", [
+        ("To Be Confirmed", "Colour To Be Confirmed"),
+        ("to be confirmed", "Colour To Be Confirmed"),
+        ("Red", "Red"),
+        ("", ""),
+    ])
+    def test_normalize_colour_for_desc(self, colour, expected):
         """Test colour normalization for descriptions."""
-        assert _normalize_colour_for_desc("To Be Confirmed") == "Colour To Be Confirmed"
-        assert _normalize_colour_for_desc("to be confirmed") == "Colour To Be Confirmed"
-        assert _normalize_colour_for_desc("Red") == "Red"
-        assert _normalize_colour_for_desc("") == ""
-
-    def test_build_description(self):
-        """Test full description building."""
-        desc = _build_description("Roller Blind", "Brand", "Fabric", "Red")
-        assert desc == "Roller Blind Brand Fabric Red"
+        assert _normalize_colour_for_desc(colour) == expected
 
+    @pytest.mark.parametrize("parts,expected", [
+        (("Roller Blind", "Brand", "Fabric", "Red"), "Roller Blind Brand Fabric Red"),
         # With "To Be Confirmed"
-        desc2 = _build_description("Roller Blind", "Brand", "Fabric", "To Be Confirmed")
-        assert desc2 == "Roller Blind Brand Fabric Colour To Be Confirmed"
-
+        (("Roller Blind", "Brand", "Fabric", "To Be Confirmed"), "Roller Blind Brand Fabric Colour To Be Confirmed"),
         # With empty parts
-        desc3 = _build_description("Roller Blind", "Brand", "", "Red")
-        assert desc3 == "Roller Blind Brand Red"
-
-    def test_next_code_for_group(self):
+        (("Roller Blind", "Brand", "", "Red"), "Roller Blind Brand Red"),
+    ])
+    def test_build_description(self, parts, expected):
+        """Test full description building."""
+        assert _build_description(*parts) == expected
+
+    @pytest.mark.parametrize("existing,expected", [
+        (["ROLL10000", "ROLL10001", "ROLL10005"], "ROLL10006"),
+        ([], "ROLL10000"),  # Empty list
+        (["ROLL10000", "WSROLL123", "ROLL10002"], "ROLL10003"),  # Mixed codes (ignore non-matching)
+    ])
+    def test_next_code_for_group(self, existing, expected):
         """Test sequential code generation."""
-        existing = ["ROLL10000", "ROLL10001", "ROLL10005"]
-        next_code = _next_code_for_group(existing, "ROLL")
-        assert next_code == "ROLL10006"
+        assert _next_code_for_group(existing, "ROLL", start=10000) == expected
 
-        # Empty list
-        next_code2 = _next_code_for_group([], "ROLL", start=10000)
-        assert next_code2 == "ROLL10000"
+    def test_alloc_codes_for_group(self):
+        """Test block allocation continues after the highest existing suffix."""
+        existing = {"ROLL10005", "roll10007", "WSROLL99999", "ROLLX"}
+        assert _alloc_codes_for_group(existing, "ROLL", 3) == ["ROLL10008", "ROLL10009", "ROLL10010"]
+        assert _alloc_codes_for_group(set(), "ROLL", 1) == ["ROLL10000"]
+        assert _alloc_codes_for_group(existing, "ROLL", 0) == []
 
-        # Mixed codes (ignore non-matching)
-        existing3 = ["ROLL10000", "WSROLL123", "ROLL10002"]
-        next_code3 = _next_code_for_group(existing3, "ROLL")
-        assert next_code3 == "ROLL10003"
-
-    def test_check_material_restriction(self):
+    @pytest.mark.parametrize("group_code,material,expected", [
+        # Allowed
+        ("ZIPSV2", "Mesh Screen", True),
+        ("ZIPSV2", "PVC Fabric", True),
+        ("AWNS2K", "Acrylic", True),
+        # Not allowed
+        ("ZIPSV2", "Cotton", False),
+        # No restriction = allowed
+        ("ROLL", "Any Material", True),
+    ])
+    def test_check_material_restriction(self, group_code, material, expected):
         """Test material restriction checking."""
         restrictions = {
             "ZIPSV2": ["Mesh", "PVC"],
             "AWNS2K": ["Canvas", "Acrylic", "Mesh"]
         }
-
-        # Allowed
-        assert _check_material_restriction("ZIPSV2", "Mesh Screen", restrictions) is True
-        assert _check_material_restriction("ZIPSV2", "PVC Fabric", restrictions) is True
-        assert _check_material_restriction("AWNS2K", "Acrylic", restrictions) is True
-
-        # Not allowed
-        assert _check_material_restriction("ZIPSV2", "Cotton", restrictions) is False
-
-        # No restriction = allowed
-        assert _check_material_restriction("ROLL", "Any Material", restrictions) is True
+        assert _check_material_restriction(group_code, material, restrictions) is expected
 
 
 class TestLoadGroupsConfig:
@@ -159,9 +186,6 @@ class TestLoadFabricData:
 
     def test_load_fabric_data_from_sheets(self):
         """Test loading fabric data from Google Sheets."""
-        # Mock sheets service
-        mock_service = Mock()
-
         # Mock retail tab data
         retail_data = [
             ["FD1", "FD2", "FD3", "Unleashed Code", "Category", "Price"],
@@ -175,7 +199,11 @@ class TestLoadFabricData:
             ["Brand3", "Fabric3", "Green", "UNL003", "Fabric - Roller Blind", "89-3"],
         ]
 
-        mock_service.fetch_sheet_data.side_effect = [retail_data, wholesale_data]
+        # Sheets service stub: the loader only calls fetch_sheets_batch
+        mock_service = SimpleNamespace(fetch_sheets_batch=Mock(return_value={
+            "Retail!A:Z": retail_data,
+            "Wholesale!A:Z": wholesale_data,
+        }))
 
         groups_config = {
             "ROLL": {
@@ -213,26 +241,31 @@ class TestLoadFabricData:
         assert len(filtered.get("ROLL", set())) == 0
         assert result["WSROLL"].iloc[0]["FD1"] == "Brand3"
 
+    def test_load_fabric_data_keeps_repeated_headers(self):
+        """Columns sharing a header are all kept, not collapsed into the last one."""
+        retail_data = [
+            ["FD1", "FD2", "FD3", "Unleashed Code", "Category", "Price", "Notes", "Notes"],
+            ["Brand1", "Fabric1", "Red", "UNL001", "Fabric - Roller Blind", "45.50", "first", "second"],
+        ]
+        mock_service = SimpleNamespace(fetch_sheets_batch=Mock(return_value={
+            "Retail!A:Z": retail_data,
+            "Wholesale!A:Z": [],
+        }))
+
+        result, _ = load_fabric_data_from_sheets(
+            mock_service, "sheet_id_123", "Retail", "Wholesale",
+            {"ROLL": {"category": "Fabric - Roller Blind"}}, {}
+        )
+
+        assert result["ROLL"]["Notes"].iloc[0].tolist() == ["first", "second"]
+
 
 class TestLoadBuzData:
     """Test loading existing Buz data."""
 
-    def test_load_existing_buz_inventory(self, get_db_manager):
+    def test_load_existing_buz_inventory(self, shared_db):
         """Test loading existing inventory from database."""
-        db = get_db_manager
-
-        # Insert test data (table already created by init_db in fixture)
-        db.execute_query("""
-            INSERT INTO inventory_items (
-                Code, SupplierProductCode, DescnPart1, DescnPart2, DescnPart3,
-                Description, Active, Warning, PriceGridCode, CostGridCode,
-                DiscountGroupCode, inventory_group_code, PkId
-            ) VALUES
-            ('ROLL10000', 'UNL001', 'Brand1', 'Fabric1', 'Red',
-             'Roller Blind Brand1 Fabric1 Red', 'TRUE', '', '', '', 'RB', 'ROLL', 'pk1'),
-            ('WSROLL10000', 'UNL002', 'Brand2', 'Fabric2', 'Blue',
-             'WS Roller Blind Brand2 Fabric2 Blue', 'TRUE', '', 'WSRB', 'WSRB_C', 'WSRB', 'WSROLL', 'pk2')
-        """)
+        db = shared_db
 
         groups_config = {
             "ROLL": {"category": "Fabric - Roller Blind"},
@@ -248,18 +281,9 @@ class TestLoadBuzData:
         assert "ROLL10000" in existing_codes["ROLL"]
         assert "WSROLL10000" in existing_codes["WSROLL"]
 
-    def test_load_existing_buz_pricing(self, get_db_manager):
+    def test_load_existing_buz_pricing(self, shared_db):
         """Test loading existing pricing from database."""
-        db = get_db_manager
-
-        # Insert test data (table already created by init_db in fixture)
-        db.execute_query("""
-            INSERT INTO pricing_data (
-                InventoryCode, SellLMWide, CostLMWide, DateFrom
-            ) VALUES
-            ('ROLL10000', 45.50, 30.00, '01/01/2024'),
-            ('ROLL10000', 50.00, 35.00, '01/06/2024')
-        """)
+        db = shared_db
 
         groups_config = {
             "ROLL": {"category": "Fabric - Roller Blind"}
@@ -272,6 +296,24 @@ class TestLoadBuzData:
         assert pricing_map["ROLL10000"]["sell_price"] == Decimal("50.00")
         assert pricing_map["ROLL10000"]["cost_price"] == Decimal("35.00")
 
+    def test_load_existing_buz_pricing_orders_unpadded_dates(self, get_db_manager):
+        """D/M/YYYY dates without zero padding still rank by date, not insertion order."""
+        db = get_db_manager
+        db.insert_item("inventory_items", {"Code": "ROLL10000", "inventory_group_code": "ROLL"})
+        db.executemany("""
+            INSERT INTO pricing_data (InventoryCode, SellSQM, CostSQM, DateFrom)
+            VALUES (?, ?, ?, ?)
+        """, [
+            ("ROLL10000", 60.00, 40.00, "1/7/2024"),
+            ("ROLL10000", 50.00, 35.00, "15/06/2024"),
+            ("ROLL10000", 45.00, 30.00, "2024-05-01"),
+        ])
+
+        pricing_map = load_existing_buz_pricing(db, {"ROLL": {"category": "Fabric - Roller Blind"}})
+
+        assert pricing_map["ROLL10000"]["sell_price"] == Decimal("60.00")
+        assert pricing_map["ROLL10000"]["date_from"] == "1/7/2024"
+
 
 class TestComputeChanges:
     """Test change computation logic."""
@@ -280,16 +322,10 @@ class TestComputeChanges:
         """Test ADD operation for new fabrics."""
         # Setup mock data
         fabrics_by_group = {
-            "ROLL": pd.DataFrame([
-                {
-                    "_key": "brand1||fabric1||red",
-                    "FD1": "Brand1",
-                    "FD2": "Fabric1",
-                    "FD3": "Red",
-                    "Unleashed Code": "UNL001",
-                    "Price": "45.50"
-                }
-            ])
+            "ROLL": pd.DataFrame.from_records(
+                [("brand1||fabric1||red", "Brand1", "Fabric1", "Red", "UNL001", "45.50")],
+                columns=_FAB_COLS,
+            ).astype(_FAB_DTYPES)
         }
 
         inv_by_group = {
@@ -341,35 +377,19 @@ class TestComputeChanges:
     def test_compute_changes_edit_operation(self):
         """Test EDIT operation for existing fabrics."""
         fabrics_by_group = {
-            "ROLL": pd.DataFrame([
-                {
-                    "_key": "brand1||fabric1||red",
-                    "FD1": "Brand1",
-                    "FD2": "Fabric1",
-                    "FD3": "Red",
-                    "Unleashed Code": "UNL001_NEW",  # Changed code
-                    "Price": "45.50"
-                }
-            ])
+            "ROLL": pd.DataFrame.from_records(
+                # Unleashed Code changed from UNL001_OLD
+                [("brand1||fabric1||red", "Brand1", "Fabric1", "Red", "UNL001_NEW", "45.50")],
+                columns=_FAB_COLS,
+            ).astype(_FAB_DTYPES)
         }
 
         inv_by_group = {
-            "ROLL": pd.DataFrame([
-                {
-                    "_key": "brand1||fabric1||red",
-                    "Code": "ROLL10000",
-                    "SupplierProductCode": "UNL001_OLD",
-                    "DescnPart1": "Brand1",
-                    "DescnPart2": "Fabric1",
-                    "DescnPart3": "Red",
-                    "Active": "TRUE",
-                    "Warning": "",
-                    "PkId": "pk1",
-                    "PriceGridCode": "",
-                    "CostGridCode": "",
-                    "DiscountGroupCode": "RB"
-                }
-            ])
+            "ROLL": pd.DataFrame.from_records(
+                [("brand1||fabric1||red", "ROLL10000", "UNL001_OLD", "Brand1", "Fabric1", "Red",
+                  "TRUE", "", "pk1", "", "", "RB")],
+                columns=_INV_COLS,
+            ).astype(_INV_DTYPES)
         }
 
         existing_codes = {"ROLL": {"ROLL10000"}}
@@ -414,22 +434,11 @@ class TestComputeChanges:
         }
 
         inv_by_group = {
-            "ROLL": pd.DataFrame([
-                {
-                    "_key": "brand1||fabric1||red",
-                    "Code": "ROLL10000",
-                    "SupplierProductCode": "UNL001",
-                    "DescnPart1": "Brand1",
-                    "DescnPart2": "Fabric1",
-                    "DescnPart3": "Red",
-                    "Active": "TRUE",
-                    "Warning": "",
-                    "PkId": "pk1",
-                    "PriceGridCode": "",
-                    "CostGridCode": "",
-                    "DiscountGroupCode": "RB"
-                }
-            ])
+            "ROLL": pd.DataFrame.from_records(
+                [("brand1||fabric1||red", "ROLL10000", "UNL001", "Brand1", "Fabric1", "Red",
+                  "TRUE", "", "pk1", "", "", "RB")],
+                columns=_INV_COLS,
+            ).astype(_INV_DTYPES)
         }
 
         existing_codes = {"ROLL": {"ROLL10000"}}
@@ -470,16 +479,11 @@ class TestComputeChanges:
     def test_compute_changes_wholesale_no_pricing(self):
         """Test that wholesale groups don't generate pricing changes."""
         fabrics_by_group = {
-            "WSROLL": pd.DataFrame([
-                {
-                    "_key": "brand1||fabric1||red",
-                    "FD1": "Brand1",
-                    "FD2": "Fabric1",
-                    "FD3": "Red",
-                    "Unleashed Code": "UNL001",
-                    "Price": "89-3"  # Price category, not price
-                }
-            ])
+            "WSROLL": pd.DataFrame.from_records(
+                # Price holds the price category for wholesale, not a price
+                [("brand1||fabric1||red", "Brand1", "Fabric1", "Red", "UNL001", "89-3")],
+                columns=_FAB_COLS,
+            ).astype(_FAB_DTYPES)
         }
 
         inv_by_group = {"WSROLL": pd.DataFrame()}
@@ -514,3 +518,36 @@ class TestComputeChanges:
 
         # No pricing changes for wholesale
         assert "WSROLL" not in pricing_changes or len(pricing_changes["WSROLL"]) == 0
+
+
+class TestColumnarChanges:
+    """Test the columnar form used to store change sets in the job result."""
+
+    def test_roundtrip(self):
+        """Pivoting to columns and back preserves rows and key order."""
+        changes = {
+            "ROLL": [
+                {"PkId": "", "Code": "ROLL10000", "Operation": "A"},
+                {"PkId": "7", "Code": "ROLL10001", "Operation": "E"},
+            ],
+            "WSROLL": [],
+        }
+        columnar = changes_to_columnar(changes)
+        assert columnar["ROLL"]["Code"] == ["ROLL10000", "ROLL10001"]
+        assert columnar["WSROLL"] == {}
+        assert changes_from_columnar(columnar) == changes
+
+    def test_accepts_row_lists_from_older_job_results(self):
+        """Jobs stored before the columnar format still hold row lists per group."""
+        legacy = {"ROLL": [{"Operation": "A", "Code": "ROLL10000"}], "WSROLL": []}
+
+        assert changes_from_columnar(legacy) == legacy
+        assert [columnar_row_count(rows) for rows in legacy.values()] == [1, 0]
+
+        headers_cfg = {
+            "buz_inventory_item_file": [{"spreadsheet_column": "Operation"}, {"spreadsheet_column": "Code"}],
+            "buz_pricing_file": [{"spreadsheet_column": "Operation"}, {"spreadsheet_column": "InventoryCode"}],
+        }
+        items_stream, _ = generate_workbooks_in_memory(legacy, {}, headers_cfg)
+        ws = load_workbook(items_stream)["ROLL"]
+        assert [c.value for c in ws[3]][:2] == ["A", "ROLL10000"]
@@ -2,7 +2,19 @@ import pytest
 import logging
 from services.excel import OpenPyXLFileHandler
 import pandas as pd
-from services.buz_items_by_supplier_product_code import process_buz_items_by_supplier_product_codes
+from services.buz_items_by_supplier_product_code import process_buz_items_by_supplier_product_codes, process_single_sheet
+
+
+class TupleSheet:
+    """Minimal worksheet stand-in that serves rows as plain value tuples."""
+
+    def __init__(self, rows, title="Sheet1"):
+        self.rows = rows
+        self.title = title
+
+    def iter_rows(self, min_row=1, max_row=None, values_only=False):
+        assert values_only, "rows are only ever read as values"
+        return iter(self.rows[min_row - 1:max_row])
 
 
 class TestProcessBuzItems:
@@ -68,3 +80,21 @@ class TestProcessBuzItems:
                 OpenPyXLFileHandler(),
                 mock_supplier_product_codes
             )
+
+
+def test_process_single_sheet_reads_value_tuples():
+    sheet = TupleSheet([
+        ("Inventory", None, None),
+        ("Code*", "Supplier Product Code", "Operation"),
+        ("A1", "SUP001", None),
+        ("A2", None, None),
+        ("A3", "SUP999", None),
+    ])
+
+    rows = process_single_sheet(sheet, frozenset({"SUP001"}), header_row=2)
+
+    assert rows == [
+        ["Inventory", None, None],
+        ["Code*", "Supplier Product Code", "Operation"],
+        ["A1", "SUP001", "E"],
+    ]
@@ -1,9 +1,11 @@
+import functools
+import os
+import tempfile
 import unittest
-from unittest.mock import MagicMock, patch
 import sqlite3
-import io
 from services.database import DatabaseManager
 from services.config_service import ConfigManager
+from tests.support.recorder import attr_recorder
 
 
 def generate_create_table_sql(table_name, fields):
@@ -11,36 +13,69 @@ def generate_create_table_sql(table_name, fields):
     Generate a SQL CREATE TABLE statement.
 
     :param table_name: Name of the table to create.
-    :param fields: List of fields from config.json.
+    :param fields: Field names, or field entries from config.json (dicts with a `database_field`).
     :return: A formatted SQL statement.
     """
-    field_definitions = [f'"{field.replace(" ", "")}" TEXT' for field in fields]
-    create_table_sql = f'CREATE TABLE IF NOT EXISTS {table_name} ({", ".join(field_definitions)});'
-    return create_table_sql
+    column_names = tuple(
+        field["database_field"] if isinstance(field, dict) else field.replace(" ", "")
+        for field in fields
+    )
+    return _create_table_sql(table_name, column_names)
+
+
+@functools.lru_cache(maxsize=None)
+def _create_table_sql(table_name, column_names):
+    """Build (once per table and column tuple) the CREATE TABLE statement with TEXT columns."""
+    field_definitions = ", ".join(f'"{name}" TEXT' for name in column_names)
+    return f'CREATE TABLE IF NOT EXISTS {table_name} ({field_definitions});'
+
+
+@functools.lru_cache(maxsize=None)
+def unleashed_table_sql():
+    """
+    Read the Unleashed fields from config.json and build their CREATE TABLE once per test run.
+
+    :return: The column names and the CREATE TABLE statement for unleashed_products.
+    """
+    # insert_unleashed_data always writes the code, description and friendly descriptions
+    fixed_fields = ("ProductCode", "ProductDescription",
+                    "FriendlyDescription1", "FriendlyDescription2", "FriendlyDescription3")
+    config_fields = (field["database_field"] for field in ConfigManager().get("headers", "unleashed_fields"))
+    unleashed_fields = tuple(dict.fromkeys((*fixed_fields, *config_fields)))
+    return unleashed_fields, generate_create_table_sql("unleashed_products", unleashed_fields)
 
 
 class TestDataProcessing(unittest.TestCase):
-    def setUp(self):
-        """Set up an in-memory SQLite database using DatabaseManager."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up one in-memory SQLite database with unleashed_products for the whole class."""
         # Create an in-memory SQLite database
-        self.conn = sqlite3.connect(":memory:")
-        self.conn.row_factory = sqlite3.Row
+        cls.conn = sqlite3.connect(":memory:")
+        cls.conn.row_factory = sqlite3.Row
+        for pragma in ("synchronous=OFF", "temp_store=MEMORY"):
+            cls.conn.execute(f"PRAGMA {pragma}")
 
         # Initialize DatabaseManager with the in-memory connection
-        self.db_manager = DatabaseManager(self.conn)
-
-        config = ConfigManager()
-        unleashed_fields = config.get("headers","unleashed_fields")
+        cls.db_manager = DatabaseManager(cls.conn)
 
-        # Initialize the database manager (assuming it's already set up)
-        create_table_sql = generate_create_table_sql("unleashed_products", unleashed_fields)
-        self.db_manager.execute_query(create_table_sql)
-        self.db_manager.commit()
+        unleashed_fields, create_table_sql = unleashed_table_sql()
+        cls.db_manager.execute_query(create_table_sql)
+        cls.db_manager.commit()
         print(f"Table unleashed_products created with fields: {', '.join(unleashed_fields)}")
 
+    @classmethod
+    def tearDownClass(cls):
+        """Close the database connection once the class is done."""
+        cls.conn.close()
+
     def tearDown(self):
-        """Close the database connection after each test."""
-        self.conn.close()
+        """Empty unleashed_products so each test starts from a clean table.
+
+        The code under test commits, which would release any SAVEPOINT, so rows are deleted instead.
+        """
+        self.conn.rollback()
+        self.conn.execute("DELETE FROM unleashed_products")
+        self.conn.commit()
 
     def test_safe_float(self):
         from services.data_processing import safe_float
@@ -55,38 +90,45 @@ class TestDataProcessing(unittest.TestCase):
         self.assertEqual(clean_value("=test"), "test")
         self.assertEqual(clean_value("\uFEFFvalue"), "value")
         self.assertEqual(clean_value("\x1Fdata"), "data")
+        self.assertEqual(clean_value('"quoted"'), "quoted")
+        # Quotes are removed after the leading '=' is stripped, so a quoted formula keeps it
+        self.assertEqual(clean_value('"=foo'), "=foo")
 
-    @patch('services.data_processing.DatabaseManager')
-    def test_clear_unleashed_table(self, mock_database_manager):
+    def test_clear_unleashed_table(self):
         from services.data_processing import clear_unleashed_table
 
-        # Mock the DatabaseManager
-        mock_db_manager = mock_database_manager.return_value
-        mock_db_manager.execute_query.return_value = None
+        # Record the calls on a stand-in DatabaseManager
+        db_manager = attr_recorder("execute_query")
 
         # Run the function under test
-        clear_unleashed_table(mock_db_manager)
+        clear_unleashed_table(db_manager)
 
         # Assert the correct query was executed
-        mock_db_manager.execute_query.assert_called_once_with("DELETE FROM unleashed_products", auto_commit=True)
+        self.assertEqual(
+            db_manager.execute_query.calls,
+            [(("DELETE FROM unleashed_products",), {"auto_commit": True})],
+        )
 
-    @patch('services.database.get_db_connection')
-    def test_insert_unleashed_data(self, mock_get_db_connection):
+    def test_insert_unleashed_data(self):
         from services.data_processing import insert_unleashed_data
 
-        mock_get_db_connection.return_value = self.conn
+        field_config = [{"spreadsheet_column": "IsObsoleted", "database_field": "IsObsoleted"}]
 
-        test_csv_data = io.StringIO(
-            """Product Code,Product Description,IsObsoleted,IsSellable\nP001,Test Product,No,Yes\nP002,Obsolete Product,Yes,No""")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = os.path.join(tmp_dir, "unleashed.csv")
+            with open(csv_path, "w", encoding="utf-8", newline="") as f:
+                f.write("*Product Code,Product Description,IsObsoleted,IsSellable\n"
+                        "P001,Test Product,No,Yes\n"
+                        "P002,Obsolete Product,Yes,No\n")
 
-        with patch('builtins.open', return_value=test_csv_data):
-            insert_unleashed_data(self.db_manager, 'mock_file.csv')
+            insert_unleashed_data(self.db_manager, csv_path, field_config)
 
-            # Verify database state
-            rows = self.conn.execute('SELECT * FROM unleashed_products').fetchall()
+        # Verify database state
+        rows = self.conn.execute('SELECT * FROM unleashed_products').fetchall()
 
-            self.assertEqual(len(rows), 1)
-            self.assertEqual(rows[0]['ProductCode'], 'P001')
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['ProductCode'], 'P001')
+        self.assertEqual(rows[0]['ProductDescription'], 'Test Product')
 
     def test_validate_data(self):
         from services.data_processing import validate_data
@@ -105,6 +147,29 @@ class TestDataProcessing(unittest.TestCase):
         transformed = transform_data(data)
         self.assertEqual(transformed, {"key1": "VALUE", "key2": 123})
 
+    def test_transform_data_batch(self):
+        import pandas as pd
+        from services.data_processing import transform_data_batch
+
+        df = pd.DataFrame({"key1": ["value", "other"], "key2": [123, 456]})
+        transformed = transform_data_batch(df)
+        self.assertEqual(
+            transformed.to_dict("records"),
+            [{"key1": "VALUE", "key2": 123}, {"key1": "OTHER", "key2": 456}],
+        )
+
+    def test_transform_data_batch_object_columns_without_strings(self):
+        import pandas as pd
+        from services.data_processing import transform_data_batch
+
+        df = pd.DataFrame({
+            "mixed": pd.Series(["value", 7], dtype=object),
+            "no_text": pd.Series([1, None], dtype=object),
+        })
+        transformed = transform_data_batch(df)
+        self.assertEqual(transformed["mixed"].tolist(), ["VALUE", 7])
+        self.assertEqual(transformed["no_text"].tolist(), [1, None])
+
 
 if __name__ == '__main__':
     unittest.main()
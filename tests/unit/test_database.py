@@ -1,14 +1,15 @@
 # test_database.py
 
 import unittest
-from unittest.mock import MagicMock
 from services.database import DatabaseManager
+from tests.support.recorder import fake_connection
 
 
 class TestDatabaseManager(unittest.TestCase):
     def setUp(self):
-        # Mock the database connection
-        self.mock_db = MagicMock()
+        # Fake the database connection; every query goes through its single cursor
+        self.mock_db = fake_connection()
+        self.cursor = self.mock_db.cursor.return_value
         self.db_manager = DatabaseManager(self.mock_db)
 
     def test_insert_item(self):
@@ -22,14 +23,30 @@ class TestDatabaseManager(unittest.TestCase):
         # Assert
         query = "INSERT OR IGNORE INTO users (name, age) VALUES (?, ?)"
         params = ('John', 30)
-        self.mock_db.execute.assert_called_once_with(query, params)
-        self.mock_db.commit.assert_called_once()
+        self.assertEqual(self.cursor.execute.calls, [((query, params), {})])
+        self.assertEqual(self.mock_db.commit.call_count, 1)
+
+    def test_insert_items(self):
+        # Arrange
+        table = 'users'
+        rows = [{'name': 'John', 'age': 30}, {'name': 'Jane', 'age': 25}]
+
+        # Act (rows may be any iterable, e.g. a generator)
+        self.db_manager.insert_items(table, (row for row in rows))
+
+        # Assert
+        query = "INSERT OR IGNORE INTO users (name, age) VALUES (?, ?)"
+        params = [('John', 30), ('Jane', 25)]
+        self.assertEqual(self.cursor.executemany.call_count, 1)
+        (called_query, called_params), _ = self.cursor.executemany.calls[0]
+        self.assertEqual((called_query, list(called_params)), (query, params))
+        self.assertEqual(self.mock_db.commit.call_count, 1)
 
     def test_get_item(self):
         # Arrange
         table = 'users'
         criteria = {'name': 'John'}
-        self.mock_db.execute.return_value.fetchall.return_value = [{'name': 'John', 'age': 30}]
+        self.cursor.fetchall.return_value = [{'name': 'John', 'age': 30}]
 
         # Act
         result = self.db_manager.get_item(table, criteria)
@@ -37,9 +54,23 @@ class TestDatabaseManager(unittest.TestCase):
         # Assert
         query = "SELECT * FROM users WHERE name=?"
         params = ('John',)
-        self.mock_db.execute.assert_called_once_with(query, params)
+        self.assertEqual(self.cursor.execute.calls, [((query, params), {})])
         self.assertEqual(result, [{'name': 'John', 'age': 30}])
 
+    def test_fetch_tuples(self):
+        # Arrange
+        query = "SELECT fabric_id, inventory_group_code FROM fabric_group_mappings"
+        self.cursor.fetchall.return_value = [(1, 'GRP1')]
+        self.cursor.execute.return_value = self.cursor
+
+        # Act
+        result = self.db_manager.fetch_tuples(query)
+
+        # Assert
+        self.assertIsNone(self.cursor.row_factory)
+        self.assertEqual(self.cursor.execute.calls, [((query, []), {})])
+        self.assertEqual(result, [(1, 'GRP1')])
+
     def test_delete_item(self):
         # Arrange
         table = 'users'
@@ -51,8 +82,8 @@ class TestDatabaseManager(unittest.TestCase):
         # Assert
         query = "DELETE FROM users WHERE name=?"
         params = ('John',)
-        self.mock_db.execute.assert_called_once_with(query, params)
-        self.mock_db.commit.assert_called_once()
+        self.assertEqual(self.cursor.execute.calls, [((query, params), {})])
+        self.assertEqual(self.mock_db.commit.call_count, 1)
 
     def test_tables_created(self):
         # Verify that all expected tables are created
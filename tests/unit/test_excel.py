@@ -1,3 +1,8 @@
+import sqlite3
+
+from openpyxl import Workbook
+
+from services.database import DatabaseManager
 from services.excel import OpenPyXLFileHandler
 
 
@@ -41,5 +46,64 @@ class TestCreateExcelFile:
         self.assertEqual(sheet2.cell(row=2, column=2).value, "Row2")
 
 
+def test_from_items_write_only_matches_regular(tmp_path):
+    items = [
+        {"inventory_group_code": "G1", "Code": "A", "Operation": "D"},
+        {"inventory_group_code": "G2", "Code": "B", "Operation": "D"},
+        {"inventory_group_code": "G1", "Code": "C", "Operation": "D"},
+    ]
+    headers_config = [
+        {"database_field": "Operation", "spreadsheet_column": "Operation"},
+        {"database_field": "Code", "spreadsheet_column": "Code"},
+    ]
+
+    saved = {}
+    for write_only in (False, True):
+        path = tmp_path / f"items_{write_only}.xlsx"
+        OpenPyXLFileHandler.from_items(items, headers_config, header_row=2, write_only=write_only).save_workbook(path)
+        workbook = OpenPyXLFileHandler.from_file(str(path)).workbook
+        saved[write_only] = {ws.title: list(ws.iter_rows(min_row=2, values_only=True)) for ws in workbook}
+
+    assert saved[True] == saved[False] == {
+        "G1": [("Operation", "Code"), ("D", "A"), ("D", "C")],
+        "G2": [("Operation", "Code"), ("D", "B")],
+    }
+
+
+def test_from_sheets_data_without_sheets_still_saves(tmp_path):
+    # update_pricing relies on this to always hand the route a file to download
+    path = tmp_path / "empty.xlsx"
+    OpenPyXLFileHandler.from_sheets_data({}, {"headers": ["A"], "header_row": 1}).save_workbook(path)
+
+    assert path.exists()
+
+
+def test_clean_for_upload_keeps_rows_with_unknown_unleashed_codes():
+    connection = sqlite3.connect(":memory:")
+    connection.row_factory = sqlite3.Row
+    connection.execute("CREATE TABLE unleashed_products (ProductCode TEXT, ProductDescription TEXT)")
+    connection.executemany(
+        "INSERT INTO unleashed_products VALUES (?, ?)", [(" abc1 ", "Fabric A"), ("XYZ2", "Fabric B")]
+    )
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "ROLL"
+    sheet.append(["ROLL"])
+    sheet.append(["Code", "Desc", "Name*"])
+    for name, ab_code in [("c", "ABC1"), ("a", "nope"), ("b", None), ("d", "xyz2 "), ("e", "Other")]:
+        row = [None] * 28
+        row[0], row[2], row[27] = f"CODE-{name}", name, ab_code
+        sheet.append(row)
+    handler = OpenPyXLFileHandler(workbook=workbook)
+
+    handler.clean_for_upload(DatabaseManager(connection), allowed_sheets=["ROLL"], show_only_valid_unleashed=True)
+
+    ul_rows = list(handler.workbook["UL"].iter_rows(values_only=True))
+    assert ul_rows == [("ProductCode", "ProductDescription"), (" abc1 ", "Fabric A"), ("XYZ2", "Fabric B")]
+    kept = [(row[2], row[27]) for row in sheet.iter_rows(min_row=3, values_only=True) if row[0]]
+    assert kept == [("a", "nope"), ("e", "Other")]
+
+
 if __name__ == "__main__":
     unittest.main()
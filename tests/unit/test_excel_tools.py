@@ -0,0 +1,39 @@
+from openpyxl import Workbook
+
+from app.routes.excel_tools import _delete_rows_bulk
+
+
+def _sheet(rows):
+    wb = Workbook()
+    ws = wb.active
+    for row in rows:
+        ws.append(row)
+    return ws
+
+
+def test_delete_rows_bulk_matches_delete_rows():
+    rows = [[f"r{r}c{c}" if (r + c) % 3 else None for c in range(4)] for r in range(12)]
+    drop = [2, 3, 4, 7, 9, 12]
+
+    bulk = _sheet(rows)
+    removed = _delete_rows_bulk(bulk, drop)
+
+    # Reference: openpyxl's own delete_rows, one row at a time from the bottom up
+    reference = _sheet(rows)
+    for r in sorted(drop, reverse=True):
+        reference.delete_rows(r)
+
+    assert removed == len(drop)
+    assert list(bulk.iter_rows(values_only=True)) == list(reference.iter_rows(values_only=True))
+    assert bulk.max_row == reference.max_row
+
+    # Appends land straight after the surviving rows
+    bulk.append(["new"])
+    assert bulk.cell(row=reference.max_row + 1, column=1).value == "new"
+
+
+def test_delete_rows_bulk_nothing_to_delete():
+    ws = _sheet([["a"], ["b"]])
+
+    assert _delete_rows_bulk(ws, []) == 0
+    assert list(ws.iter_rows(values_only=True)) == [("a",), ("b",)]
@@ -6,16 +6,10 @@ from services.fabrics import get_fabric_grid_data
 def mock_inventory_group_data_fabrics(get_db_manager):
     """Fixture to populate the inventory_groups table."""
     db_manager = get_db_manager
-    db_manager.insert_item("inventory_groups",
-                           {
-                               "group_code": "GRP1",
-                               "group_description": "Inventory Group 1"
-                           })
-    db_manager.insert_item("inventory_groups",
-                           {
-                               "group_code": "GRP2",
-                               "group_description": "Inventory Group 2"
-                           })
+    db_manager.insert_items("inventory_groups", [
+        {"group_code": "GRP1", "group_description": "Inventory Group 1"},
+        {"group_code": "GRP2", "group_description": "Inventory Group 2"},
+    ])
     yield db_manager
 
 
@@ -23,12 +17,10 @@ def mock_inventory_group_data_fabrics(get_db_manager):
 def mock_fabric_data(get_db_manager):
     """Fixture to insert mock fabric data into the database."""
     db_manager = get_db_manager
-
-    db_manager.insert_item(
-        "fabrics", {"supplier_product_code": "FAB001", "description_1": "Sheer", "description_2": "White"})
-    db_manager.insert_item(
-        "fabrics", {"supplier_product_code": "FAB002", "description_1": "Outdoor", "description_2": "Canvas"})
-
+    db_manager.insert_items("fabrics", [
+        {"supplier_product_code": "FAB001", "description_1": "Sheer", "description_2": "White"},
+        {"supplier_product_code": "FAB002", "description_1": "Outdoor", "description_2": "Canvas"},
+    ])
     yield db_manager
 
 
@@ -36,8 +28,10 @@ def mock_fabric_data(get_db_manager):
 def mock_fabric_group_mapping_data(get_db_manager):
     """Fixture to populate the fabric_group_mappings table."""
     db_manager = get_db_manager
-    db_manager.insert_item("fabric_group_mappings", {"fabric_id": 1, "inventory_group_code": "GRP1"})
-    db_manager.insert_item("fabric_group_mappings", {"fabric_id": 2, "inventory_group_code": "GRP2"})
+    db_manager.insert_items("fabric_group_mappings", [
+        {"fabric_id": 1, "inventory_group_code": "GRP1"},
+        {"fabric_id": 2, "inventory_group_code": "GRP2"},
+    ])
     yield db_manager
 
 
@@ -1,76 +1,153 @@
-import unittest
-from unittest.mock import patch, MagicMock
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+
+import services.google_sheets_service as google_sheets_service
 from services.google_sheets_service import GoogleSheetsService
 
 
-class TestGoogleSheetsService(unittest.TestCase):
-    @patch('google_sheets_service.Credentials.from_service_account_info')
-    @patch('google_sheets_service.gspread.authorize')
-    def setUp(self, mock_authorize, mock_credentials):
-        # Mock the credentials and gspread client
-        mock_credentials.return_value = MagicMock()
-        self.mock_client = MagicMock()
-        mock_authorize.return_value = self.mock_client
+@pytest.fixture
+def mock_client(monkeypatch):
+    """Build GoogleSheetsService against a mocked gspread client, skipping credential loading."""
+    client = MagicMock()
+    monkeypatch.setattr(GoogleSheetsService, "_authenticate_google_sheets", staticmethod(lambda json_file: None))
+    monkeypatch.setattr(google_sheets_service.gspread, "authorize", lambda creds: client)
+    return client
+
+
+@pytest.fixture
+def service(mock_client):
+    GoogleSheetsService.cache_clear()
+    yield GoogleSheetsService(json_file="./static/dummy_service_account.json")
+    GoogleSheetsService.cache_clear()
+
+
+def test_fetch_sheet_data_success(service, mock_client):
+    # Mock the batch values call behind an A1 range read
+    spreadsheet = mock_client.open_by_key.return_value
+    spreadsheet.values_batch_get.return_value = {"valueRanges": [{"values": [['Name', 'Age'], ['Alice', '30']]}]}
+
+    # Call fetch_sheet_data
+    result = service.fetch_sheet_data('sheet_id', 'Sheet1!A1:B10')
+
+    # Assert the result matches the mocked data
+    assert result == [['Name', 'Age'], ['Alice', '30']]
+    mock_client.open_by_key.assert_called_once_with('sheet_id')
+    spreadsheet.values_batch_get.assert_called_once_with(['Sheet1!A1:B10'])
+
+
+def test_fetch_sheet_data_cached_across_instances(service, mock_client):
+    spreadsheet = mock_client.open_by_key.return_value
+    spreadsheet.values_batch_get.return_value = {"valueRanges": [{"values": [['Name', 'Age']]}]}
+
+    first = service.fetch_sheet_data('sheet_id', 'Sheet1!A1:B10')
+    first[0].append('mutated')
+
+    # A new per-request instance reuses the cached range and sees an unmutated copy
+    other = GoogleSheetsService(json_file="./static/dummy_service_account.json")
+    assert other.fetch_sheet_data('sheet_id', 'Sheet1!A1:B10') == [['Name', 'Age']]
+    spreadsheet.values_batch_get.assert_called_once_with(['Sheet1!A1:B10'])
+
+    GoogleSheetsService.cache_clear()
+    other.fetch_sheet_data('sheet_id', 'Sheet1!A1:B10')
+    assert spreadsheet.values_batch_get.call_count == 2
+
+
+def test_fetch_sheet_data_failure(service, mock_client):
+    # Simulate an APIError being raised by gspread
+    mock_client.open_by_key.side_effect = Exception("APIError: Sheet not found")
+
+    # Assert that fetch_sheet_data handles the exception gracefully
+    result = service.fetch_sheet_data('invalid_sheet_id', 'Sheet1!A1:B10')
+
+    # Assert that the result is an empty list
+    assert result == []
+
+    # Assert that open_by_key was called once with the invalid sheet ID
+    mock_client.open_by_key.assert_called_once_with('invalid_sheet_id')
+
+
+def test_insert_row_success(service, mock_client):
+    # Mock the worksheet and its method
+    mock_worksheet = mock_client.open_by_key.return_value.worksheet.return_value
+
+    # Call insert_row
+    service.insert_row('sheet_id', ['Alice', '30'], worksheet_name='Sheet1')
+
+    # Assert the mocked methods were called
+    mock_client.open_by_key.assert_called_once_with('sheet_id')
+    mock_worksheet.append_row.assert_called_once_with(['Alice', '30'])
+
+
+def test_insert_row_failure(service, mock_client, caplog):
+    # Simulate an APIError being raised by gspread
+    mock_client.open_by_key.side_effect = Exception("APIError: Unable to insert row")
+
+    # Call insert_row and ensure it handles the error
+    with caplog.at_level(logging.ERROR):
+        service.insert_row('invalid_sheet_id', ['Alice', '30'], worksheet_name='Sheet1')
+
+    # Assert that the error log contains the expected message
+    assert "Error inserting row into spreadsheet invalid_sheet_id" in caplog.text
+
+    # Assert that open_by_key was called once with the invalid sheet ID
+    mock_client.open_by_key.assert_called_once_with('invalid_sheet_id')
 
-        # Initialize GoogleSheetsService
-        self.service = GoogleSheetsService(json_file="./static/dummy_service_account.json")
 
-    def test_fetch_sheet_data_success(self):
-        # Mock the worksheet and its method
-        mock_worksheet = MagicMock()
-        mock_worksheet.get_all_values.return_value = [['Name', 'Age'], ['Alice', '30']]
-        self.mock_client.open_by_key.return_value.worksheet.return_value = mock_worksheet
+def test_fetch_many_tails_uses_one_batch_call(service, mock_client):
+    spreadsheet = mock_client.open_by_key.return_value
+    spreadsheet.values_batch_get.side_effect = lambda ranges: {
+        "valueRanges": [{"values": [[a1]]} for a1 in ranges]
+    }
 
-        # Call fetch_sheet_data
-        result = self.service.fetch_sheet_data('sheet_id', 'Sheet1!A1:B10')
+    result = service.fetch_many_tails('sheet_id', ['Tab1', 'Tab2'], ['A1:A5', 'C1:C5'])
 
-        # Assert the result matches the mocked data
-        self.assertEqual(result, [['Name', 'Age'], ['Alice', '30']])
-        self.mock_client.open_by_key.assert_called_once_with('sheet_id')
-        mock_worksheet.get_all_values.assert_called_once()
+    assert result == {
+        'A1:A5': {'Tab1': [["'Tab1'!A1:A5"]], 'Tab2': [["'Tab2'!A1:A5"]]},
+        'C1:C5': {'Tab1': [["'Tab1'!C1:C5"]], 'Tab2': [["'Tab2'!C1:C5"]]},
+    }
+    spreadsheet.values_batch_get.assert_called_once_with(
+        ["'Tab1'!A1:A5", "'Tab2'!A1:A5", "'Tab1'!C1:C5", "'Tab2'!C1:C5"]
+    )
 
-    def test_fetch_sheet_data_failure(self):
-        # Simulate an APIError being raised by gspread
-        self.mock_client.open_by_key.side_effect = Exception("APIError: Sheet not found")
 
-        # Assert that fetch_sheet_data handles the exception gracefully
-        result = self.service.fetch_sheet_data('invalid_sheet_id', 'Sheet1!A1:B10')
+def test_batch_reads_return_copies(service, mock_client):
+    spreadsheet = mock_client.open_by_key.return_value
+    spreadsheet.values_batch_get.return_value = {"valueRanges": [{"values": [['a']]}]}
 
-        # Assert that the result is an empty list
-        self.assertEqual(result, [])
+    service.fetch_sheets_batch('sheet_id', ["'Tab'!A1:A5"])["'Tab'!A1:A5"][0].append('mutated')
+    service.fetch_many_tails('sheet_id', ['Tab'], ['A1:A5'])['A1:A5']['Tab'].append(['extra'])
 
-        # Assert that open_by_key was called once with the invalid sheet ID
-        self.mock_client.open_by_key.assert_called_once_with('invalid_sheet_id')
+    assert service.fetch_sheet_data('sheet_id', "'Tab'!A1:A5") == [['a']]
+    spreadsheet.values_batch_get.assert_called_once()
 
-    def test_insert_row_success(self):
-        # Mock the worksheet and its method
-        mock_worksheet = MagicMock()
-        self.mock_client.open_by_key.return_value.worksheet.return_value = mock_worksheet
 
-        # Call insert_row
-        self.service.insert_row('sheet_id', ['Alice', '30'], worksheet_name='Sheet1')
+def test_writes_invalidate_cached_ranges_for_the_tab(service, mock_client):
+    spreadsheet = mock_client.open_by_key.return_value
+    spreadsheet.values_batch_get.return_value = {"valueRanges": [{"values": [['FALSE']]}]}
 
-        # Assert the mocked methods were called
-        self.mock_client.open_by_key.assert_called_once_with('sheet_id')
-        mock_worksheet.append_row.assert_called_once_with(['Alice', '30'])
+    service.fetch_sheet_data('sheet_id', "'Tab'!C1:C5")
+    service.fetch_sheet_data('sheet_id', "'Other'!C1:C5")
+    service.set_bool_column_cells('sheet_id', 'Tab', 3, [1])
 
-    def test_insert_row_failure(self):
-        # Simulate an APIError being raised by gspread
-        self.mock_client.open_by_key.side_effect = Exception("APIError: Unable to insert row")
+    spreadsheet.values_batch_get.return_value = {"valueRanges": [{"values": [['TRUE']]}]}
+    assert service.fetch_sheet_data('sheet_id', "'Tab'!C1:C5") == [['TRUE']]
+    # Other tabs keep their cached values
+    assert service.fetch_sheet_data('sheet_id', "'Other'!C1:C5") == [['FALSE']]
 
-        # Call insert_row and ensure it handles the error
-        with self.assertLogs(level='ERROR') as log:
-            self.service.insert_row('invalid_sheet_id', ['Alice', '30'], worksheet_name='Sheet1')
+    service.insert_row('sheet_id', ['x'], worksheet_name='Other')
+    assert service.fetch_sheet_data('sheet_id', "'Other'!C1:C5") == [['TRUE']]
 
-        # Assert that the error log contains the expected message
-        self.assertIn(
-            "Error inserting row into spreadsheet invalid_sheet_id",
-            log.output[0]
-        )
 
-        # Assert that open_by_key was called once with the invalid sheet ID
-        self.mock_client.open_by_key.assert_called_once_with('invalid_sheet_id')
+def test_expired_ranges_are_purged_on_store(service, mock_client, monkeypatch):
+    spreadsheet = mock_client.open_by_key.return_value
+    spreadsheet.values_batch_get.return_value = {"valueRanges": [{"values": [['a']]}]}
+    now = [1000.0]
+    monkeypatch.setattr(google_sheets_service.time, "time", lambda: now[0])
 
+    service.fetch_sheet_data('sheet_id', "'Tab'!A1:A1")
+    now[0] += GoogleSheetsService._cache_ttl
+    service.fetch_sheet_data('sheet_id', "'Tab'!A2:A2")
 
-if __name__ == '__main__':
-    unittest.main()
+    assert list(GoogleSheetsService._cache) == [('sheet_id', "'Tab'!A2:A2")]
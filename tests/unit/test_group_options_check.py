@@ -13,9 +13,8 @@ def create_test_excel_file():
         wb = Workbook()
         for sheet_name, data in sheet_data.items():
             ws = wb.create_sheet(sheet_name)
-            for row_idx, row in enumerate(data, start=1):
-                for col_idx, value in enumerate(row, start=1):
-                    ws.cell(row=row_idx, column=col_idx, value=value)
+            for row in data:
+                ws.append(list(row))
         temp_file = NamedTemporaryFile(delete=False, suffix=".xlsx")
         save_workbook_gracefully(wb, temp_file.name)
         return temp_file.name
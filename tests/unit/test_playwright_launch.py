@@ -0,0 +1,23 @@
+import pytest
+
+from services.playwright_launch import BLOCKED_ASSETS
+
+
+@pytest.mark.parametrize("url", [
+    "https://go.buzmanager.com/fonts/x.woff2?v=1",
+    "https://go.buzmanager.com/fonts/x.woff",
+    "https://go.buzmanager.com/img/logo.PNG",
+    "https://go.buzmanager.com/img/icon.svg#sprite",
+])
+def test_blocked_assets_matches_images_fonts_and_media(url):
+    assert BLOCKED_ASSETS.search(url)
+
+
+@pytest.mark.parametrize("url", [
+    "https://go.buzmanager.com/Settings/Inventory/export.xlsx",
+    "https://go.buzmanager.com/scripts/app.js",
+    "https://go.buzmanager.com/styles/site.css",
+    "https://go.buzmanager.com/Settings/Users?img=logo.png&page=2",
+])
+def test_blocked_assets_leaves_pages_scripts_and_downloads_alone(url):
+    assert not BLOCKED_ASSETS.search(url)
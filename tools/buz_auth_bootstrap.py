@@ -1,69 +1,91 @@
 # tools/buz_auth_bootstrap.py
 from __future__ import annotations
+import argparse
 import asyncio
+import os
 import sys
+import time
 from pathlib import Path
-from playwright.async_api import async_playwright
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.playwright_launch import LAUNCH_ARGS, HEADLESS_LAUNCH_ARGS
 
 
 START_URL = "https://go.buzmanager.com/Settings/Inventory"  # lands you in the app after login
+BAR = "=" * 80
 
 
-async def main(account_name: str = "default") -> None:
+async def _wait_url(page, pred, timeout: float, interval: float = 0.25, max_interval: float | None = None) -> None:
     """
-    Bootstrap Buz authentication for a specific account.
-
-    Usage:
-        python tools/buz_auth_bootstrap.py watsonblinds
-        python tools/buz_auth_bootstrap.py designerdrapes
+    Poll ``page.url`` until ``pred`` matches, returning as soon as it does.
 
-    This will save separate storage state files for each account:
-        .secrets/buz_storage_state_watsonblinds.json
-        .secrets/buz_storage_state_designerdrapes.json
+    Unlike ``page.wait_for_url`` this doesn't go on to wait for the new page's load event,
+    and it also sees client-side route changes. With ``max_interval`` the delay doubles after
+    each miss up to that cap, so long waits on a human don't poll flat out for minutes.
+    Raises TimeoutError after ``timeout`` seconds.
     """
-    state_path = Path(f".secrets/buz_storage_state_{account_name}.json")
-    state_path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while not pred(page.url):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Timed out after {timeout:g}s waiting for URL change (at {page.url})")
+        await asyncio.sleep(min(interval, remaining))
+        if max_interval is not None:
+            interval = min(interval * 2, max_interval)
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)  # show the window for MFA etc.
-        ctx = await browser.new_context(accept_downloads=True)
-        page = await ctx.new_page()
-        # Go to app; it will bounce you to the identity login automatically
-        await page.goto(START_URL)
-        print(f">>> Log in as the {account_name} user in the opened window.")
-        print(">>> Approve MFA if prompted.")
-        print(f">>> Make sure you're logged in to the correct account for: {account_name}")
-
-        # Wait for login to complete - could land on org selector OR directly in app
-        print(">>> Waiting for login to complete...")
-        await page.wait_for_url(
-            lambda url: url.startswith("https://go.buzmanager.com/") or "mybuz/organizations" in url,
-            timeout=120_000
-        )
 
-        # Check if we landed on org selector
-        if "mybuz/organizations" in page.url:
-            print("\n>>> You're on the organization selector page.")
-            print(f">>> CLICK THE ORGANIZATION for {account_name} in the browser window")
-            print(">>> (This selects which org this account will always use)")
-            # Wait until they've selected an org and are in the app
-            await page.wait_for_url(lambda url: url.startswith("https://go.buzmanager.com/"), timeout=120_000)
-            print(">>> Org selected! Continuing...")
+CONSOLE1_USERS_URL = "https://console1.buzmanager.com/myorg/user-management/users"
+CONSOLE1_MODES = ("auto", "prompt", "skip")
+
+
+async def _login(page, account_name: str) -> None:
+    """Open the app, then wait for the human to log in (and pick the org if asked)."""
+    # Go to app; it will bounce you to the identity login automatically
+    await page.goto(START_URL, wait_until='domcontentloaded')
+    print(f">>> Log in as the {account_name} user in its browser window.")
+    print(">>> Approve MFA if prompted.")
+    print(f">>> Make sure you're logged in to the correct account for: {account_name}")
+
+    # Wait for login to complete - could land on org selector OR directly in app
+    print(f">>> [{account_name}] Waiting for login to complete...")
+    await _wait_url(
+        page,
+        lambda url: url.startswith("https://go.buzmanager.com/") or "mybuz/organizations" in url,
+        timeout=120
+    )
 
+    # Check if we landed on org selector
+    if "mybuz/organizations" in page.url:
+        print(f"\n>>> [{account_name}] You're on the organization selector page.")
+        print(f">>> CLICK THE ORGANIZATION for {account_name} in the browser window")
+        print(">>> (This selects which org this account will always use)")
+        # Wait until they've selected an org and are in the app
+        await _wait_url(page, lambda url: url.startswith("https://go.buzmanager.com/"), timeout=120)
+        print(f">>> [{account_name}] Org selected! Continuing...")
+
+
+async def _capture_console_auth(page, account_name: str, prompt_lock: asyncio.Lock) -> None:
+    """Have the human open Settings > Users so the console authentication is captured."""
+    async with prompt_lock:
         # Console authentication needs manual intervention
-        print("\n" + "="*80)
-        print(">>> MANUAL STEP REQUIRED TO CAPTURE CONSOLE AUTHENTICATION")
-        print("="*80)
-        print(">>> In the browser window, please:")
+        print("\n" + BAR)
+        print(f">>> MANUAL STEP REQUIRED TO CAPTURE CONSOLE AUTHENTICATION ({account_name})")
+        print(BAR)
+        print(f">>> In the {account_name} browser window, please:")
         print(">>>   1. Navigate to Settings > Users (in the Buz menu)")
         print(">>>   2. If prompted with another login, complete the authentication")
         print(">>>   3. Wait for the user management page to fully load")
         print(">>>")
         print(">>> Once you see the user table on the screen, return here.")
-        print("="*80)
+        print(BAR)
 
-        # Wait for user confirmation
-        input("\n>>> Press ENTER when you're ready to continue (after navigating to Users page)... ")
+        # Wait for user confirmation; off the event loop so other logins keep progressing
+        await asyncio.to_thread(
+            input, "\n>>> Press ENTER when you're ready to continue (after navigating to Users page)... "
+        )
 
         print(">>> Checking for user table...")
         try:
@@ -77,47 +99,210 @@ async def main(account_name: str = "default") -> None:
             print(f">>> Make sure you've navigated to the Users page and can see the user list.")
             raise Exception(f"Console authentication verification failed - user table not found at {page.url}")
 
-        # IMPORTANT: Also visit console1 to ensure cookies are saved for that domain too
-        # This is needed for user management operations
-        print("\n" + "="*80)
-        print(">>> NOW YOU NEED TO NAVIGATE TO THE USER MANAGEMENT PAGE")
+
+async def _visit_console1(page, account_name: str, prompt_lock: asyncio.Lock, mode: str) -> bool:
+    """
+    Get the human onto console1 so its cookies are saved too (needed for user management).
+
+    ``auto`` detects the navigation from the page URL, ``prompt`` waits for ENTER instead.
+    Returns False if the human chose to abort.
+    """
+    async with prompt_lock:
+        print("\n" + BAR)
+        print(f">>> NOW YOU NEED TO NAVIGATE TO THE USER MANAGEMENT PAGE ({account_name})")
         print(">>> In the SAME BROWSER TAB (don't open a new tab), use the address bar to navigate to:")
-        print(">>>   https://console1.buzmanager.com/myorg/user-management/users")
+        print(f">>>   {CONSOLE1_USERS_URL}")
         print(">>> (You may need to authenticate again for this domain)")
+        if mode == "prompt":
+            print(BAR)
+            await asyncio.to_thread(input, f"\n>>> Press ENTER once {account_name} is on the console1 page... ")
+            return True
         print(">>> The script will automatically detect when you've navigated there")
-        print("="*80)
+        print(BAR)
 
-        # Wait for the page to navigate to console1
-        print("\nWaiting for you to navigate to console1...")
-        try:
-            await page.wait_for_url(
-                lambda url: "console1.buzmanager.com" in url,
-                timeout=300_000  # 5 minutes
-            )
-            print("✓ Console1 page detected!")
-        except Exception as e:
-            print(f"\n⚠️  Timeout or error waiting for console1 navigation: {e}")
+    # Wait for the page to navigate to console1
+    print(f"\n[{account_name}] Waiting for you to navigate to console1...")
+    try:
+        await _wait_url(
+            page,
+            lambda url: "console1.buzmanager.com" in url,
+            timeout=300,  # 5 minutes
+            max_interval=5,  # back off 0.25s → 5s while the human finds the page
+        )
+        print(f"✓ [{account_name}] Console1 page detected!")
+    except Exception as e:
+        async with prompt_lock:
+            print(f"\n⚠️  [{account_name}] Timeout or error waiting for console1 navigation: {e}")
             current_url = page.url
             print(f"⚠️  Current URL is: {current_url}")
             print("⚠️  Make sure you navigated in the SAME browser tab (not a new tab)")
-            confirm = input("Continue anyway? (y/n): ")
+            confirm = await asyncio.to_thread(input, f"Continue anyway with {account_name}? (y/n): ")
             if confirm.lower() != 'y':
-                print("Aborting. Please try again and navigate in the same tab.")
-                await browser.close()
-                return
-
-        # Save storage state (now includes both go.buzmanager.com and console1.buzmanager.com cookies)
-        await ctx.storage_state(path=str(state_path))
-        print(f"\n✓ Saved auth state to: {state_path.resolve()}")
-        print(f"✓ This account is now configured for: {account_name}")
+                print(f"Aborting {account_name}. Please try again and navigate in the same tab.")
+                return False
+    return True
+
+
+def _state_path(account_name: str) -> Path:
+    return Path(f".secrets/buz_storage_state_{account_name}.json")
+
+
+async def _save_state(ctx, state_path: Path, account_name: str) -> None:
+    """Write the context's cookies/local storage for the automation services to load."""
+    await ctx.storage_state(path=str(state_path))
+    print(f"\n✓ Saved auth state to: {state_path.resolve()}")
+    print(f"✓ This account is now configured for: {account_name}")
+
+
+async def bootstrap_one(ctx, account_name: str, prompt_lock: asyncio.Lock, console1_mode: str = "auto") -> None:
+    """
+    Log one account in within its own browser context and save its storage state.
+
+    Logins run side by side; the console prompts are taken one account at a time
+    behind ``prompt_lock`` so instructions and ``input()`` calls don't interleave.
+    """
+    state_path = _state_path(account_name)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # A persistent context opens with a blank tab already; reuse it
+    page = ctx.pages[0] if ctx.pages else await ctx.new_page()
+    await _login(page, account_name)
+    await _capture_console_auth(page, account_name, prompt_lock)
+
+    if console1_mode != "skip":
+        if not await _visit_console1(page, account_name, prompt_lock, console1_mode):
+            return
+
+    await _save_state(ctx, state_path, account_name)
+    if console1_mode != "skip":
         print(f"✓ Cookies saved for both go.buzmanager.com and console1.buzmanager.com")
-        await browser.close()
+
+
+async def refresh_one(browser, account_name: str) -> bool:
+    """
+    Re-save an account's existing login without a window or any prompts.
+
+    Returns False if the saved login no longer gets into the app and console1,
+    in which case the account needs the interactive flow.
+    """
+    state_path = _state_path(account_name)
+    ctx = await browser.new_context(storage_state=str(state_path))
+    try:
+        page = await ctx.new_page()
+        await page.goto(START_URL, wait_until='domcontentloaded')
+        if not page.url.startswith("https://go.buzmanager.com/") or "mybuz/organizations" in page.url:
+            print(f">>> [{account_name}] Saved login has expired (at {page.url}); logging in again")
+            return False
+
+        await page.goto(CONSOLE1_USERS_URL, wait_until='domcontentloaded')
+        try:
+            await page.wait_for_selector('table#userListTable', state='visible', timeout=15000)
+        except Exception:
+            print(f">>> [{account_name}] Console login has expired (at {page.url}); logging in again")
+            return False
+
+        await _save_state(ctx, state_path, account_name)
+        return True
+    finally:
+        await ctx.close()
+
+
+async def main(
+    account_names: list[str],
+    console1_mode: str = "auto",
+    cdp_url: str | None = None,
+    force_headed: bool = False,
+) -> None:
+    """
+    Bootstrap Buz authentication for one or more accounts at once.
+
+    Usage:
+        python tools/buz_auth_bootstrap.py watsonblinds
+        python tools/buz_auth_bootstrap.py watsonblinds designerdrapes
+        python tools/buz_auth_bootstrap.py --console1-mode prompt watsonblinds
+
+    Each account gets its own browser window and its own storage state file:
+        .secrets/buz_storage_state_watsonblinds.json
+        .secrets/buz_storage_state_designerdrapes.json
+
+    The browser profile for each account is kept in .secrets/chromium_profile_<account>,
+    so re-runs reuse the cookies and remembered-device state instead of a full MFA login.
+
+    ``console1_mode`` controls the final console1 step: ``auto`` detects the navigation,
+    ``prompt`` waits for ENTER instead, and ``skip`` saves without visiting console1.
+
+    With ``cdp_url`` (or BUZ_CDP_URL) the accounts get fresh contexts in an already-running
+    Chromium instead of launching their own, so back-to-back tool runs skip the cold start.
+    Start that browser once with:
+        chromium --remote-debugging-port=9222 --user-data-dir=.secrets/chromium_cdp_profile
+    and pass --cdp-url http://localhost:9222
+
+    Accounts that already have a storage state file are first refreshed headlessly
+    (see ``refresh_one``); only those whose login has expired get a window. Pass
+    ``force_headed`` to log every account in interactively regardless.
+    """
+    from playwright.async_api import async_playwright  # not needed for --help
+
+    prompt_lock = asyncio.Lock()
+
+    async with async_playwright() as p:
+        browser = await p.chromium.connect_over_cdp(cdp_url) if cdp_url else None
+        try:
+            saved = [name for name in account_names if _state_path(name).exists()] if not force_headed else []
+            if saved:
+                refresher = browser or await p.chromium.launch(headless=True, args=HEADLESS_LAUNCH_ARGS)
+                refreshed = await asyncio.gather(*(refresh_one(refresher, name) for name in saved), return_exceptions=True)
+                if refresher is not browser:
+                    await refresher.close()
+                done = {name for name, ok in zip(saved, refreshed) if ok is True}
+                account_names = [name for name in account_names if name not in done]
+                if not account_names:
+                    return
+
+            if browser:
+                ctxs = [await browser.new_context(accept_downloads=True) for _ in account_names]
+            else:
+                ctxs = [
+                    await p.chromium.launch_persistent_context(
+                        user_data_dir=f".secrets/chromium_profile_{name}",
+                        headless=False,  # show the windows for MFA etc.
+                        accept_downloads=True,
+                        args=LAUNCH_ARGS,
+                    )
+                    for name in account_names
+                ]
+            results = await asyncio.gather(
+                *(bootstrap_one(ctx, name, prompt_lock, console1_mode) for ctx, name in zip(ctxs, account_names)),
+                return_exceptions=True,
+            )
+            # Close every context at once; for persistent contexts that also shuts their Chromium down
+            await asyncio.gather(*(ctx.close() for ctx in ctxs), return_exceptions=True)
+        finally:
+            if browser:
+                await browser.close()  # only disconnects; the CDP-started Chromium keeps running
+
+    failed = [(name, r) for name, r in zip(account_names, results) if isinstance(r, BaseException)]
+    for name, err in failed:
+        print(f"❌ {name}: {err}")
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
-    account_name = sys.argv[1] if len(sys.argv) > 1 else "default"
-    if account_name == "default":
-        print("WARNING: No account name specified. Use: python tools/buz_auth_bootstrap.py <account_name>")
-        print("Example: python tools/buz_auth_bootstrap.py watsonblinds")
+    parser = argparse.ArgumentParser(description="Save Buz login state for one or more accounts.")
+    parser.add_argument("account_names", nargs="*", metavar="account_name",
+                        help="e.g. watsonblinds designerdrapes (defaults to 'default')")
+    parser.add_argument("--console1-mode", choices=CONSOLE1_MODES, default="auto",
+                        help="auto: detect the console1 navigation; prompt: wait for ENTER; skip: don't visit console1")
+    parser.add_argument("--cdp-url", default=os.environ.get("BUZ_CDP_URL"),
+                        help="attach to a running Chromium (e.g. http://localhost:9222) instead of launching one")
+    parser.add_argument("--force-headed", action="store_true",
+                        help="log in through a window even when a saved login could be refreshed headlessly")
+    args = parser.parse_args()
+
+    account_names = args.account_names or ["default"]
+    if account_names == ["default"]:
+        print("WARNING: No account name specified. Use: python tools/buz_auth_bootstrap.py <account_name> [...]")
+        print("Example: python tools/buz_auth_bootstrap.py watsonblinds designerdrapes")
         print("Falling back to 'default' account name...")
-    asyncio.run(main(account_name))
+    asyncio.run(main(account_names, args.console1_mode, args.cdp_url, args.force_headed))
@@ -5,154 +5,282 @@ Runs scenarios and prompts for manual verification.
 
 Usage:
     python tools/test_user_toggle.py
+    python tools/test_user_toggle.py --cdp-url http://localhost:9222
+    python tools/test_user_toggle.py --employees a@x,b@x,c@x,d@x --customers e@x,f@x,g@x,h@x
+
+--employees/--customers give each scenario of that type its own test user, so all the
+toggles can run in one batch after a single setup pass (--no-batch: one concurrent
+call per scenario instead, e.g. to isolate a failing one; --concurrency or
+TOGGLE_CONCURRENCY caps how many run at once, default 4).
+
+--unattended (or BUZ_TEST_UNATTENDED=1), with --user or --employees/--customers, runs
+without any prompts, e.g. in CI. Each check then takes the toggle's own report as its
+answer: it passes only if the toggle succeeded, clicked the switch exactly when the scenario
+expects a change in Buz, and left the user in the expected final state. Nothing re-reads Buz
+or the cache afterwards, and nobody does the manual setup, so the user must already be in
+each scenario's starting state.
+
+--cdp-url (or BUZ_CDP_URL) attaches to an already-running Chromium instead of launching one,
+e.g. one started with: chromium --remote-debugging-port=9222 --user-data-dir=.secrets/chromium_cdp_profile
 """
+import argparse
 import asyncio
+import json
+import os
 import sys
 from pathlib import Path
+from typing import NamedTuple
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from services.buz_user_management import batch_toggle_users_for_org
+# Playwright and services.buz_user_management are imported where they're first needed,
+# so --help and input validation don't pay for loading them
+
+BAR = "=" * 80
+
+class Scenario(NamedTuple):
+    name: str
+    user_type: str
+    is_active: bool  # what the CACHE/UI shows (not Buz reality)
+    action: str
+    stale_cache: bool  # whether this scenario tests stale cache detection
+
 
 # Test scenarios covering all combinations
-# is_active = what the CACHE/UI shows (not Buz reality)
-# stale_cache = whether this scenario tests stale cache detection
 TEST_SCENARIOS = [
     # NORMAL OPERATIONS (cache matches Buz)
-    {"name": "Activate inactive employee", "user_type": "employee", "is_active": False, "action": "activate", "stale_cache": False},
-    {"name": "Deactivate active employee", "user_type": "employee", "is_active": True, "action": "deactivate", "stale_cache": False},
-    {"name": "Activate inactive customer", "user_type": "customer", "is_active": False, "action": "activate", "stale_cache": False},
-    {"name": "Deactivate active customer", "user_type": "customer", "is_active": True, "action": "deactivate", "stale_cache": False},
+    Scenario("Activate inactive employee", "employee", False, "activate", False),
+    Scenario("Deactivate active employee", "employee", True, "deactivate", False),
+    Scenario("Activate inactive customer", "customer", False, "activate", False),
+    Scenario("Deactivate active customer", "customer", True, "deactivate", False),
 
     # STALE CACHE DETECTION (cache doesn't match Buz)
-    {"name": "Activate active employee (stale cache)", "user_type": "employee", "is_active": False, "action": "activate", "stale_cache": True},
-    {"name": "Deactivate inactive employee (stale cache)", "user_type": "employee", "is_active": True, "action": "deactivate", "stale_cache": True},
-    {"name": "Activate active customer (stale cache)", "user_type": "customer", "is_active": False, "action": "activate", "stale_cache": True},
-    {"name": "Deactivate inactive customer (stale cache)", "user_type": "customer", "is_active": True, "action": "deactivate", "stale_cache": True},
+    Scenario("Activate active employee (stale cache)", "employee", False, "activate", True),
+    Scenario("Deactivate inactive employee (stale cache)", "employee", True, "deactivate", True),
+    Scenario("Activate active customer (stale cache)", "customer", False, "activate", True),
+    Scenario("Deactivate inactive customer (stale cache)", "customer", True, "deactivate", True),
 ]
 
 
-async def run_test_scenario(scenario, test_user, org_key):
+# Unattended runs (BUZ_TEST_UNATTENDED=1 or --unattended) skip every prompt: setup pauses
+# don't wait and each manual check takes the toggle's own report as its answer
+UNATTENDED = bool(os.environ.get("BUZ_TEST_UNATTENDED"))
+
+
+async def ainput(prompt=""):
+    """input() on a worker thread, so the browser's event loop keeps running while we wait."""
+    return await asyncio.to_thread(input, prompt)
+
+
+async def ask(prompt, default):
+    """A y/n question; unattended runs answer ``default`` without asking."""
+    if UNATTENDED:
+        return default
+    return (await ainput(prompt)).lower() == 'y'
+
+
+async def pause(prompt):
+    """Wait for ENTER, unless running unattended."""
+    if not UNATTENDED:
+        await ainput(prompt)
+
+
+def _label(active):
+    return 'Active ✓' if active else 'Inactive ✗'
+
+
+def expected_states(scenario):
     """
-    Run a single test scenario with manual verification prompts.
+    Work out what Buz and the cache should show before and after a scenario's toggle.
 
     Returns:
-        dict with test results and verification status
+        dict with cache_state, buz_state, expected_result, should_toggle_in_buz,
+        expected_buz_final and expected_cache_final
     """
-    print(f"\n{'='*80}")
-    print(f"TEST: {scenario['name']}")
-    print(f"{'='*80}")
-    print(f"User: {test_user}")
-    print(f"Type: {scenario['user_type']}")
-    print()
-
-    # Determine expected states based on scenario type
-    if scenario['stale_cache']:
-        # Stale cache: Buz reality differs from cache
-        cache_state = scenario['is_active']
+    cache_state = scenario.is_active
+    if scenario.stale_cache:
+        # Stale cache: Buz reality differs from cache; Buz shouldn't change, cache should update
         buz_state = not cache_state  # Opposite of cache
-        expected_result = "Detect stale cache, report already in desired state, update cache"
-        should_toggle_in_buz = False
-    else:
-        # Normal: Buz and cache match
-        cache_state = scenario['is_active']
-        buz_state = cache_state  # Same as cache
-        expected_result = f"Toggle user to {'Active' if scenario['action'] == 'activate' else 'Inactive'}"
-        should_toggle_in_buz = True
-
-    # Print setup instructions
-    print("SETUP INSTRUCTIONS:")
-    print(f"{'='*80}")
-    if scenario['stale_cache']:
-        print(f"1. In Buz: Manually set user to {'ACTIVE ✓' if buz_state else 'INACTIVE ✗'}")
-        print(f"2. In UI: DON'T refresh cache - leave it showing {'Active ✓' if cache_state else 'Inactive ✗'} (WRONG)")
-        print(f"   (This creates a stale cache scenario)")
+        return {
+            "cache_state": cache_state,
+            "buz_state": buz_state,
+            "expected_result": "Detect stale cache, report already in desired state, update cache",
+            "should_toggle_in_buz": False,
+            "expected_buz_final": buz_state,  # No change in Buz
+            "expected_cache_final": buz_state,  # Cache updates to match Buz
+        }
+    # Normal: Buz and cache match; Buz should toggle, cache should match
+    expected_final = scenario.action == 'activate'
+    return {
+        "cache_state": cache_state,
+        "buz_state": cache_state,  # Same as cache
+        "expected_result": f"Toggle user to {'Active' if expected_final else 'Inactive'}",
+        "should_toggle_in_buz": True,
+        "expected_buz_final": expected_final,
+        "expected_cache_final": expected_final,
+    }
+
+
+# Every scenario's expectations, worked out once at import
+EXPECTED = {scenario: expected_states(scenario) for scenario in TEST_SCENARIOS}
+
+
+def print_setup(scenario, test_user, expected):
+    """Print the manual setup a scenario needs in Buz and the UI before its toggle runs."""
+    buz_state, cache_state = expected['buz_state'], expected['cache_state']
+
+    lines = [
+        f"\n{BAR}",
+        f"TEST: {scenario.name}",
+        BAR,
+        f"User: {test_user}",
+        f"Type: {scenario.user_type}",
+        "",
+        # Setup instructions
+        "SETUP INSTRUCTIONS:",
+        BAR,
+        f"1. In Buz: Manually set user to {'ACTIVE ✓' if buz_state else 'INACTIVE ✗'}",
+    ]
+    if scenario.stale_cache:
+        lines += [
+            f"2. In UI: DON'T refresh cache - leave it showing {_label(cache_state)} (WRONG)",
+            "   (This creates a stale cache scenario)",
+        ]
     else:
-        print(f"1. In Buz: Manually set user to {'ACTIVE ✓' if buz_state else 'INACTIVE ✗'}")
-        print(f"2. In UI: Refresh the page to update cache (should now show {'Active ✓' if cache_state else 'Inactive ✗'})")
-        print(f"   (This ensures cache matches Buz)")
+        lines += [
+            f"2. In UI: Refresh the page to update cache (should now show {_label(cache_state)})",
+            "   (This ensures cache matches Buz)",
+        ]
+    lines += [
+        "",
+        "EXPECTED BEHAVIOR:",
+        f"  Cache shows: {_label(cache_state)}",
+        f"  Buz reality: {_label(buz_state)}",
+        f"  Action: {scenario.action.upper()}",
+        f"  Result: {expected['expected_result']}",
+        BAR,
+        "",
+    ]
+    # One write per banner rather than a print (and stdout lock) per line
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def user_change(scenario, test_user):
+    """The batch_toggle_users_for_org change dict for one scenario."""
+    return {
+        'user_email': test_user,
+        'is_active': scenario.is_active,
+        'user_type': scenario.user_type
+    }
 
-    print()
-    print("EXPECTED BEHAVIOR:")
-    print(f"  Cache shows: {'Active ✓' if cache_state else 'Inactive ✗'}")
-    print(f"  Buz reality: {'Active ✓' if buz_state else 'Inactive ✗'}")
-    print(f"  Action: {scenario['action'].upper()}")
-    print(f"  Result: {expected_result}")
-    print(f"{'='*80}")
-    print()
 
-    input("Press ENTER when setup is complete and you're ready to run the test...")
+async def toggle_scenario(scenario, test_user, org_key, browser, storage_state):
+    """
+    Run a scenario's toggle in its own context of the shared ``browser``, seeded from the
+    already-loaded ``storage_state``.
+
+    Returns:
+        the single result dict from batch_toggle_users_for_org
+    """
+    from services.buz_user_management import batch_toggle_users_for_org
+
+    result = await batch_toggle_users_for_org(
+        org_key=org_key,
+        user_changes=[user_change(scenario, test_user)],
+        browser=browser,  # shared, headed browser so the user can watch
+        storage_state=storage_state
+    )
+    return result[0]
+
+
+async def toggle_scenarios_batched(assigned, org_key, browser, storage_state):
+    """
+    Run every assigned scenario's toggle in one batch_toggle_users_for_org call, so they
+    share one context and one trip to the user management page.
+
+    Returns:
+        per-scenario toggle result dicts (or the exception that stopped them), in ``assigned`` order
+    """
+    from services.buz_user_management import batch_toggle_users_for_org
 
-    # Run the toggle (headed mode so user can watch)
-    print("\n>>> Running toggle operation (watch the browser window)...")
     try:
-        result = await batch_toggle_users_for_org(
+        raw = await batch_toggle_users_for_org(
             org_key=org_key,
-            user_changes=[{
-                'user_email': test_user,
-                'is_active': scenario['is_active'],
-                'user_type': scenario['user_type']
-            }],
-            headless=False  # Always show browser for testing
+            user_changes=[user_change(scenario, test_user) for scenario, test_user in assigned],
+            browser=browser,
+            storage_state=storage_state
         )
+    except Exception as e:
+        return [e] * len(assigned)
 
-        print(f"\n>>> Toggle completed!")
-        print(f"    Success: {result[0]['success']}")
-        print(f"    Message: {result[0]['message']}")
-        if result[0]['success']:
-            print(f"    New state: {'Active' if result[0]['new_state'] else 'Inactive'}")
+    # Users are distinct, so match results back by email rather than trusting their order
+    by_email = {r['user_email']: r for r in raw}
+    return [
+        by_email.get(test_user) or RuntimeError(f"No toggle result returned for {test_user}")
+        for _, test_user in assigned
+    ]
 
-    except Exception as e:
-        print(f"\n>>> ✗ ERROR during toggle: {e}")
-        return {
-            "scenario": scenario['name'],
-            "error": str(e),
-            "success": False,
-            "buz_correct": False,
-            "ui_correct": False,
-            "cache_correct": False,
-            "all_pass": False
-        }
+
+def error_result(scenario, error):
+    return {
+        "scenario": scenario.name,
+        "error": str(error),
+        "success": False,
+        "buz_correct": False,
+        "ui_correct": False,
+        "cache_correct": False,
+        "all_pass": False
+    }
+
+
+async def verify_scenario(scenario, test_user, expected, toggle_result):
+    """
+    Prompt for the manual checks of one scenario's outcome.
+
+    Unattended runs answer every check from ``toggle_result`` alone: the toggle must have
+    succeeded, clicked the switch exactly when ``expected`` says Buz should change, and
+    reported the expected final state.
+
+    Returns:
+        dict with test results and verification status
+    """
+    expected_buz_final = expected['expected_buz_final']
+    expected_cache_final = expected['expected_cache_final']
 
     # Manual verification prompts
-    print(f"\n{'='*80}")
-    print("MANUAL VERIFICATION")
-    print(f"{'='*80}")
-
-    # Calculate expected final state
-    if scenario['stale_cache']:
-        # Stale cache: Buz shouldn't change, cache should update
-        expected_buz_final = buz_state  # No change in Buz
-        expected_cache_final = buz_state  # Cache updates to match Buz
-    else:
-        # Normal: Buz should toggle, cache should match
-        expected_buz_final = scenario['action'] == 'activate'
-        expected_cache_final = expected_buz_final
+    print(f"\n{BAR}")
+    print(f"MANUAL VERIFICATION: {scenario.name} ({test_user})")
+    print(BAR)
 
-    print(f"Expected final Buz state: {'Active ✓' if expected_buz_final else 'Inactive ✗'}")
-    print(f"Expected final Cache state: {'Active ✓' if expected_cache_final else 'Inactive ✗'}")
+    print(f"Expected final Buz state: {_label(expected_buz_final)}")
+    print(f"Expected final Cache state: {_label(expected_cache_final)}")
     print()
 
     # Verify Buz
-    buz_correct = input(f"1. Check Buz - is user {'Active ✓' if expected_buz_final else 'Inactive ✗'}? (y/n): ").lower() == 'y'
+    reported_ok = (
+        bool(toggle_result['success'])
+        and toggle_result.get('toggled', False) == expected['should_toggle_in_buz']
+        and toggle_result.get('new_state') == expected_buz_final
+    )
+    buz_correct = await ask(f"1. Check Buz - is user {_label(expected_buz_final)}? (y/n): ", reported_ok)
 
     # Verify UI (without refresh)
-    ui_correct = input(f"2. Check UI (DON'T refresh) - does badge show {'✓' if expected_cache_final else '✗'}? (y/n): ").lower() == 'y'
+    ui_correct = await ask(f"2. Check UI (DON'T refresh) - does badge show {'✓' if expected_cache_final else '✗'}? (y/n): ", reported_ok)
 
     # Verify Cache (after refresh)
     print(f"\n3. Now refresh the page to reload from cache...")
-    input("   Press ENTER after page has refreshed...")
-    cache_correct = input(f"   Does cache show {'Active ✓' if expected_cache_final else 'Inactive ✗'}? (y/n): ").lower() == 'y'
+    await pause("   Press ENTER after page has refreshed...")
+    cache_correct = await ask(f"   Does cache show {_label(expected_cache_final)}? (y/n): ", reported_ok)
 
-    all_pass = result[0]['success'] and buz_correct and ui_correct and cache_correct
+    all_pass = toggle_result['success'] and buz_correct and ui_correct and cache_correct
 
     if all_pass:
         print("\n✓ TEST PASSED")
     else:
         print("\n✗ TEST FAILED")
-        if not result[0]['success']:
+        if not toggle_result['success']:
             print("  - Toggle operation failed")
         if not buz_correct:
             print("  - Buz state incorrect")
@@ -162,13 +290,13 @@ async def run_test_scenario(scenario, test_user, org_key):
             print("  - Cache state incorrect")
 
     return {
-        "scenario": scenario['name'],
-        "success": result[0]['success'],
-        "message": result[0]['message'],
-        "stale_cache": scenario['stale_cache'],
+        "scenario": scenario.name,
+        "success": toggle_result['success'],
+        "message": toggle_result['message'],
+        "stale_cache": scenario.stale_cache,
         "expected_buz_final": expected_buz_final,
         "expected_cache_final": expected_cache_final,
-        "should_toggle_in_buz": should_toggle_in_buz,
+        "should_toggle_in_buz": expected['should_toggle_in_buz'],
         "buz_correct": buz_correct,
         "ui_correct": ui_correct,
         "cache_correct": cache_correct,
@@ -176,81 +304,289 @@ async def run_test_scenario(scenario, test_user, org_key):
     }
 
 
-async def main():
-    """Run all test scenarios"""
-    print("="*80)
+def print_toggle_result(toggle_result):
+    print(f"    Success: {toggle_result['success']}")
+    print(f"    Message: {toggle_result['message']}")
+    if toggle_result['success']:
+        print(f"    New state: {'Active' if toggle_result['new_state'] else 'Inactive'}")
+
+
+async def run_test_scenario(scenario, test_user, toggle):
+    """
+    Run a single test scenario with manual verification prompts.
+    ``toggle`` comes from user_toggle_session, so every scenario reuses the one org context
+    and user list page (reloaded before each toggle).
+
+    Returns:
+        dict with test results and verification status
+    """
+    expected = EXPECTED[scenario]
+    print_setup(scenario, test_user, expected)
+
+    await pause("Press ENTER when setup is complete and you're ready to run the test...")
+
+    # Run the toggle (headed mode so user can watch)
+    print("\n>>> Running toggle operation (watch the browser window)...")
+    try:
+        toggle_result = await toggle(user_change(scenario, test_user))
+        print(f"\n>>> Toggle completed!")
+        print_toggle_result(toggle_result)
+    except Exception as e:
+        print(f"\n>>> ✗ ERROR during toggle: {e}")
+        return error_result(scenario, e)
+
+    return await verify_scenario(scenario, test_user, expected, toggle_result)
+
+
+async def run_assigned_scenarios(assigned, org_key, browser, storage_state, batch=True, concurrency=4):
+    """
+    Run scenarios that each have their own test user in three phases: every setup up front,
+    then all the toggles, then the manual verification of each.
+
+    With ``batch`` the toggles go through one batch_toggle_users_for_org call (one context,
+    one page); otherwise each scenario gets its own call and context, at most ``concurrency``
+    at a time.
+
+    Args:
+        assigned: list of (scenario, test_user) pairs; users must be distinct
+
+    Returns:
+        list of per-scenario result dicts, in ``assigned`` order
+    """
+    expectations = [EXPECTED[scenario] for scenario, _ in assigned]
+    for (scenario, test_user), expected in zip(assigned, expectations):
+        print_setup(scenario, test_user, expected)
+
+    await pause(f"Press ENTER when setup is complete for all {len(assigned)} scenarios...")
+
+    if batch:
+        print(f"\n>>> Running {len(assigned)} toggle operations in one session (watch the browser window)...")
+        toggle_results = await toggle_scenarios_batched(assigned, org_key, browser, storage_state)
+    else:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def toggle(scenario, test_user):
+            async with semaphore:
+                return await toggle_scenario(scenario, test_user, org_key, browser, storage_state)
+
+        print(f"\n>>> Running {len(assigned)} toggle operations, {concurrency} at a time (watch the browser windows)...")
+        toggle_results = await asyncio.gather(
+            *(toggle(scenario, test_user) for scenario, test_user in assigned),
+            return_exceptions=True,
+        )
+
+    results = []
+    for (scenario, test_user), expected, toggle_result in zip(assigned, expectations, toggle_results):
+        if isinstance(toggle_result, Exception):
+            print(f"\n>>> ✗ ERROR during toggle for {scenario.name} ({test_user}): {toggle_result}")
+            results.append(error_result(scenario, toggle_result))
+            continue
+        print(f"\n>>> Toggle completed: {scenario.name} ({test_user})")
+        print_toggle_result(toggle_result)
+        results.append(await verify_scenario(scenario, test_user, expected, toggle_result))
+    return results
+
+
+def assign_users(employees, customers):
+    """
+    Pair each scenario with its own test user, taking users of the scenario's type in order.
+    Scenarios of a type with no users given are left out.
+
+    Raises:
+        ValueError: if a type has users but not exactly one per scenario, or a user repeats
+    """
+    pools = {"employee": employees, "customer": customers}
+    for user_type, users in pools.items():
+        needed = sum(1 for s in TEST_SCENARIOS if s.user_type == user_type)
+        if users and len(users) != needed:
+            raise ValueError(f"Need exactly {needed} {user_type} users (one per scenario), got {len(users)}")
+    if len(set(employees + customers)) != len(employees + customers):
+        raise ValueError("Each scenario needs its own test user; the same user was given twice")
+
+    remaining = {user_type: iter(users) for user_type, users in pools.items()}
+    return [
+        (scenario, next(remaining[scenario.user_type]))
+        for scenario in TEST_SCENARIOS
+        if pools[scenario.user_type]
+    ]
+
+
+async def main(
+    cdp_url: str | None = None,
+    employees=(),
+    customers=(),
+    batch=True,
+    concurrency=4,
+    test_user: str | None = None,
+    org_key: str | None = None,
+):
+    """
+    Run all test scenarios.
+
+    With ``employees``/``customers`` (one distinct user per scenario of that type) the
+    toggles all run between a single setup pass and the verification prompts, in one batch
+    call or (``batch=False``) as per-scenario calls, ``concurrency`` at a time; otherwise the
+    scenarios run one at a time against a single test user.
+
+    ``test_user`` and ``org_key`` are asked for when not given (the org defaults to
+    canberra when running unattended).
+    """
+    print(BAR)
     print("USER TOGGLE TEST HARNESS")
-    print("="*80)
+    print(BAR)
     print()
     print("This tool will guide you through testing all user toggle scenarios.")
     print("You'll manually verify each result in Buz, the UI, and the cache.")
     print()
 
     # Get test configuration
-    test_user = input("Enter test user email (e.g., test.user@watsonblinds.com.au): ").strip()
-    if not test_user:
-        print("Error: User email is required")
-        return
-
-    org_key = input("Enter org key (canberra/tweed/dd/bay/shoalhaven/wagga) [canberra]: ").strip() or "canberra"
+    assigned = None
+    if employees or customers:
+        try:
+            assigned = assign_users(list(employees), list(customers))
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        test_user = ", ".join(sorted({user for _, user in assigned}))
+    else:
+        if test_user is None and not UNATTENDED:
+            test_user = input("Enter test user email (e.g., test.user@watsonblinds.com.au): ").strip()
+        if not test_user:
+            print("Error: User email is required")
+            return
+
+    if org_key is None:
+        org_key = "canberra"
+        if not UNATTENDED:
+            org_key = input("Enter org key (canberra/tweed/dd/bay/shoalhaven/wagga) [canberra]: ").strip() or "canberra"
     valid_orgs = ['canberra', 'tweed', 'dd', 'bay', 'shoalhaven', 'wagga']
     if org_key not in valid_orgs:
         print(f"Error: Invalid org. Must be one of: {', '.join(valid_orgs)}")
         return
 
+    from playwright.async_api import async_playwright
+    from services.buz_user_management import BuzUserManagement, user_toggle_session
+    from services.playwright_launch import LAUNCH_ARGS
+
+    # Load the org's auth once; every scenario's context is created from this dict
+    storage_state_path = Path(BuzUserManagement.ORGS[org_key]['storage_state'])
+    if not storage_state_path.exists():
+        print(f"Error: Auth storage state not found at {storage_state_path}. "
+              f"Run tools/buz_auth_bootstrap.py {org_key} first.")
+        return
+    storage_state = json.loads(storage_state_path.read_text(encoding="utf-8"))
+
     print(f"\nRunning tests for: {test_user} in {org_key}")
-    print(f"Number of scenarios: {len(TEST_SCENARIOS)}")
+    print(f"Number of scenarios: {len(assigned) if assigned else len(TEST_SCENARIOS)}")
     print()
 
-    run_all = input("Run all scenarios automatically? (y/n) [y]: ").lower()
-    run_all = run_all != 'n'
+    run_all = True
+    if not assigned and not UNATTENDED:
+        run_all = input("Run all scenarios automatically? (y/n) [y]: ").lower()
+        run_all = run_all != 'n'
 
     results = []
 
-    for i, scenario in enumerate(TEST_SCENARIOS, 1):
-        if not run_all:
-            cont = input(f"\nRun scenario {i}/{len(TEST_SCENARIOS)}: {scenario['name']}? (y/n/q) [y]: ").lower()
-            if cont == 'q':
-                print("Quitting...")
-                break
-            if cont == 'n':
-                print("Skipping...")
-                continue
-
-        result = await run_test_scenario(scenario, test_user, org_key)
-        results.append(result)
-
-    # Print summary
-    print(f"\n\n{'='*80}")
-    print("TEST SUMMARY")
-    print(f"{'='*80}")
-    print(f"Total tests run: {len(results)}")
-    print(f"Passed: {sum(1 for r in results if r['all_pass'])}")
-    print(f"Failed: {sum(1 for r in results if not r['all_pass'])}")
-    print()
-
+    # Launch Chromium once (headed so the user can watch), or attach to a running one;
+    # each scenario opens its own context in it
+    async with async_playwright() as p:
+        if cdp_url:
+            browser = await p.chromium.connect_over_cdp(cdp_url)
+        else:
+            browser = await p.chromium.launch(headless=False, args=LAUNCH_ARGS)
+        try:
+            if assigned:
+                results = await run_assigned_scenarios(
+                    assigned, org_key, browser, storage_state, batch=batch, concurrency=concurrency
+                )
+            else:
+                # One org session for the whole sweep; the scenarios only differ in what they toggle
+                async with user_toggle_session(org_key, browser=browser, storage_state=storage_state) as toggle:
+                    for i, scenario in enumerate(TEST_SCENARIOS, 1):
+                        if not run_all:
+                            cont = (await ainput(f"\nRun scenario {i}/{len(TEST_SCENARIOS)}: {scenario.name}? (y/n/q) [y]: ")).lower()
+                            if cont == 'q':
+                                print("Quitting...")
+                                break
+                            if cont == 'n':
+                                print("Skipping...")
+                                continue
+
+                        result = await run_test_scenario(scenario, test_user, toggle)
+                        results.append(result)
+        finally:
+            await browser.close()
+
+    # Print summary: one pass over the results for both the counts and the per-test lines
+    passed = 0
+    rows = []
     for r in results:
-        status = "✓ PASS" if r['all_pass'] else "✗ FAIL"
-        print(f"{status}: {r['scenario']}")
-        if not r['all_pass']:
-            issues = []
-            if not r.get('success', False):
-                issues.append(f"Toggle failed: {r.get('message', 'Unknown error')}")
-            if not r['buz_correct']:
-                issues.append("Buz state incorrect")
-            if not r['ui_correct']:
-                issues.append("UI badge incorrect")
-            if not r['cache_correct']:
-                issues.append("Cache state incorrect")
-            for issue in issues:
-                print(f"      - {issue}")
-
-    print(f"\n{'='*80}")
+        if r['all_pass']:
+            passed += 1
+            rows.append(f"✓ PASS: {r['scenario']}")
+        else:
+            rows.append(f"✗ FAIL: {r['scenario']}")
+            rows.extend(f"      - {issue}" for issue in _issues_for(r))
+
+    lines = [
+        f"\n\n{BAR}",
+        "TEST SUMMARY",
+        BAR,
+        f"Total tests run: {len(results)}",
+        f"Passed: {passed}",
+        f"Failed: {len(results) - passed}",
+        "",
+        *rows,
+        f"\n{BAR}",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _issues_for(r):
+    """What went wrong in a failed scenario's result, one line each."""
+    issues = []
+    if not r.get('success', False):
+        issues.append(f"Toggle failed: {r.get('message', 'Unknown error')}")
+    if not r['buz_correct']:
+        issues.append("Buz state incorrect")
+    if not r['ui_correct']:
+        issues.append("UI badge incorrect")
+    if not r['cache_correct']:
+        issues.append("Cache state incorrect")
+    return issues
+
+
+def _user_list(value):
+    return [user.strip() for user in value.split(",") if user.strip()]
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Interactive test harness for user toggle functionality.")
+    parser.add_argument("--cdp-url", default=os.environ.get("BUZ_CDP_URL"),
+                        help="attach to a running Chromium (e.g. http://localhost:9222) instead of launching one")
+    parser.add_argument("--employees", type=_user_list, default=[],
+                        help="comma-separated employee test users, one per employee scenario")
+    parser.add_argument("--customers", type=_user_list, default=[],
+                        help="comma-separated customer test users, one per customer scenario")
+    parser.add_argument("--no-batch", dest="batch", action="store_false",
+                        help="with --employees/--customers, toggle each scenario in its own call instead of one batch")
+    parser.add_argument("--concurrency", type=int, default=int(os.environ.get("TOGGLE_CONCURRENCY", "4")),
+                        help="with --no-batch, how many scenario toggles run at once (default: $TOGGLE_CONCURRENCY or 4)")
+    parser.add_argument("--user", help="test user email for the one-user-at-a-time mode (asked for if omitted)")
+    parser.add_argument("--org", choices=['canberra', 'tweed', 'dd', 'bay', 'shoalhaven', 'wagga'],
+                        help="org to test in (asked for if omitted)")
+    parser.add_argument("--unattended", action="store_true", default=UNATTENDED,
+                        help="skip all prompts and judge each scenario by the toggle result (or set BUZ_TEST_UNATTENDED=1)")
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    UNATTENDED = args.unattended
+
     try:
-        asyncio.run(main())
+        asyncio.run(main(
+            args.cdp_url, args.employees, args.customers, args.batch, args.concurrency,
+            test_user=args.user, org_key=args.org,
+        ))
     except KeyboardInterrupt:
         print("\n\nTest harness interrupted by user")
     except Exception as e: